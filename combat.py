@@ -1,31 +1,146 @@
 from __future__ import annotations
 
+import heapq
 from collections import deque
-from typing import Deque, Optional
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from enemy_ai import (
+    ATTACK,
+    GUARD,
+    HEAVY,
+    HEAVY_COOLDOWN,
+    HEAVY_HIT_CHANCE,
+    DuelState,
+    PendingDecision,
+    Planner,
+    policy_for,
+)
+from events import CombatEnded, EventBus
+from rng import RandomStream, get_rng
+from skills import StatusEffect
+
+PARTY = 0
+ENEMY = 1
+# Time units per action at speed 1; faster combatants act proportionally sooner.
+ACTION_TIME = 1000
+DEFAULT_SPEED = 10
+
+
+@dataclass(slots=True, eq=False)
+class Combatant:
+    entity: object
+    side: int
+    speed: int
+    effects: List[StatusEffect] = field(default_factory=list)
+    # Turns until an enemy may swing a heavy blow again.
+    cooldown: int = 0
+    # Position in its side's living list, for O(1) removal.
+    slot: int = -1
+
+    @property
+    def name(self) -> str:
+        return getattr(self.entity, "name", "You")
+
+    def is_alive(self) -> bool:
+        return self.entity.is_alive()
 
 
 class CombatSystem:
-    """Simple turn-based combat controller."""
+    """Turn-based combat between a party and a group of enemies.
 
-    def __init__(self, player, enemy):  # noqa: ANN001 - runtime entities
+    Turn order comes from a speed-based initiative queue. Everyone except the
+    player (unless ``auto_player`` is set) acts on their own; the queue only
+    stops when it is the player's turn or the fight is over.
+    """
+
+    def __init__(
+        self,
+        player,  # noqa: ANN001 - runtime entity
+        enemies,  # noqa: ANN001 - one enemy or a sequence of them
+        events: Optional[EventBus] = None,
+        allies: Sequence = (),
+        stream: Optional[RandomStream] = None,
+        auto_player: bool = False,
+        planner: Optional[Planner] = None,
+    ):
         self.player = player
-        self.enemy = enemy
-        self.turn = "player"
+        self.events = events
+        self.stream = stream or get_rng().combat
+        self.auto_player = auto_player
+        # Without a planner, searching policies use their fallback so turns never wait.
+        self.planner = planner
+        self._waiting: Optional[Tuple[Combatant, int, PendingDecision]] = None
         self.round_log: Deque[str] = deque(maxlen=8)
         self.outcome: Optional[str] = None
+        self.turn = "player"
+        self.target_index = 0
+
+        enemies = list(enemies) if isinstance(enemies, (list, tuple)) else [enemies]
+        self.combatants: List[Combatant] = [Combatant(player, PARTY, self._speed_of(player))]
+        self.combatants += [Combatant(ally, PARTY, self._speed_of(ally)) for ally in allies]
+        self.combatants += [Combatant(enemy, ENEMY, self._speed_of(enemy)) for enemy in enemies]
+        self._by_entity: Dict[int, Combatant] = {id(combatant.entity): combatant for combatant in self.combatants}
+        self.living: Tuple[List[Combatant], List[Combatant]] = ([], [])
+        self._queue: List[Tuple[int, int, Combatant]] = []
+        self._sequence = 0
+        self._player_due = 0
+        self._turn_target: Optional[Tuple[Combatant, Combatant]] = None
+        self._player_turns = 0
+        for combatant in self.combatants:
+            if combatant.is_alive():
+                self._add_living(combatant)
+                self._schedule(combatant, 0)
 
         # Reset skill cooldowns when entering combat
         for skill in self.player.skills:
             skill.current_cooldown = 0
 
-        self.round_log.append(f"A wild {enemy.name} appears!")
+        if len(enemies) == 1:
+            self.round_log.append(f"A wild {enemies[0].name} appears!")
+        else:
+            self.round_log.append(f"{len(enemies)} enemies close in!")
+        self._advance()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    @property
+    def enemies(self) -> List:
+        return [combatant.entity for combatant in self.combatants if combatant.side == ENEMY]
+
+    @property
+    def living_enemies(self) -> List:
+        return [combatant.entity for combatant in self.living[ENEMY]]
+
+    @property
+    def enemy(self):  # noqa: ANN201 - runtime entity
+        """The currently selected target."""
+        living = self.living[ENEMY]
+        if not living:
+            return self.enemies[0]
+        return living[self.target_index % len(living)].entity
+
+    def effects_on(self, entity) -> List[StatusEffect]:  # noqa: ANN001 - runtime entity
+        combatant = self._by_entity.get(id(entity))
+        return combatant.effects if combatant else []
+
+    def defeated_enemies(self) -> List:
+        return [combatant.entity for combatant in self.combatants if combatant.side == ENEMY and not combatant.is_alive()]
+
+    # ------------------------------------------------------------------
+    # Player actions
+    # ------------------------------------------------------------------
+    def cycle_target(self, step: int = 1) -> None:
+        if self.living[ENEMY]:
+            self.target_index = (self.target_index + step) % len(self.living[ENEMY])
 
     def player_basic_attack(self) -> None:
         if not self._can_take_action():
             return
-        damage = max(self.player.stats["attack"] - self.enemy.stats.get("defense", 0), 2)
-        self.enemy.take_damage(damage)
-        self.round_log.append(f"You strike for {damage} damage.")
+        target = self.enemy
+        damage = self._attack(self.player, target)
+        self.round_log.append(f"You strike {target.name} for {damage} damage.")
         self._after_player_action()
 
     def player_use_skill(self, index: int) -> None:
@@ -38,8 +153,14 @@ class CombatSystem:
         if not skill.can_use(self.player):
             self.round_log.append(f"Cannot use {skill.name} right now.")
             return
-        result = skill.execute(self.player, self.enemy)
+        targets = self.living_enemies if skill.area else [self.enemy]
+        result = skill.execute(self.player, targets if skill.area else targets[0])
         self.round_log.append(result)
+        for target in targets:
+            if not target.is_alive():
+                self._mark_dead(self._by_entity[id(target)])
+            elif skill.status is not None:
+                self.apply_status(target, skill.status)
         self._after_player_action()
 
     def player_use_consumable(self, item_id: str) -> None:
@@ -47,32 +168,209 @@ class CombatSystem:
             return
         message = self.player.consume_item(item_id)
         self.round_log.append(message)
-        self._after_player_action(skip_enemy=message.startswith("No "))
+        # A missing item costs no time.
+        self._after_player_action(spent=not message.startswith("No "))
 
-    def enemy_turn(self) -> None:
-        if not self.enemy.is_alive():
+    def apply_status(self, entity, effect: StatusEffect) -> None:  # noqa: ANN001 - runtime entity
+        """Attach ``effect``; re-applying one already present refreshes its duration."""
+        combatant = self._by_entity.get(id(entity))
+        if combatant is None:
             return
-        damage = max(self.enemy.stats["attack"] - self.player.stats.get("defense", 0), 1)
-        self.player.take_damage(damage)
-        self.round_log.append(f"{self.enemy.name} hits you for {damage} damage.")
-        if not self.player.is_alive():
-            self.outcome = "defeat"
+        for existing in combatant.effects:
+            if existing.name == effect.name:
+                existing.remaining = max(existing.remaining, effect.remaining)
+                return
+        combatant.effects.append(effect.copy())
+
+    # ------------------------------------------------------------------
+    # Turn scheduling
+    # ------------------------------------------------------------------
+    def update(self) -> None:
+        """Resume the fight once a planned enemy turn has its decision."""
+        if self._waiting is None or self.outcome is not None:
+            return
+        combatant, time_due, pending = self._waiting
+        action = pending.poll()
+        if action is None:
+            return
+        self._waiting = None
+        if self._end_turn(combatant, time_due, action):
+            self._advance()
+
+    def _advance(self) -> None:
+        """Run turns until the player must choose an action, a planner is thinking, or the fight ends."""
+        while self.outcome is None and self._queue:
+            time_due, _, combatant = heapq.heappop(self._queue)
+            if not combatant.is_alive():
+                continue
+            if not self._start_turn(combatant):
+                if self._check_outcome():
+                    return
+                if combatant.is_alive():
+                    self._schedule(combatant, time_due)
+                continue
+            if combatant.entity is self.player and not self.auto_player:
+                self._player_due = time_due
+                self.turn = "player"
+                return
+            action = ATTACK
+            if combatant.side == ENEMY:
+                decision = self._decide(combatant)
+                if isinstance(decision, PendingDecision):
+                    self._waiting = (combatant, time_due, decision)
+                    self.turn = "enemy"
+                    return
+                action = decision
+            if not self._end_turn(combatant, time_due, action):
+                return
+        self.turn = "player"
+
+    def _end_turn(self, combatant: Combatant, time_due: int, action: str) -> bool:
+        """Carry out an AI turn; returns False once the fight is over."""
+        self._take_ai_turn(combatant, action)
+        if self._check_outcome():
+            return False
+        self._schedule(combatant, time_due)
+        return True
+
+    def _decide(self, combatant: Combatant):  # noqa: ANN202 - action name or PendingDecision
+        policy = policy_for(combatant.entity)
+        target = self._target_for(combatant)
+        if target is None or not hasattr(target.entity, "skills"):
+            return ATTACK
+        state = DuelState.capture(combatant.entity, target.entity, combatant.cooldown)
+        if not policy.searches:
+            return policy.decide(state)
+        if self.planner is None:
+            return policy.fallback(state)
+        return self.planner.request(policy, state)
+
+    def _start_turn(self, combatant: Combatant) -> bool:
+        """Tick the combatant's statuses; returns False if it loses this turn."""
+        if combatant.cooldown:
+            combatant.cooldown -= 1
+        if combatant.entity is self.player:
+            # Buffs and cooldowns count player turns, as they did one-on-one.
+            if self._player_turns:
+                self.player.tick_buffs()
+                for skill in self.player.skills:
+                    skill.tick()
+            self._player_turns += 1
+        if not combatant.effects:
+            return True
+        stunned = False
+        remaining: List[StatusEffect] = []
+        for effect in combatant.effects:
+            if effect.damage:
+                combatant.entity.take_damage(effect.damage)
+                self.round_log.append(f"{combatant.name} suffers {effect.damage} from {effect.name}.")
+            stunned = stunned or effect.stun
+            effect.remaining -= 1
+            if effect.remaining > 0:
+                remaining.append(effect)
+        combatant.effects = remaining
+        if not combatant.is_alive():
+            self._mark_dead(combatant)
+            return False
+        return not stunned
+
+    def _target_for(self, combatant: Combatant) -> Optional[Combatant]:
+        """The opponent this combatant will act against this turn, picked once per turn."""
+        opponents = self.living[1 - combatant.side]
+        if not opponents:
+            return None
+        if self._turn_target is None or self._turn_target[0] is not combatant:
+            self._turn_target = (combatant, opponents[self.stream.randint(0, len(opponents) - 1)])
+        return self._turn_target[1]
+
+    def _take_ai_turn(self, combatant: Combatant, action: str = ATTACK) -> None:
+        target = self._target_for(combatant)
+        self._turn_target = None
+        if target is None or not target.is_alive():
+            return
+        if action == GUARD:
+            self.apply_status(combatant.entity, StatusEffect("Guard", remaining=1, guard=True))
+            self.round_log.append(f"{combatant.name} braces for impact.")
+            return
+        power = None
+        if action == HEAVY:
+            combatant.cooldown = HEAVY_COOLDOWN
+            if self.stream.random() >= HEAVY_HIT_CHANCE:
+                self.round_log.append(f"{combatant.name}'s heavy blow misses.")
+                return
+            power = combatant.entity.stats.attack * 3 // 2
+        damage = self._attack(combatant.entity, target.entity, power)
+        verb = "slams" if power else "hits"
+        if target.entity is self.player:
+            self.round_log.append(f"{combatant.name} {verb} you for {damage} damage.")
         else:
-            self.turn = "player"
-            self.player.tick_buffs()
-            for skill in self.player.skills:
-                skill.tick()
-
-    def _after_player_action(self, skip_enemy: bool = False) -> None:
-        if not self.enemy.is_alive():
-            self.outcome = "victory"
-            self.round_log.append(f"{self.enemy.name} is defeated!")
+            self.round_log.append(f"{combatant.name} {verb} {target.name} for {damage} damage.")
+
+    def _attack(self, attacker, defender, power: Optional[int] = None) -> int:  # noqa: ANN001 - runtime entities
+        damage = (power or attacker.stats.attack) - defender.stats.defense
+        damage = max(damage, 2 if attacker is self.player else 1)
+        if any(effect.guard for effect in self._by_entity[id(defender)].effects):
+            damage = max(damage // 2, 1)
+        defender.take_damage(damage)
+        if not defender.is_alive():
+            self._mark_dead(self._by_entity[id(defender)])
+        return damage
+
+    def _after_player_action(self, spent: bool = True) -> None:
+        if self._check_outcome():
+            return
+        if not spent:
             return
+        player = self._by_entity[id(self.player)]
         self.turn = "enemy"
-        if skip_enemy:
-            self.turn = "player"
+        self._schedule(player, self._player_due)
+        self._advance()
+
+    def _schedule(self, combatant: Combatant, now: int) -> None:
+        self._sequence += 1
+        heapq.heappush(self._queue, (now + ACTION_TIME // combatant.speed, self._sequence, combatant))
+
+    def _add_living(self, combatant: Combatant) -> None:
+        living = self.living[combatant.side]
+        combatant.slot = len(living)
+        living.append(combatant)
+
+    def _mark_dead(self, combatant: Combatant) -> None:
+        living = self.living[combatant.side]
+        if combatant.slot < 0:
             return
-        self.enemy_turn()
+        last = living.pop()
+        if last is not combatant:
+            living[combatant.slot] = last
+            last.slot = combatant.slot
+        combatant.slot = -1
+        if combatant.side == ENEMY:
+            self.round_log.append(f"{combatant.name} is defeated!")
+
+    def _check_outcome(self) -> bool:
+        if not self.player.is_alive():
+            self._finish("defeat")
+        elif not self.living[ENEMY]:
+            self._finish("victory")
+        return self.outcome is not None
+
+    def _finish(self, outcome: str) -> None:
+        self.outcome = outcome
+        if self.events:
+            self.events.publish(CombatEnded(victory=outcome == "victory"))
 
     def _can_take_action(self) -> bool:
-        return self.turn == "player" and self.outcome is None
\ No newline at end of file
+        return self.turn == "player" and self.outcome is None
+
+    @staticmethod
+    def _speed_of(entity) -> int:  # noqa: ANN001 - runtime entity
+        return max(entity.stats.speed or DEFAULT_SPEED, 1)
+
+
+def simulate(party: Sequence, enemies: Iterable, stream: Optional[RandomStream] = None) -> CombatSystem:
+    """Fight an encounter to the end with every side on AI control.
+
+    The first member of ``party`` stands in for the player.
+    """
+    leader, *allies = party
+    return CombatSystem(leader, list(enemies), allies=allies, stream=stream, auto_player=True)
@@ -0,0 +1,229 @@
+"""Hot-reloadable content definitions backed by optional JSON override files.
+
+Each source is a JSON object keyed by definition id, e.g. ``content/enemies.json``.
+The registry polls file mtimes, re-parses only files that changed, diffs them entry
+by entry and stages the changed definitions. ``commit`` swaps staged definitions
+in between frames and invalidates only the caches derived from them.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from dialogue import DialogueNode, DialogueOption
+from enemy_ai import POLICIES
+from enemies import ENEMIES, EnemyBlueprint
+from items import ITEM_LIBRARY, Consumable, Equipment, Item, Resource, clear_prototypes
+from skills import SKILL_DEFINITIONS, SKILLS, compile_skill
+from stats import StatBlock
+from world import DIALOGUES
+
+# Receives changed definitions by id and the ids whose definitions were removed.
+ApplyFn = Callable[[Dict[str, Any], Set[str]], None]
+
+# Built-in definitions, restored when an override entry is removed again.
+_BUILTIN_ENEMIES = {
+    enemy_id: (blueprint.name, blueprint.stats, list(blueprint.loot_table), blueprint.experience, blueprint.policy)
+    for enemy_id, blueprint in ENEMIES.items()
+}
+_BUILTIN_ITEMS = dict(ITEM_LIBRARY)
+_BUILTIN_SKILLS = dict(SKILL_DEFINITIONS)
+
+_JSON_NAMES = {dict: "object", list: "array"}
+
+
+@dataclass
+class ContentSource:
+    name: str
+    path: Path
+    apply: ApplyFn
+    # JSON type every entry must have; dialogue entries are node lists.
+    entry_type: type = dict
+    mtime: Optional[float] = None
+    entries: Dict[str, Any] = field(default_factory=dict)
+
+
+class ContentRegistry:
+    def __init__(self, directory: str = "content") -> None:
+        self.directory = Path(directory)
+        self.sources: Dict[str, ContentSource] = {}
+        # (source, changed, removed, entries before the poll that staged them)
+        self._staged: List[Tuple[ContentSource, Dict[str, Any], Set[str], Dict[str, Any]]] = []
+        self.errors: List[str] = []
+
+    def register(self, name: str, filename: str, apply: ApplyFn, entry_type: type = dict) -> None:
+        self.sources[name] = ContentSource(name, self.directory / filename, apply, entry_type)
+
+    def poll(self) -> List[str]:
+        """Stage definitions from files whose mtime changed; returns the names of changed sources."""
+        changed_sources: List[str] = []
+        for source in self.sources.values():
+            try:
+                mtime = source.path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if mtime == source.mtime:
+                continue
+            source.mtime = mtime
+            try:
+                entries = json.loads(source.path.read_text())
+            except (OSError, json.JSONDecodeError) as error:
+                self.errors.append(f"{source.path}: {error}")
+                continue
+            if not isinstance(entries, dict):
+                self.errors.append(f"{source.path}: expected a JSON object keyed by id.")
+                continue
+            for key, value in list(entries.items()):
+                if not isinstance(value, source.entry_type):
+                    self.errors.append(f"{source.path}: entry '{key}' must be a JSON {_JSON_NAMES[source.entry_type]}.")
+                    # Keep the last good definition rather than treating the entry as removed.
+                    if key in source.entries:
+                        entries[key] = source.entries[key]
+                    else:
+                        del entries[key]
+            changed = {key: value for key, value in entries.items() if source.entries.get(key) != value}
+            removed = set(source.entries) - set(entries)
+            previous, source.entries = source.entries, entries
+            if changed or removed:
+                self._staged.append((source, changed, removed, previous))
+                changed_sources.append(source.name)
+        return changed_sources
+
+    def has_pending(self) -> bool:
+        return bool(self._staged)
+
+    def commit(self) -> int:
+        """Apply everything staged by ``poll``; call between frames."""
+        staged, self._staged = self._staged, []
+        for source, changed, removed, previous in staged:
+            try:
+                source.apply(changed, removed)
+            except Exception as error:
+                # A bad override must not take the game loop down with it. Forget the
+                # rejected entries so the next edit is diffed against what is applied.
+                source.entries = previous
+                self.errors.append(f"{source.path}: {type(error).__name__}: {error}")
+        return len(staged)
+
+
+# ----------------------------------------------------------------------
+# Parsers and appliers for the built-in content types
+# ----------------------------------------------------------------------
+_ITEM_KINDS = {"consumable": Consumable, "resource": Resource, "equipment": Equipment, "item": Item}
+
+
+def parse_item(entry: Dict[str, Any]) -> Callable[[], Item]:
+    fields = dict(entry)
+    kind = fields.pop("kind", fields.get("item_type", "item"))
+    fields.setdefault("item_type", kind)
+    item_class = _ITEM_KINDS[kind]
+    return partial(item_class, **fields)
+
+
+def parse_dialogue(entry: List[Dict[str, Any]]) -> List[DialogueNode]:
+    return [
+        DialogueNode(
+            text=node["text"],
+            options=[
+                DialogueOption(option["text"], option.get("next_node"), option.get("action"))
+                for option in node.get("options", [])
+            ],
+        )
+        for node in entry
+    ]
+
+
+def register_default_sources(registry: ContentRegistry, game_state) -> None:  # noqa: ANN001 - GameState
+    builtin_recipes = {recipe_id: dict(recipe) for recipe_id, recipe in game_state.crafting.recipes.items()}
+
+    def apply_enemies(changed: Dict[str, Any], removed: Set[str]) -> None:
+        store = game_state.world.enemy_store
+        # Build every field set before touching a blueprint so one bad entry changes nothing.
+        definitions: Dict[str, Tuple[str, StatBlock, List[Tuple[str, float]], int, str]] = {}
+        for enemy_id, entry in changed.items():
+            blueprint = ENEMIES.get(enemy_id)
+            if blueprint is None:
+                current = (entry["name"], entry["stats"], [], entry["experience"], "basic")
+            else:
+                current = (blueprint.name, blueprint.stats, blueprint.loot_table, blueprint.experience, blueprint.policy)
+            name, stats, loot_table, experience, policy = current
+            definitions[enemy_id] = (
+                str(entry.get("name", name)),
+                StatBlock.from_mapping(entry["stats"]) if "stats" in entry else stats,
+                [(str(item_id), float(chance)) for item_id, chance in entry.get("loot_table", loot_table)],
+                int(entry.get("experience", experience)),
+                str(entry.get("policy", policy)),
+            )
+        # Enemies added by an override keep their last definition: live enemies still use it.
+        for enemy_id in removed & _BUILTIN_ENEMIES.keys():
+            definitions[enemy_id] = _BUILTIN_ENEMIES[enemy_id]
+        for enemy_id, (name, stats, loot_table, experience, policy) in definitions.items():
+            blueprint = ENEMIES.get(enemy_id)
+            if blueprint is None:
+                ENEMIES[enemy_id] = EnemyBlueprint(name, stats, list(loot_table), experience, policy)
+            else:
+                # Mutating in place lets live enemies that share the blueprint see the change.
+                blueprint.name, blueprint.stats, blueprint.experience, blueprint.policy = name, stats, experience, policy
+                blueprint.loot_table = list(loot_table)
+                blueprint.invalidate_loot()
+            if store is not None:
+                store.refresh_type(enemy_id)
+
+    def apply_items(changed: Dict[str, Any], removed: Set[str]) -> None:
+        factories = {item_id: parse_item(entry) for item_id, entry in changed.items()}
+        # Build each override once so bad fields fail here instead of at the first drop.
+        for factory in factories.values():
+            factory()
+        # Items added by an override stay defined: the player may still be carrying them.
+        factories.update({item_id: _BUILTIN_ITEMS[item_id] for item_id in removed & _BUILTIN_ITEMS.keys()})
+        ITEM_LIBRARY.update(factories)
+        clear_prototypes(factories)
+        game_state.player.inventory.refresh(factories)
+
+    def apply_recipes(changed: Dict[str, Any], removed: Set[str]) -> None:
+        recipes = game_state.crafting.recipes
+        updated = {
+            recipe_id: {resource: int(amount) for resource, amount in entry.items()} for recipe_id, entry in changed.items()
+        }
+        updated.update({recipe_id: dict(builtin_recipes[recipe_id]) for recipe_id in removed & builtin_recipes.keys()})
+        for recipe_id in removed - builtin_recipes.keys():
+            recipes.pop(recipe_id, None)
+        recipes.update(updated)
+        game_state.crafting.invalidate()
+
+    def apply_skills(changed: Dict[str, Any], removed: Set[str]) -> None:
+        definitions = dict(changed)
+        definitions.update({skill_id: _BUILTIN_SKILLS[skill_id] for skill_id in removed & _BUILTIN_SKILLS.keys()})
+        # Compile everything before storing so one bad definition leaves every skill in place.
+        compiled = {skill_id: compile_skill(skill_id, entry) for skill_id, entry in definitions.items()}
+        SKILLS.update(compiled)
+        SKILL_DEFINITIONS.update(definitions)
+        for skill in game_state.player.skills:
+            if skill.skill_id in compiled:
+                skill.compiled = SKILLS[skill.skill_id]
+        for policy in POLICIES.values():
+            policy.reset()
+        game_state.planner.reset()
+
+    def apply_dialogue(changed: Dict[str, Any], removed: Set[str]) -> None:
+        library = game_state.world.dialogues
+        sources = {dialogue_id: parse_dialogue(entry) for dialogue_id, entry in changed.items()}
+        sources.update({dialogue_id: DIALOGUES[dialogue_id] for dialogue_id in removed & DIALOGUES.keys()})
+        # Compile everything first so one broken graph leaves every dialogue as it was.
+        graphs = [(library.compile(dialogue_id, nodes), nodes) for dialogue_id, nodes in sources.items()]
+        for graph, nodes in graphs:
+            library.install(graph, nodes)
+            # Conversations in progress keep their cursor on the old graph until they end.
+            for npc in game_state.world.npcs:
+                if npc.dialogue.graph_id == graph.graph_id:
+                    npc.dialogue = graph
+
+    registry.register("enemies", "enemies.json", apply_enemies)
+    registry.register("items", "items.json", apply_items)
+    registry.register("recipes", "recipes.json", apply_recipes)
+    registry.register("skills", "skills.json", apply_skills)
+    registry.register("dialogue", "dialogue.json", apply_dialogue, entry_type=list)
@@ -1,9 +1,18 @@
 from __future__ import annotations
 
-from collections import Counter
-from typing import Dict
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 from items import create_item
+from telemetry import get_telemetry
+
+
+@dataclass(slots=True)
+class CraftingPlan:
+    item_id: str
+    quantity: int
+    consumed: Dict[str, int] = field(default_factory=dict)
+    steps: List[Tuple[str, int]] = field(default_factory=list)
 
 
 class CraftingSystem:
@@ -12,26 +21,115 @@ class CraftingSystem:
             "health_potion": {"herb": 2},
             "mana_potion": {"herb": 1, "iron_ore": 1},
         }
+        self._base_requirements: Dict[str, Dict[str, int]] = {}
+        self._craftable_key: Optional[Tuple[int, int]] = None
+        self._craftable: Dict[str, int] = {}
+        self.version = 0
 
-    def craft(self, player, item_name: str) -> str:
+    def craft(self, player, item_name: str, quantity: int = 1) -> str:
         if item_name not in self.recipes:
             return "Unknown recipe."
-        if not self.has_ingredients(player, item_name):
+        plan = self.plan(player.inventory.counts(), item_name, quantity)
+        if not plan:
             return "Missing required ingredients."
-
-        self.remove_ingredients(player, item_name)
         crafted = create_item(item_name)
-        if crafted:
-            player.add_item(crafted)
+        if not crafted:
+            return "Recipe failed to produce an item."
+
+        for resource_id, amount in plan.consumed.items():
+            player.remove_item_by_id(resource_id, amount)
+        player.inventory.add(crafted, quantity)
+        get_telemetry().emit("craft", item=item_name, quantity=quantity, consumed=dict(plan.consumed))
+        if quantity == 1:
             return f"Crafted {crafted.name}."
-        return "Recipe failed to produce an item."
+        return f"Crafted {quantity}x {crafted.name}."
+
+    def craft_max(self, player, item_name: str) -> str:
+        quantity = self.craftable_counts(player.inventory).get(item_name, 0)
+        if not quantity:
+            return "Missing required ingredients."
+        return self.craft(player, item_name, quantity)
 
     def has_ingredients(self, player, item_name: str) -> bool:
-        required = self.recipes[item_name]
-        inventory_counts = Counter(player.list_inventory_ids())
-        return all(inventory_counts.get(resource, 0) >= amount for resource, amount in required.items())
-
-    def remove_ingredients(self, player, item_name: str) -> None:
-        required = Counter(self.recipes[item_name])
-        for resource_id in list(required.elements()):
-            player.remove_item_by_id(resource_id)
\ No newline at end of file
+        return self.plan(player.inventory.counts(), item_name, 1) is not None
+
+    def craftable_counts(self, inventory) -> Dict[str, int]:  # noqa: ANN001 - player inventory
+        """Maximum quantity per recipe including intermediate crafts, cached per inventory version."""
+        key = (id(inventory), inventory.version)
+        if key != self._craftable_key:
+            counts = inventory.counts()
+            self._craftable = {item_id: self._max_quantity(counts, item_id) for item_id in self.recipes}
+            self._craftable_key = key
+        return self._craftable
+
+    def plan(self, counts: Dict[str, int], item_id: str, quantity: int) -> Optional[CraftingPlan]:
+        if item_id not in self.recipes or quantity <= 0:
+            return None
+        plan = CraftingPlan(item_id, quantity)
+        if not self._expand(item_id, quantity, dict(counts), plan, frozenset()):
+            return None
+        return plan
+
+    def base_requirements(self, item_id: str) -> Dict[str, int]:
+        """Raw materials needed for one unit once every intermediate is crafted."""
+        return self._resolve_base(item_id, frozenset())
+
+    def invalidate(self) -> None:
+        self.version += 1
+        self._base_requirements.clear()
+        self._craftable_key = None
+        self._craftable = {}
+
+    def _expand(self, item_id: str, quantity: int, stock: Dict[str, int], plan: CraftingPlan, path: FrozenSet[str]) -> bool:
+        path = path | {item_id}
+        for resource, amount in self.recipes[item_id].items():
+            needed = amount * quantity
+            used = min(stock.get(resource, 0), needed)
+            if used:
+                stock[resource] -= used
+                plan.consumed[resource] = plan.consumed.get(resource, 0) + used
+            shortfall = needed - used
+            if not shortfall:
+                continue
+            if resource not in self.recipes or resource in path:
+                return False
+            if not self._expand(resource, shortfall, stock, plan, path):
+                return False
+        plan.steps.append((item_id, quantity))
+        return True
+
+    def _resolve_base(self, item_id: str, path: FrozenSet[str]) -> Dict[str, int]:
+        if item_id in self._base_requirements:
+            return self._base_requirements[item_id]
+        if item_id not in self.recipes or item_id in path:
+            return {item_id: 1}
+        totals: Dict[str, int] = {}
+        for resource, amount in self.recipes[item_id].items():
+            for base, base_amount in self._resolve_base(resource, path | {item_id}).items():
+                totals[base] = totals.get(base, 0) + base_amount * amount
+        self._base_requirements[item_id] = totals
+        return totals
+
+    def _max_quantity(self, counts: Dict[str, int], item_id: str) -> int:
+        recipe = self.recipes[item_id]
+        if not any(resource in self.recipes for resource in recipe):
+            # Raw materials only: one pass over the recipe is exact.
+            return min((counts.get(resource, 0) // amount for resource, amount in recipe.items()), default=0)
+        required = self.base_requirements(item_id)
+        available: Dict[str, int] = {}
+        for held_id, held in counts.items():
+            if held_id == item_id:
+                continue
+            for base, amount in self.base_requirements(held_id).items():
+                available[base] = available.get(base, 0) + held * amount
+        upper = min((available.get(base, 0) // amount for base, amount in required.items()), default=0)
+
+        # The base-material bound is optimistic, so confirm it against real plans.
+        low, high = 0, upper
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.plan(counts, item_id, middle):
+                low = middle
+            else:
+                high = middle - 1
+        return low
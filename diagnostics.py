@@ -0,0 +1,226 @@
+"""Memory census and tracemalloc snapshot diffing for long-running sessions."""
+
+from __future__ import annotations
+
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import pygame
+
+from dialogue import CompiledNode, DialogueNode
+from enemies import Enemy
+from items import Item
+
+_ROOT = Path(__file__).resolve().parent
+
+
+@dataclass(slots=True)
+class Usage:
+    count: int = 0
+    bytes: int = 0
+
+    def add(self, size: int, count: int = 1) -> None:
+        self.count += count
+        self.bytes += size
+
+
+@dataclass(slots=True)
+class MemoryReport:
+    created: float
+    census: Dict[str, Usage]
+    # Bytes currently traced per subsystem, and the change since the previous mark.
+    traced: Dict[str, int] = field(default_factory=dict)
+    growth: Dict[str, int] = field(default_factory=dict)
+
+    def lines(self, limit: int = 6) -> List[str]:
+        lines = [f"{name}: {usage.count} ({_kib(usage.bytes)})" for name, usage in self.census.items()]
+        if self.traced:
+            top = sorted(self.traced.items(), key=lambda pair: pair[1], reverse=True)[:limit]
+            lines.append("traced: " + ", ".join(f"{name} {_kib(size)}" for name, size in top))
+        if self.growth:
+            top = sorted(self.growth.items(), key=lambda pair: abs(pair[1]), reverse=True)[:limit]
+            lines.append("growth: " + ", ".join(f"{name} {size:+d}B" for name, size in top))
+        return lines
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    def dump(self, path: str) -> Path:
+        target = Path(path)
+        target.write_text(json.dumps(self.to_dict(), indent=2))
+        return target
+
+
+def _kib(size: int) -> str:
+    return f"{size / 1024:.1f} KiB"
+
+
+def subsystem_of(filename: str) -> str:
+    """Game modules report by module name, everything else by top-level package."""
+    path = Path(filename)
+    if path.parent == _ROOT:
+        return path.stem
+    parts = path.parts
+    for marker in ("site-packages", "dist-packages"):
+        if marker in parts:
+            index = parts.index(marker)
+            if index + 1 < len(parts):
+                return Path(parts[index + 1]).stem
+    return "python"
+
+
+def surface_bytes(surface: pygame.Surface) -> int:
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+def object_census(game_state) -> Dict[str, Usage]:  # noqa: ANN001 - GameState
+    """Count live objects by category. Walks the whole heap, so call it on demand only."""
+    census = {
+        name: Usage()
+        for name in ("inventory_items", "items", "enemies", "rects", "surfaces", "dialogue_nodes", "save_payload")
+    }
+    for item, count in game_state.player.inventory.stacks():
+        census["inventory_items"].add(sys.getsizeof(item), count)
+
+    objects = gc.get_objects()
+    for obj in objects:
+        if isinstance(obj, Item):
+            census["items"].add(sys.getsizeof(obj))
+        elif isinstance(obj, Enemy):
+            census["enemies"].add(sys.getsizeof(obj))
+        elif isinstance(obj, (DialogueNode, CompiledNode)):
+            census["dialogue_nodes"].add(sys.getsizeof(obj))
+
+    # Rects and surfaces are not tracked by the collector, so find them through their owners.
+    seen = set()
+    for obj in gc.get_referents(*objects):
+        if isinstance(obj, (pygame.Rect, pygame.Surface)) and id(obj) not in seen:
+            seen.add(id(obj))
+            if isinstance(obj, pygame.Rect):
+                census["rects"].add(sys.getsizeof(obj))
+            else:
+                census["surfaces"].add(surface_bytes(obj))
+    del objects
+
+    store = game_state.world.enemy_store
+    if store is not None:
+        census["enemies"].add(sum(column.nbytes for column in store._columns.values()), len(store))
+
+    save_system = game_state.save_system
+    payload = save_system.build_payload(game_state.player, game_state.world, game_state.quests)
+    census["save_payload"].add(len(json.dumps(payload)))
+    if save_system.path.exists():
+        census["save_payload"].add(save_system.path.stat().st_size)
+    return census
+
+
+class MemoryTracker:
+    """Labelled tracemalloc snapshots, diffed and grouped by subsystem."""
+
+    def __init__(self, frames: int = 1) -> None:
+        self.frames = frames
+        self.snapshots: Dict[str, tracemalloc.Snapshot] = {}
+        self._last: Optional[str] = None
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+        self.snapshots.clear()
+        self._last = None
+
+    def mark(self, label: Optional[str] = None) -> str:
+        self.start()
+        label = label or f"mark-{len(self.snapshots)}"
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap>"))
+        )
+        self.snapshots[label] = snapshot
+        self._last = label
+        return label
+
+    def by_subsystem(self, label: str) -> Dict[str, int]:
+        totals: Dict[str, int] = {}
+        for stat in self.snapshots[label].statistics("filename"):
+            name = subsystem_of(stat.traceback[0].filename)
+            totals[name] = totals.get(name, 0) + stat.size
+        return totals
+
+    def diff(self, before: str, after: str) -> Dict[str, int]:
+        totals: Dict[str, int] = {}
+        for stat in self.snapshots[after].compare_to(self.snapshots[before], "filename"):
+            if stat.size_diff:
+                name = subsystem_of(stat.traceback[0].filename)
+                totals[name] = totals.get(name, 0) + stat.size_diff
+        return totals
+
+    def top_lines(self, before: str, after: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """Individual source lines with the largest growth between two marks."""
+        stats = self.snapshots[after].compare_to(self.snapshots[before], "lineno")
+        return [(str(stat.traceback[0]), stat.size_diff) for stat in stats[:limit]]
+
+
+class StartupTimer:
+    """Wall-clock time spent in each named startup phase."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self.clock = clock
+        self.started = clock()
+        self.phases: List[Tuple[str, float]] = []
+        self.finished: Optional[float] = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.phases.append((name, self.clock() - start))
+
+    def finish(self) -> float:
+        self.finished = self.clock()
+        return self.total
+
+    @property
+    def total(self) -> float:
+        return (self.finished or self.clock()) - self.started
+
+    def lines(self) -> List[str]:
+        lines = [f"{name:<12} {seconds * 1000:8.1f} ms" for name, seconds in self.phases]
+        lines.append(f"{'total':<12} {self.total * 1000:8.1f} ms")
+        return lines
+
+
+class Diagnostics:
+    def __init__(self, game_state, report_path: str = "memory_report.json") -> None:  # noqa: ANN001 - GameState
+        self.game_state = game_state
+        self.report_path = report_path
+        self.tracker = MemoryTracker()
+        self.last_report: Optional[MemoryReport] = None
+
+    def report(self) -> MemoryReport:
+        """Take a census and, once tracing, a snapshot diffed against the previous one."""
+        previous = self.tracker._last
+        label = self.tracker.mark()
+        report = MemoryReport(time.time(), object_census(self.game_state), self.tracker.by_subsystem(label))
+        if previous is not None:
+            report.growth = self.tracker.diff(previous, label)
+            del self.tracker.snapshots[previous]
+        self.last_report = report
+        return report
+
+    def dump(self, path: Optional[str] = None) -> Path:
+        return self.report().dump(path or self.report_path)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
 
 @dataclass(slots=True)
@@ -17,23 +17,123 @@ class DialogueNode:
     options: List[DialogueOption]
 
 
-class DialogueTree:
-    def __init__(self, nodes: List[DialogueNode]) -> None:
-        self.nodes = nodes
-        self.current_index = 0
+class DialogueError(ValueError):
+    pass
 
-    def current(self) -> DialogueNode:
-        return self.nodes[self.current_index]
 
-    def choose(self, option_index: int) -> Tuple[Optional[str], bool]:
-        node = self.current()
-        if option_index < 0 or option_index >= len(node.options):
+ActionHandler = Callable[[Any], None]
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledOption:
+    text: str
+    next_node: Optional[int]
+    action: Optional[str]
+    handler: Optional[ActionHandler]
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledNode:
+    text: str
+    options: Tuple[CompiledOption, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class DialogueGraph:
+    """Immutable, validated dialogue that any number of NPCs can share."""
+
+    graph_id: str
+    nodes: Tuple[CompiledNode, ...]
+
+
+def compile_dialogue(
+    graph_id: str, nodes: List[DialogueNode], handlers: Optional[Mapping[str, ActionHandler]]
+) -> DialogueGraph:
+    """Validate and compile ``nodes``; ``handlers=None`` leaves actions unbound, e.g. for tools."""
+    if not nodes:
+        raise DialogueError(f"Dialogue '{graph_id}' has no nodes.")
+    compiled: List[CompiledNode] = []
+    for index, node in enumerate(nodes):
+        options = []
+        for option in node.options:
+            if option.next_node is not None and not 0 <= option.next_node < len(nodes):
+                raise DialogueError(f"Dialogue '{graph_id}' node {index} points to missing node {option.next_node}.")
+            handler = None
+            if option.action and handlers is not None:
+                handler = handlers.get(option.action)
+                if handler is None:
+                    raise DialogueError(f"Dialogue '{graph_id}' node {index} uses unknown action '{option.action}'.")
+            options.append(CompiledOption(option.text, option.next_node, option.action, handler))
+        compiled.append(CompiledNode(node.text, tuple(options)))
+
+    reachable = {0}
+    frontier = [0]
+    while frontier:
+        for option in compiled[frontier.pop()].options:
+            if option.next_node is not None and option.next_node not in reachable:
+                reachable.add(option.next_node)
+                frontier.append(option.next_node)
+    unreachable = sorted(set(range(len(compiled))) - reachable)
+    if unreachable:
+        raise DialogueError(f"Dialogue '{graph_id}' has unreachable nodes {unreachable}.")
+    return DialogueGraph(graph_id, tuple(compiled))
+
+
+class DialogueCursor:
+    """Per-conversation position within a shared DialogueGraph."""
+
+    __slots__ = ("graph", "index")
+
+    def __init__(self, graph: DialogueGraph) -> None:
+        self.graph = graph
+        self.index = 0
+
+    def current(self) -> CompiledNode:
+        return self.graph.nodes[self.index]
+
+    def choose(self, option_index: int) -> Tuple[Optional[CompiledOption], bool]:
+        options = self.current().options
+        if option_index < 0 or option_index >= len(options):
             return None, True
-        option = node.options[option_index]
+        option = options[option_index]
         has_next = option.next_node is not None
         if has_next:
-            self.current_index = option.next_node
-        return option.action, has_next
+            self.index = option.next_node
+        return option, has_next
 
     def reset(self) -> None:
-        self.current_index = 0
\ No newline at end of file
+        self.index = 0
+
+
+class DialogueLibrary:
+    """Compiles each dialogue source once and hands out the shared graph.
+
+    ``sources`` is copied, so ``install`` only changes this library and never the
+    module-level definitions other games were built from.
+    """
+
+    def __init__(self, sources: Dict[str, List[DialogueNode]], handlers: Optional[Dict[str, ActionHandler]] = None) -> None:
+        self.sources = dict(sources)
+        self.handlers: Optional[Dict[str, ActionHandler]] = dict(handlers) if handlers is not None else None
+        self._graphs: Dict[str, DialogueGraph] = {}
+
+    def get(self, graph_id: str) -> DialogueGraph:
+        graph = self._graphs.get(graph_id)
+        if graph is None:
+            graph = self._graphs[graph_id] = compile_dialogue(graph_id, self.sources[graph_id], self.handlers)
+        return graph
+
+    def compile(self, graph_id: str, nodes: List[DialogueNode]) -> DialogueGraph:
+        """Compile ``nodes`` with this library's handlers without storing them."""
+        return compile_dialogue(graph_id, nodes, self.handlers)
+
+    def install(self, graph: DialogueGraph, nodes: List[DialogueNode]) -> None:
+        """Make a graph from ``compile`` the source and cached graph for its id."""
+        self.sources[graph.graph_id] = nodes
+        self._graphs[graph.graph_id] = graph
+
+    def invalidate(self, graph_id: Optional[str] = None) -> None:
+        if graph_id is None:
+            self._graphs.clear()
+        else:
+            self._graphs.pop(graph_id, None)
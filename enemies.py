@@ -1,71 +1,179 @@
 from __future__ import annotations
 
-import random
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import Dict, List, Mapping, Optional, Tuple
 
+import numpy as np
 import pygame
 
 from items import Item, create_item
+from rng import RandomStream, get_rng
+from stats import STAT_NAMES, StatBlock
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class LootTable:
+    """Loot table compiled into parallel id and threshold arrays."""
+
+    item_ids: Tuple[str, ...]
+    thresholds: np.ndarray
+
+    def roll(self, stream: RandomStream) -> List[str]:
+        return [item_id for item_id, threshold in zip(self.item_ids, self.thresholds) if stream.random() <= threshold]
+
+    def roll_counts(self, kills: int, stream: RandomStream) -> Dict[str, int]:
+        """Resolve ``kills`` independent drops at once as per-item counts."""
+        if kills <= 0 or not self.item_ids:
+            return {}
+        drops = stream.binomial(kills, self.thresholds)
+        return {item_id: int(count) for item_id, count in zip(self.item_ids, drops) if count}
+
+
+def compile_loot_table(loot_table: List[Tuple[str, float]]) -> LootTable:
+    item_ids = tuple(item_id for item_id, _ in loot_table)
+    thresholds = np.clip(np.array([chance for _, chance in loot_table], dtype=np.float64), 0.0, 1.0)
+    return LootTable(item_ids, thresholds)
 
 
 @dataclass(slots=True)
 class EnemyBlueprint:
     name: str
-    stats: Dict[str, int]
+    stats: StatBlock
     loot_table: List[Tuple[str, float]]
     experience: int
+    # Name of an enemy_ai policy choosing this enemy's combat actions.
+    policy: str = "basic"
+    _compiled_loot: Optional[LootTable] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.stats, StatBlock):
+            self.stats = StatBlock.from_mapping(self.stats)
+
+    def compiled_loot(self) -> LootTable:
+        if self._compiled_loot is None:
+            self._compiled_loot = compile_loot_table(self.loot_table)
+        return self._compiled_loot
+
+    def invalidate_loot(self) -> None:
+        self._compiled_loot = None
+
+    def drop_loot(self, stream: Optional[RandomStream] = None) -> List[Item]:
+        """Roll this blueprint's loot table once; shared by Enemy and EnemyView."""
+        stream = stream or get_rng().loot
+        loot: List[Item] = []
+        for item_id in self.compiled_loot().roll(stream):
+            item = create_item(item_id)
+            if item:
+                loot.append(item)
+        return loot
+
+
+class EnemyStats:
+    """Stat view over a shared blueprint; only health lives on the enemy."""
+
+    __slots__ = ("_enemy",)
+
+    def __init__(self, enemy: "Enemy") -> None:
+        self._enemy = enemy
+
+    def __getitem__(self, key: str) -> int:
+        if key == "health":
+            return self._enemy.health
+        return self._enemy.blueprint.stats[key]
+
+    def __setitem__(self, key: str, value: int) -> None:
+        if key != "health":
+            raise KeyError(f"Enemy stat '{key}' is shared by its blueprint.")
+        self._enemy.health = value
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._enemy.blueprint.stats
+
+    def get(self, key: str, default: Optional[int] = None) -> Optional[int]:
+        if key == "health":
+            return self._enemy.health
+        return self._enemy.blueprint.stats.get(key, default)
+
+    @property
+    def health(self) -> int:
+        return self._enemy.health
+
+    @health.setter
+    def health(self, value: int) -> None:
+        self._enemy.health = value
+
+
+# Attribute reads (``enemy.stats.attack``) go straight to the blueprint's slots.
+for _name in STAT_NAMES:
+    if _name != "health":
+        setattr(EnemyStats, _name, property(attrgetter(f"_enemy.blueprint.stats.{_name}")))
 
 
 class Enemy:
+    __slots__ = ("enemy_id", "blueprint", "health", "rect")
+
+    color = (200, 80, 80)
+
     def __init__(self, enemy_id: str, blueprint: EnemyBlueprint, position: Tuple[int, int], tile_size: int) -> None:
         self.enemy_id = enemy_id
-        self.name = blueprint.name
-        self.stats = dict(blueprint.stats)
-        self.max_health = self.stats.get("health", 30)
-        self.stats["health"] = self.max_health
+        self.blueprint = blueprint
+        self.health = self.max_health
         self.rect = pygame.Rect(position[0], position[1], tile_size, tile_size)
-        self.loot_table = blueprint.loot_table
-        self.experience = blueprint.experience
-        self.color = (200, 80, 80)
+
+    @property
+    def name(self) -> str:
+        return self.blueprint.name
+
+    @property
+    def max_health(self) -> int:
+        return self.blueprint.stats.get("health", 30)
+
+    @property
+    def loot_table(self) -> List[Tuple[str, float]]:
+        return self.blueprint.loot_table
+
+    @property
+    def experience(self) -> int:
+        return self.blueprint.experience
+
+    @property
+    def stats(self) -> EnemyStats:
+        return EnemyStats(self)
 
     def draw(self, surface) -> None:  # noqa: ANN001 - pygame surface
         pygame.draw.rect(surface, self.color, self.rect)
 
     def take_damage(self, amount: int) -> None:
-        self.stats["health"] = max(self.stats["health"] - amount, 0)
+        self.health = max(self.health - amount, 0)
 
     def is_alive(self) -> bool:
-        return self.stats["health"] > 0
+        return self.health > 0
 
-    def drop_loot(self) -> List[Item]:
-        loot: List[Item] = []
-        for item_id, chance in self.loot_table:
-            if random.random() <= chance:
-                item = create_item(item_id)
-                if item:
-                    loot.append(item)
-        return loot
+    def drop_loot(self, stream: Optional[RandomStream] = None) -> List[Item]:
+        return self.blueprint.drop_loot(stream)
 
 
 ENEMIES: Dict[str, EnemyBlueprint] = {
     "slime": EnemyBlueprint(
         name="Forest Slime",
-        stats={"health": 30, "attack": 8, "defense": 1, "resistance": 0},
+        stats={"health": 30, "attack": 8, "defense": 1, "resistance": 0, "speed": 8},
         loot_table=[("herb", 0.6)],
         experience=25,
     ),
     "goblin": EnemyBlueprint(
         name="Goblin Scout",
-        stats={"health": 45, "attack": 12, "defense": 3, "resistance": 1},
+        stats={"health": 45, "attack": 12, "defense": 3, "resistance": 1, "speed": 11},
         loot_table=[("iron_ore", 0.35), ("health_potion", 0.15)],
         experience=40,
+        policy="bruiser",
     ),
     "wolf": EnemyBlueprint(
         name="Dire Wolf",
-        stats={"health": 55, "attack": 15, "defense": 4, "resistance": 2},
+        stats={"health": 55, "attack": 15, "defense": 4, "resistance": 2, "speed": 13},
         loot_table=[("herb", 0.2)],
         experience=50,
+        policy="expectimax",
     ),
 }
 
@@ -74,4 +182,17 @@ def create_enemy(enemy_id: str, position: Tuple[int, int], tile_size: int) -> Op
     blueprint = ENEMIES.get(enemy_id)
     if not blueprint:
         return None
-    return Enemy(enemy_id, blueprint, position, tile_size)
\ No newline at end of file
+    return Enemy(enemy_id, blueprint, position, tile_size)
+
+
+def resolve_loot_batch(kills: Mapping[str, int], stream: Optional[RandomStream] = None) -> Dict[str, int]:
+    """Roll loot for many kills, keyed by enemy id, returning summed item counts."""
+    stream = stream or get_rng().loot
+    totals: Dict[str, int] = {}
+    for enemy_id, count in kills.items():
+        blueprint = ENEMIES.get(enemy_id)
+        if not blueprint:
+            continue
+        for item_id, dropped in blueprint.compiled_loot().roll_counts(count, stream).items():
+            totals[item_id] = totals.get(item_id, 0) + dropped
+    return totals
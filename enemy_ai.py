@@ -0,0 +1,320 @@
+"""Enemy combat policies and a worker-thread planner for the searching ones.
+
+Policies pick one of ``ENEMY_ACTIONS`` from a ``DuelState``: the acting enemy
+against the player, which is all the search models. ``ExpectimaxPolicy``
+searches that duel with iterative deepening under a time budget and caches
+values in a transposition table. ``Planner`` runs searches on one background
+thread so a frame never waits on them; a turn whose search overruns its budget
+takes the policy's cheap fallback instead.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Tuple
+
+from skills import SKILLS
+from stats import STAT_NAMES
+
+ATTACK = "attack"
+HEAVY = "heavy"
+GUARD = "guard"
+ENEMY_ACTIONS: Tuple[str, ...] = (ATTACK, HEAVY, GUARD)
+
+# A heavy blow lands 60% of the time for 1.5x attack, then needs two turns to recover.
+HEAVY_HIT_CHANCE = 0.6
+HEAVY_COOLDOWN = 2
+
+
+@dataclass(frozen=True, slots=True)
+class DuelState:
+    """Hashable summary of one enemy's fight against the player."""
+
+    enemy_health: int
+    # The enemy's blueprint stats in STAT_NAMES order; "health" holds its maximum.
+    enemy_stats: Tuple[int, ...]
+    heavy_cooldown: int
+    guarding: bool
+    player_health: int
+    player_mana: int
+    # Player stats before buffs, in STAT_NAMES order.
+    player_base: Tuple[int, ...]
+    # Active (stat, amount, remaining) buffs.
+    buffs: Tuple[Tuple[str, int, int], ...]
+    skills: Tuple[str, ...]
+    cooldowns: Tuple[int, ...]
+
+    @classmethod
+    def capture(cls, enemy, player, heavy_cooldown: int = 0) -> "DuelState":  # noqa: ANN001 - runtime entities
+        """State as the enemy's turn starts; a guard it raised last turn has lapsed by then."""
+        stats = player.stats
+        return cls(
+            enemy.health,
+            tuple(enemy.max_health if name == "health" else enemy.stats.get(name, 0) for name in STAT_NAMES),
+            heavy_cooldown,
+            False,
+            stats["health"],
+            stats["mana"],
+            tuple(stats.base(name) for name in STAT_NAMES),
+            tuple((modifier.stat, modifier.amount, modifier.remaining) for modifier in stats.modifiers),
+            tuple(skill.skill_id for skill in player.skills),
+            tuple(skill.current_cooldown for skill in player.skills),
+        )
+
+    @property
+    def enemy_max_health(self) -> int:
+        return self.enemy_stats[_HEALTH]
+
+    @property
+    def player_max_health(self) -> int:
+        bonus = sum(amount for stat, amount, _ in self.buffs if stat == "max_health")
+        return self.player_base[_MAX_HEALTH] + bonus
+
+    def enemy_actions(self) -> Tuple[str, ...]:
+        return ENEMY_ACTIONS if self.heavy_cooldown == 0 else (ATTACK, GUARD)
+
+    def enemy_mapping(self) -> Dict[str, int]:
+        stats = dict(zip(STAT_NAMES, self.enemy_stats))
+        stats["health"] = self.enemy_health
+        return stats
+
+    def player_stats(self) -> Dict[str, int]:
+        """Effective player stats, buffs included."""
+        stats = dict(zip(STAT_NAMES, self.player_base))
+        for stat, amount, _ in self.buffs:
+            stats[stat] += amount
+        stats["health"], stats["mana"] = self.player_health, self.player_mana
+        return stats
+
+
+_HEALTH = STAT_NAMES.index("health")
+_ATTACK = STAT_NAMES.index("attack")
+_MAX_HEALTH = STAT_NAMES.index("max_health")
+
+
+class Policy:
+    name = "basic"
+    # Searching policies are worth running on the planner thread.
+    searches = False
+
+    def decide(self, state: DuelState, deadline: Optional[float] = None) -> str:
+        return ATTACK
+
+    def fallback(self, state: DuelState) -> str:
+        """Immediate choice for turns whose decision cannot wait."""
+        return self.decide(state)
+
+    def reset(self) -> None:
+        """Forget anything cached about the rules, e.g. after skills are redefined."""
+
+    def clone(self) -> "Policy":
+        """A policy with the same settings and nothing cached."""
+        return type(self)()
+
+
+class BruiserPolicy(Policy):
+    """Greedy rule of thumb: swing heavy unless the player's defense is buffed, guard when nearly dead."""
+
+    name = "bruiser"
+
+    def decide(self, state: DuelState, deadline: Optional[float] = None) -> str:
+        if state.enemy_health * 4 <= state.enemy_max_health and not state.guarding:
+            return GUARD
+        if state.heavy_cooldown == 0 and not any(stat == "defense" for stat, _, _ in state.buffs):
+            return HEAVY
+        return ATTACK
+
+
+class ExpectimaxPolicy(Policy):
+    """Depth-limited expectimax over the duel.
+
+    The enemy maximises; the player is modelled as choosing uniformly among
+    the moves available to them, and heavy blows branch on whether they land.
+    """
+
+    name = "expectimax"
+    searches = True
+
+    def __init__(self, max_depth: int = 6, table_size: int = 200_000) -> None:
+        self.max_depth = max_depth
+        self.table_size = table_size
+        self.table: Dict[Tuple[DuelState, int], float] = {}
+        self._fallback = BruiserPolicy()
+
+    def fallback(self, state: DuelState) -> str:
+        return self._fallback.decide(state)
+
+    def reset(self) -> None:
+        self.table.clear()
+
+    def clone(self) -> "ExpectimaxPolicy":
+        return ExpectimaxPolicy(self.max_depth, self.table_size)
+
+    def decide(self, state: DuelState, deadline: Optional[float] = None) -> str:
+        """Deepen until ``max_depth`` or ``deadline``; keeps the last completed depth's choice."""
+        deadline = deadline if deadline is not None else float("inf")
+        best = self.fallback(state)
+        for depth in range(1, self.max_depth + 1):
+            try:
+                best = max(
+                    state.enemy_actions(),
+                    key=lambda action: self._enemy_outcome(state, action, depth, deadline),
+                )
+            except _OutOfTime:
+                break
+        return best
+
+    # Search -------------------------------------------------------------
+    def _value(self, state: DuelState, depth: int, deadline: float) -> float:
+        """Value of ``state`` with the enemy to move, from the enemy's side."""
+        if state.player_health <= 0:
+            return 1.0 + depth
+        if state.enemy_health <= 0:
+            return -1.0 - depth
+        if depth == 0:
+            return state.enemy_health / state.enemy_max_health - state.player_health / state.player_max_health
+        key = (state, depth)
+        cached = self.table.get(key)
+        if cached is not None:
+            return cached
+        if time.perf_counter() > deadline:
+            raise _OutOfTime
+        state = replace(state, heavy_cooldown=max(state.heavy_cooldown - 1, 0), guarding=False)
+        value = max(self._enemy_outcome(state, action, depth, deadline) for action in state.enemy_actions())
+        if len(self.table) >= self.table_size:
+            self.table.clear()
+        self.table[key] = value
+        return value
+
+    def _enemy_outcome(self, state: DuelState, action: str, depth: int, deadline: float) -> float:
+        if action == GUARD:
+            return self._player_turn(replace(state, guarding=True), depth, deadline)
+        defense = state.player_stats()["defense"]
+        attack = state.enemy_stats[_ATTACK]
+        if action == ATTACK:
+            damage = max(attack - defense, 1)
+            return self._player_turn(replace(state, player_health=state.player_health - damage), depth, deadline)
+        damage = max(attack * 3 // 2 - defense, 1)
+        recovering = replace(state, heavy_cooldown=HEAVY_COOLDOWN)
+        hit = self._player_turn(replace(recovering, player_health=recovering.player_health - damage), depth, deadline)
+        miss = self._player_turn(recovering, depth, deadline)
+        return HEAVY_HIT_CHANCE * hit + (1 - HEAVY_HIT_CHANCE) * miss
+
+    def _player_turn(self, state: DuelState, depth: int, deadline: float) -> float:
+        if state.player_health <= 0:
+            return 1.0 + depth
+        # Buffs and cooldowns tick as the player's turn starts, as in CombatSystem.
+        state = replace(
+            state,
+            buffs=tuple((stat, amount, remaining - 1) for stat, amount, remaining in state.buffs if remaining > 1),
+            cooldowns=tuple(max(cooldown - 1, 0) for cooldown in state.cooldowns),
+        )
+        outcomes = self._player_moves(state)
+        return sum(self._value(outcome, depth - 1, deadline) for outcome in outcomes) / len(outcomes)
+
+    def _player_moves(self, state: DuelState) -> List[DuelState]:
+        player, enemy = state.player_stats(), state.enemy_mapping()
+        damage = max(player["attack"] - enemy["defense"], 2)
+        if state.guarding:
+            damage = max(damage // 2, 1)
+        moves = [replace(state, enemy_health=state.enemy_health - damage)]
+        for index, skill_id in enumerate(state.skills):
+            skill = SKILLS.get(skill_id)
+            if skill is None or state.cooldowns[index] or state.player_mana < skill.cost:
+                continue
+            healing = skill.healing(player)
+            if healing and not skill.damage_formulas and state.player_health >= player["max_health"]:
+                continue
+            cooldowns = state.cooldowns[:index] + (skill.cooldown_turns,) + state.cooldowns[index + 1 :]
+            moves.append(
+                replace(
+                    state,
+                    enemy_health=state.enemy_health - skill.damage(player, enemy),
+                    player_health=min(state.player_health + healing, player["max_health"]),
+                    player_mana=state.player_mana - skill.cost,
+                    buffs=state.buffs + skill.buffs,
+                    cooldowns=cooldowns,
+                )
+            )
+        return moves
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+POLICIES: Dict[str, Policy] = {policy.name: policy for policy in (Policy(), BruiserPolicy(), ExpectimaxPolicy())}
+
+
+def policy_for(enemy) -> Policy:  # noqa: ANN001 - runtime entity
+    blueprint = getattr(enemy, "blueprint", None)
+    return POLICIES.get(getattr(blueprint, "policy", "basic"), POLICIES["basic"])
+
+
+class PendingDecision:
+    """A search running on the planner thread, with the fallback to use if it overruns."""
+
+    __slots__ = ("future", "deadline", "fallback")
+
+    def __init__(self, future: Future, deadline: float, fallback: str) -> None:
+        self.future = future
+        self.deadline = deadline
+        self.fallback = fallback
+
+    def poll(self) -> Optional[str]:
+        """The chosen action once ready, the fallback once late, otherwise None."""
+        if self.future.done():
+            try:
+                return self.future.result()
+            except Exception:
+                return self.fallback
+        if time.perf_counter() >= self.deadline:
+            return self.fallback
+        return None
+
+
+class Planner:
+    """Runs policy searches on a single worker thread.
+
+    ``budget`` is the time one enemy turn may spend deciding. Searches stop
+    themselves at that deadline too, so a late search frees the worker soon
+    after its turn has moved on; the values it computed stay in the policy's
+    transposition table for later turns. Each planner searches with its own
+    clones of the shared policies, so games sharing a process never share or
+    contend for a transposition table.
+    """
+
+    def __init__(self, budget: float = 0.02) -> None:
+        self.budget = budget
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._policies: Dict[str, Policy] = {}
+
+    def policy(self, policy: Policy) -> Policy:
+        """This planner's own instance of ``policy``."""
+        own = self._policies.get(policy.name)
+        if own is None:
+            own = self._policies[policy.name] = policy.clone()
+        return own
+
+    def request(self, policy: Policy, state: DuelState) -> PendingDecision:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="enemy-ai")
+        own = self.policy(policy)
+        deadline = time.perf_counter() + self.budget
+        future = self._executor.submit(own.decide, state, deadline)
+        return PendingDecision(future, deadline, own.fallback(state))
+
+    def decide_now(self, policy: Policy, state: DuelState) -> str:
+        """Search on the calling thread within the same budget."""
+        return self.policy(policy).decide(state, time.perf_counter() + self.budget)
+
+    def reset(self) -> None:
+        for policy in self._policies.values():
+            policy.reset()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,273 @@
+"""Struct-of-arrays storage for large enemy populations."""
+
+from __future__ import annotations
+
+from operator import attrgetter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pygame
+
+from enemies import ENEMIES, EnemyBlueprint
+from items import Item
+from rng import RandomStream
+from stats import STAT_NAMES
+
+ARRAY_FIELDS = ("handle", "x", "y", "health", "max_health", "attack", "defense", "resistance", "type_id")
+
+
+class EnemyStore:
+    """Keeps enemy state in contiguous NumPy columns, compacted by swap-removal."""
+
+    def __init__(self, tile_size: int, capacity: int = 64) -> None:
+        self.tile_size = tile_size
+        self.type_names: List[str] = list(ENEMIES)
+        self._type_index: Dict[str, int] = {name: index for index, name in enumerate(self.type_names)}
+        self.count = 0
+        self._next_handle = 0
+        self._slots: Dict[int, int] = {}
+        self._columns: Dict[str, np.ndarray] = {name: np.zeros(capacity, dtype=np.int32) for name in ARRAY_FIELDS}
+        self._columns["handle"] = np.zeros(capacity, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        columns = self.__dict__.get("_columns")
+        if columns is None or name not in columns:
+            raise AttributeError(name)
+        return columns[name][: self.count]
+
+    def add(self, enemy_id: str, position: Tuple[int, int], health: Optional[int] = None) -> Optional[int]:
+        blueprint = ENEMIES.get(enemy_id)
+        if not blueprint:
+            return None
+        if enemy_id not in self._type_index:
+            self._type_index[enemy_id] = len(self.type_names)
+            self.type_names.append(enemy_id)
+        if self.count == len(self._columns["x"]):
+            self._grow()
+        slot = self.count
+        max_health = blueprint.stats.get("health", 30)
+        handle = self._next_handle
+        self._next_handle += 1
+        columns = self._columns
+        columns["handle"][slot] = handle
+        columns["x"][slot], columns["y"][slot] = position
+        columns["max_health"][slot] = max_health
+        columns["health"][slot] = max_health if health is None else health
+        columns["attack"][slot] = blueprint.stats.get("attack", 0)
+        columns["defense"][slot] = blueprint.stats.get("defense", 0)
+        columns["resistance"][slot] = blueprint.stats.get("resistance", 0)
+        columns["type_id"][slot] = self._type_index[enemy_id]
+        self._slots[handle] = slot
+        self.count += 1
+        return handle
+
+    def remove(self, handle: int) -> None:
+        slot = self._slots.pop(handle, None)
+        if slot is None:
+            return
+        last = self.count - 1
+        if slot != last:
+            for column in self._columns.values():
+                column[slot] = column[last]
+            self._slots[int(self._columns["handle"][slot])] = slot
+        self.count -= 1
+
+    def remove_dead(self) -> int:
+        alive = self.health > 0
+        removed = self.count - int(alive.sum())
+        if removed:
+            for name, column in self._columns.items():
+                kept = column[: self.count][alive]
+                column[: len(kept)] = kept
+            self.count -= removed
+            self._slots = {int(handle): slot for slot, handle in enumerate(self.handle)}
+        return removed
+
+    def refresh_type(self, enemy_id: str) -> None:
+        """Re-copy blueprint stats into every row of ``enemy_id`` after a definition reload."""
+        type_id = self._type_index.get(enemy_id)
+        blueprint = ENEMIES.get(enemy_id)
+        if type_id is None or blueprint is None:
+            return
+        rows = self.type_id == type_id
+        max_health = blueprint.stats.get("health", 30)
+        self.max_health[rows] = max_health
+        np.minimum(self.health, max_health, out=self.health, where=rows)
+        self.attack[rows] = blueprint.stats.get("attack", 0)
+        self.defense[rows] = blueprint.stats.get("defense", 0)
+        self.resistance[rows] = blueprint.stats.get("resistance", 0)
+
+    def clear(self) -> None:
+        self.count = 0
+        self._slots.clear()
+
+    def slot_of(self, handle: int) -> Optional[int]:
+        return self._slots.get(handle)
+
+    def type_name(self, slot: int) -> str:
+        return self.type_names[int(self._columns["type_id"][slot])]
+
+    def blueprint(self, slot: int) -> EnemyBlueprint:
+        return ENEMIES[self.type_name(slot)]
+
+    def view(self, handle: int) -> "EnemyView":
+        return EnemyView(self, handle)
+
+    def views(self) -> Iterator["EnemyView"]:
+        for handle in self.handle.tolist():
+            yield EnemyView(self, handle)
+
+    def damage(self, slots: np.ndarray, amounts: np.ndarray) -> None:
+        """Apply damage to many enemies at once, clamping health at zero."""
+        health = self.health
+        np.subtract.at(health, slots, amounts)
+        np.maximum(health, 0, out=health)
+
+    def colliding(self, rect: pygame.Rect) -> np.ndarray:
+        """Slots whose tile overlaps ``rect``."""
+        size = self.tile_size
+        x, y = self.x, self.y
+        mask = (x < rect.right) & (x + size > rect.left) & (y < rect.bottom) & (y + size > rect.top)
+        return np.flatnonzero(mask)
+
+    def to_dicts(self) -> List[Dict]:
+        names = self.type_names
+        return [
+            {"id": names[type_id], "position": [x, y], "health": health}
+            for type_id, x, y, health in zip(
+                self.type_id.tolist(), self.x.tolist(), self.y.tolist(), self.health.tolist()
+            )
+        ]
+
+    def _grow(self) -> None:
+        for name, column in self._columns.items():
+            grown = np.zeros(len(column) * 2, dtype=column.dtype)
+            grown[: len(column)] = column
+            self._columns[name] = grown
+
+
+class StoreStats:
+    __slots__ = ("_view",)
+
+    def __init__(self, view: "EnemyView") -> None:
+        self._view = view
+
+    def __getitem__(self, key: str) -> int:
+        store, slot = self._view.store, self._view.slot
+        if key in ARRAY_FIELDS:
+            return int(store._columns[key][slot])
+        return store.blueprint(slot).stats[key]
+
+    def __setitem__(self, key: str, value: int) -> None:
+        if key not in ARRAY_FIELDS:
+            raise KeyError(f"Enemy stat '{key}' is shared by its blueprint.")
+        self._view.store._columns[key][self._view.slot] = value
+
+    def __contains__(self, key: str) -> bool:
+        return key in ARRAY_FIELDS or key in self._view.blueprint.stats
+
+    def get(self, key: str, default: Optional[int] = None) -> Optional[int]:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+def _column_stat(name: str) -> property:
+    def fget(self: StoreStats) -> int:
+        return int(self._view.store._columns[name][self._view.slot])
+
+    def fset(self: StoreStats, value: int) -> None:
+        self._view.store._columns[name][self._view.slot] = value
+
+    return property(fget, fset)
+
+
+# Attribute reads (``enemy.stats.attack``) for combat; stats without a column come from the blueprint.
+for _name in STAT_NAMES:
+    if _name in ARRAY_FIELDS:
+        setattr(StoreStats, _name, _column_stat(_name))
+    else:
+        setattr(StoreStats, _name, property(attrgetter(f"_view.blueprint.stats.{_name}")))
+
+
+class EnemyView:
+    """Enemy-compatible handle onto one row of an EnemyStore."""
+
+    __slots__ = ("store", "handle")
+
+    color = (200, 80, 80)
+
+    def __init__(self, store: EnemyStore, handle: int) -> None:
+        self.store = store
+        self.handle = handle
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, EnemyView) and other.store is self.store and other.handle == self.handle
+
+    def __hash__(self) -> int:
+        return hash((id(self.store), self.handle))
+
+    @property
+    def slot(self) -> int:
+        slot = self.store.slot_of(self.handle)
+        if slot is None:
+            raise LookupError(f"Enemy handle {self.handle} was removed from its store.")
+        return slot
+
+    @property
+    def enemy_id(self) -> str:
+        return self.store.type_name(self.slot)
+
+    @property
+    def blueprint(self) -> EnemyBlueprint:
+        return self.store.blueprint(self.slot)
+
+    @property
+    def name(self) -> str:
+        return self.blueprint.name
+
+    @property
+    def experience(self) -> int:
+        return self.blueprint.experience
+
+    @property
+    def loot_table(self) -> List[Tuple[str, float]]:
+        return self.blueprint.loot_table
+
+    @property
+    def health(self) -> int:
+        return int(self.store._columns["health"][self.slot])
+
+    @health.setter
+    def health(self, value: int) -> None:
+        self.store._columns["health"][self.slot] = value
+
+    @property
+    def max_health(self) -> int:
+        return int(self.store._columns["max_health"][self.slot])
+
+    @property
+    def stats(self) -> StoreStats:
+        return StoreStats(self)
+
+    @property
+    def rect(self) -> pygame.Rect:
+        slot, size = self.slot, self.store.tile_size
+        columns = self.store._columns
+        return pygame.Rect(int(columns["x"][slot]), int(columns["y"][slot]), size, size)
+
+    def draw(self, surface) -> None:  # noqa: ANN001 - pygame surface
+        pygame.draw.rect(surface, self.color, self.rect)
+
+    def take_damage(self, amount: int) -> None:
+        self.health = max(self.health - amount, 0)
+
+    def is_alive(self) -> bool:
+        return self.health > 0
+
+    def drop_loot(self, stream: Optional[RandomStream] = None) -> List[Item]:
+        return self.blueprint.drop_loot(stream)
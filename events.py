@@ -0,0 +1,72 @@
+"""Typed publish/subscribe bus for gameplay events."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Tuple, Type, TypeVar
+
+E = TypeVar("E")
+
+
+@dataclass(frozen=True, slots=True)
+class PlayerMoved:
+    position: Tuple[int, int]
+
+
+@dataclass(frozen=True, slots=True)
+class CombatEnded:
+    victory: bool
+
+
+@dataclass(frozen=True, slots=True)
+class EnemyDefeated:
+    enemy: Any
+
+
+@dataclass(frozen=True, slots=True)
+class ItemGained:
+    item_id: str
+    name: str
+    count: int = 1
+    source: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class QuestAccepted:
+    quest: Any
+
+
+@dataclass(frozen=True, slots=True)
+class QuestCompleted:
+    quest: Any
+
+
+class EventBus:
+    """Dispatches events to handlers registered for their exact type."""
+
+    def __init__(self) -> None:
+        # Handler tuples are replaced, never mutated, so publish can iterate without copying.
+        self._handlers: Dict[type, Tuple[Callable[[Any], None], ...]] = {}
+
+    def subscribe(self, event_type: Type[E], handler: Callable[[E], None]) -> Callable[[], None]:
+        self._handlers[event_type] = self._handlers.get(event_type, ()) + (handler,)
+
+        def unsubscribe() -> None:
+            self.unsubscribe(event_type, handler)
+
+        return unsubscribe
+
+    def unsubscribe(self, event_type: type, handler: Callable[[Any], None]) -> None:
+        handlers = tuple(existing for existing in self._handlers.get(event_type, ()) if existing != handler)
+        if handlers:
+            self._handlers[event_type] = handlers
+        else:
+            self._handlers.pop(event_type, None)
+
+    def publish(self, event: object) -> None:
+        for handler in self._handlers.get(type(event), ()):
+            handler(event)
+
+    def has_subscribers(self, event_type: type) -> bool:
+        return event_type in self._handlers
+
@@ -0,0 +1,155 @@
+"""Fog-of-war bookkeeping, shadowcast field of view and the minimap overlay."""
+
+from __future__ import annotations
+
+import base64
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+
+import numpy as np
+import pygame
+
+Cell = Tuple[int, int]
+
+# Multipliers that map the first octant onto each of the eight octants.
+_OCTANTS = (
+    (1, 0, 0, 1),
+    (0, 1, 1, 0),
+    (0, -1, 1, 0),
+    (-1, 0, 0, 1),
+    (-1, 0, 0, -1),
+    (0, -1, -1, 0),
+    (0, 1, -1, 0),
+    (1, 0, 0, -1),
+)
+
+
+class FogOfWar:
+    """Explored tiles packed into a bitset, one bit per tile."""
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.bits = bytearray((width * height + 7) // 8)
+
+    def is_explored(self, x: int, y: int) -> bool:
+        index = y * self.width + x
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+    def reveal(self, cells: Iterable[Cell]) -> List[Cell]:
+        """Mark ``cells`` explored and return only those that were not explored before."""
+        newly_explored: List[Cell] = []
+        for x, y in cells:
+            if x < 0 or y < 0 or x >= self.width or y >= self.height:
+                continue
+            index = y * self.width + x
+            mask = 1 << (index & 7)
+            if not self.bits[index >> 3] & mask:
+                self.bits[index >> 3] |= mask
+                newly_explored.append((x, y))
+        return newly_explored
+
+    def explored_mask(self) -> np.ndarray:
+        """Boolean array indexed ``[x, y]`` to match ``pygame.surfarray``."""
+        flat = np.unpackbits(np.frombuffer(bytes(self.bits), dtype=np.uint8), bitorder="little")
+        return flat[: self.width * self.height].reshape(self.height, self.width).T.astype(bool)
+
+    def to_string(self) -> str:
+        return base64.b64encode(bytes(self.bits)).decode("ascii")
+
+    def load_string(self, payload: str) -> None:
+        data = base64.b64decode(payload) if payload else b""
+        self.bits = bytearray(len(self.bits))
+        self.bits[: len(data)] = data[: len(self.bits)]
+
+
+def compute_fov(origin: Cell, radius: int, blocks_sight: Callable[[int, int], bool]) -> Set[Cell]:
+    """Recursive shadowcasting; cost grows with the radius, not the map size."""
+    visible: Set[Cell] = {origin}
+    for xx, xy, yx, yy in _OCTANTS:
+        _cast_light(origin, 1, 1.0, 0.0, radius, (xx, xy, yx, yy), blocks_sight, visible)
+    return visible
+
+
+def _cast_light(
+    origin: Cell,
+    row: int,
+    start: float,
+    end: float,
+    radius: int,
+    transform: Tuple[int, int, int, int],
+    blocks_sight: Callable[[int, int], bool],
+    visible: Set[Cell],
+) -> None:
+    if start < end:
+        return
+    cx, cy = origin
+    xx, xy, yx, yy = transform
+    radius_squared = radius * radius
+    new_start = start
+    for distance in range(row, radius + 1):
+        dx, dy = -distance - 1, -distance
+        blocked = False
+        while dx <= 0:
+            dx += 1
+            x, y = cx + dx * xx + dy * xy, cy + dx * yx + dy * yy
+            left_slope = (dx - 0.5) / (dy + 0.5)
+            right_slope = (dx + 0.5) / (dy - 0.5)
+            if start < right_slope:
+                continue
+            if end > left_slope:
+                break
+            if dx * dx + dy * dy <= radius_squared:
+                visible.add((x, y))
+            if blocked:
+                if blocks_sight(x, y):
+                    new_start = right_slope
+                    continue
+                blocked = False
+                start = new_start
+            elif blocks_sight(x, y) and distance < radius:
+                blocked = True
+                _cast_light(origin, distance + 1, start, left_slope, radius, transform, blocks_sight, visible)
+                new_start = right_slope
+        if blocked:
+            break
+
+
+class Minimap:
+    """One pixel per tile, patched in place as new tiles are explored."""
+
+    def __init__(self, map_data: List[str], colours: Dict[str, Tuple[int, int, int]], scale: int = 4) -> None:
+        self.width = max(len(row) for row in map_data)
+        self.height = len(map_data)
+        self.scale = scale
+        default = colours.get(".", (60, 110, 60))
+        self.colours = np.zeros((self.width, self.height, 3), dtype=np.uint8)
+        for y, row in enumerate(map_data):
+            for x, tile in enumerate(row):
+                self.colours[x, y] = colours.get(tile, default)
+        self.surface = pygame.Surface((self.width, self.height))
+        self._scaled: pygame.Surface = pygame.Surface((self.width * scale, self.height * scale))
+        self._stale = True
+
+    def rebuild(self, fog: FogOfWar) -> None:
+        pixels = self.colours * fog.explored_mask()[:, :, None]
+        pygame.surfarray.blit_array(self.surface, pixels)
+        self._stale = True
+
+    def reveal(self, cells: List[Cell]) -> None:
+        if not cells:
+            return
+        xs, ys = np.array(cells, dtype=np.intp).T
+        pixels = pygame.surfarray.pixels3d(self.surface)
+        pixels[xs, ys] = self.colours[xs, ys]
+        del pixels
+        self._stale = True
+
+    def draw(self, surface: pygame.Surface, position: Tuple[int, int], marker: Cell) -> None:
+        if self._stale:
+            self._scaled = pygame.transform.scale(self.surface, (self.width * self.scale, self.height * self.scale))
+            self._stale = False
+        surface.blit(self._scaled, position)
+        marker_rect = pygame.Rect(
+            position[0] + marker[0] * self.scale, position[1] + marker[1] * self.scale, self.scale, self.scale
+        )
+        pygame.draw.rect(surface, (80, 170, 255), marker_rect)
@@ -0,0 +1,71 @@
+"""Font loading that avoids a system font scan on every start.
+
+``pygame.font.SysFont`` enumerates installed fonts each time a process starts,
+which is slow on Linux. Resolved file paths are kept in a small JSON cache so
+later starts open the font file directly.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+import pygame
+
+
+def default_cache_path() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "complex-python-rpg" / "fonts.json"
+
+
+class FontCache:
+    def __init__(self, cache_path: Optional[Path] = None) -> None:
+        self.cache_path = Path(cache_path) if cache_path else default_cache_path()
+        self._paths: Dict[str, str] = self._read_cache()
+        self._fonts: Dict[Tuple[str, int], pygame.font.Font] = {}
+        self._prefetch: Optional[threading.Thread] = None
+
+    def prefetch(self, names: Iterable[str]) -> None:
+        """Resolve uncached font paths on a background thread."""
+        missing = [name for name in names if name not in self._paths]
+        if missing:
+            self._prefetch = threading.Thread(target=self._resolve_all, args=(missing,), daemon=True)
+            self._prefetch.start()
+
+    def path_for(self, name: str) -> Optional[str]:
+        if self._prefetch is not None:
+            self._prefetch.join()
+            self._prefetch = None
+        if name not in self._paths:
+            self._resolve_all([name])
+        # An empty string records a font that is not installed; use pygame's default.
+        return self._paths[name] or None
+
+    def load(self, name: str, size: int) -> pygame.font.Font:
+        font = self._fonts.get((name, size))
+        if font is None:
+            font = self._fonts[(name, size)] = pygame.font.Font(self.path_for(name), size)
+        return font
+
+    def _resolve_all(self, names: Iterable[str]) -> None:
+        for name in names:
+            self._paths[name] = pygame.font.match_font(name) or ""
+        self._write_cache()
+
+    def _read_cache(self) -> Dict[str, str]:
+        try:
+            paths = json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        # Drop entries whose font file has since been removed.
+        return {name: path for name, path in paths.items() if not path or Path(path).exists()}
+
+    def _write_cache(self) -> None:
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self.cache_path.write_text(json.dumps(self._paths, indent=2))
+        except OSError:
+            pass
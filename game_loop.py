@@ -0,0 +1,127 @@
+"""Fixed-timestep simulation loop with independently paced rendering."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import pygame
+
+RENDER_MODES = ("uncapped", "capped", "on_change")
+
+
+class FrameBudgetScheduler:
+    """Runs deferrable work only while the current frame still has time left."""
+
+    def __init__(self) -> None:
+        self._pending: "OrderedDict[str, Callable[[], None]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def defer(self, name: str, task: Callable[[], None]) -> None:
+        """Queue ``task``; re-deferring the same name replaces the queued callback."""
+        self._pending[name] = task
+        self._pending.move_to_end(name)
+
+    def run(self, deadline: float, clock: Callable[[], float] = time.perf_counter) -> int:
+        completed = 0
+        while self._pending and clock() < deadline:
+            _, task = self._pending.popitem(last=False)
+            task()
+            completed += 1
+        return completed
+
+
+class GameLoop:
+    def __init__(
+        self,
+        game_state,  # noqa: ANN001 - runtime type
+        tick_rate: int = 60,
+        render_mode: str = "capped",
+        max_fps: int = 60,
+        autosave_seconds: Optional[float] = None,
+        content_poll_seconds: Optional[float] = 1.0,
+    ) -> None:
+        if render_mode not in RENDER_MODES:
+            raise ValueError(f"Unknown render mode '{render_mode}'.")
+        self.game_state = game_state
+        self.tick = 1.0 / tick_rate
+        self.render_mode = render_mode
+        self.max_fps = max_fps
+        self.frame_budget = 1.0 / max_fps
+        # Cap catch-up work so a long stall cannot snowball into ever longer frames.
+        self.max_steps_per_frame = 5
+        self.autosave_seconds = autosave_seconds
+        self.content_poll_seconds = content_poll_seconds
+        self.scheduler = FrameBudgetScheduler()
+        self.clock = pygame.time.Clock()
+        self.running = False
+        self.ticks = 0
+
+    def run(self) -> None:
+        self.running = True
+        previous = time.perf_counter()
+        accumulator = 0.0
+        while self.running:
+            frame_start = time.perf_counter()
+            accumulator += frame_start - previous
+            previous = frame_start
+
+            self._swap_content()
+            self._pump_events()
+            steps = 0
+            while accumulator >= self.tick and steps < self.max_steps_per_frame:
+                self.step()
+                accumulator -= self.tick
+                steps += 1
+            if steps == self.max_steps_per_frame:
+                accumulator = min(accumulator, self.tick)
+
+            if self.render_mode != "on_change" or self.game_state.dirty:
+                self.render()
+
+            self.scheduler.run(frame_start + self.frame_budget)
+            self._pace(accumulator)
+
+    def step(self) -> None:
+        self.game_state.update(self.tick)
+        self.ticks += 1
+        if self._every(self.autosave_seconds):
+            self.scheduler.defer("autosave", self.game_state.save_current_game)
+        if self._every(self.content_poll_seconds):
+            self.scheduler.defer("content_poll", self.game_state.content.poll)
+
+    def render(self) -> None:
+        screen = self.game_state.screen
+        screen.fill((0, 0, 0))
+        self.game_state.draw()
+        pygame.display.flip()
+        self.game_state.dirty = False
+
+    def stop(self) -> None:
+        self.running = False
+
+    def _every(self, seconds: Optional[float]) -> bool:
+        return bool(seconds) and self.ticks % max(int(seconds / self.tick), 1) == 0
+
+    def _swap_content(self) -> None:
+        # Staged definitions are swapped in here, between frames, never mid-update.
+        if self.game_state.content.has_pending():
+            self.game_state.content.commit()
+            self.game_state.dirty = True
+
+    def _pump_events(self) -> None:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.stop()
+            else:
+                self.game_state.handle_event(event)
+
+    def _pace(self, accumulator: float) -> None:
+        if self.render_mode == "capped":
+            self.clock.tick(self.max_fps)
+        elif self.render_mode == "on_change":
+            # Nothing to draw until the next simulation tick is due.
+            pygame.time.wait(max(int((self.tick - accumulator) * 1000), 0))
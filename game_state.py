@@ -1,75 +1,168 @@
 from __future__ import annotations
 
+import time
 from collections import deque
-from typing import Deque, Optional
+from typing import Deque, Dict, List, Optional, Tuple
 
 import pygame
 
 from combat import CombatSystem
+from content import ContentRegistry, register_default_sources
 from crafting import CraftingSystem
-from items import create_item
+from diagnostics import Diagnostics, StartupTimer
+from dialogue import DialogueCursor, DialogueLibrary
+from enemies import resolve_loot_batch
+from enemy_ai import Planner
+from events import (
+    CombatEnded,
+    EnemyDefeated,
+    EventBus,
+    ItemGained,
+    PlayerMoved,
+    QuestAccepted,
+    QuestCompleted,
+)
+from exploration import Minimap
+from fonts import FontCache
+from history import RewindBuffer
+from items import Item, create_item, resolve_item_id
 from player import Player
 from quests import Quest, QuestSystem
-from save_system import SaveSystem
-from world import World
+from rendering import EntityRenderer
+from rng import RNGService
+from save_system import SaveError, SaveSystem
+from telemetry import get_telemetry
+from widgets import ListRow, ListView
+from world import DIALOGUES, TILE_COLOURS, World
+
+# Enemies within this many tiles join a fight, up to MAX_ENCOUNTER in total.
+ENCOUNTER_RADIUS = 3
+MAX_ENCOUNTER = 6
 
 
 class GameState:
-    def __init__(self, screen: pygame.Surface) -> None:
+    def __init__(
+        self,
+        screen: Optional[pygame.Surface],
+        seed: Optional[int] = None,
+        save_system: Optional[SaveSystem] = None,
+        startup: Optional[StartupTimer] = None,
+        fonts: Optional[FontCache] = None,
+    ) -> None:
+        # Without a screen the state runs headless, e.g. as a server session.
         self.screen = screen
+        self.headless = screen is None
+        self.startup = startup or StartupTimer()
+        self.fonts = None if self.headless else fonts or FontCache()
+        if self.fonts:
+            # Resolve font files while the world is built; the fonts themselves load on first draw.
+            self.fonts.prefetch(["consolas"])
         self.mode = "explore"
-        self.world = World()
-        self.player = Player(self.world.spawn_point, self.world.tile_size)
-        self.crafting = CraftingSystem()
-        self.quests = QuestSystem()
-        self.save_system = SaveSystem()
+        self.rng = RNGService(seed)
+        self.events = EventBus()
+        self.save_system = save_system or SaveSystem()
         self.message_log: Deque[str] = deque(maxlen=6)
-        self.font = pygame.font.SysFont("consolas", 18)
-        self.big_font = pygame.font.SysFont("consolas", 24)
+        self.playtime = 0.0
+        # The phases below each take under a millisecond on the default map (see
+        # --startup-report), so only the font loads are deferred.
+        with self.startup.phase("save_read"):
+            payload = self._read_save()
+        with self.startup.phase("world"):
+            self.dialogues = DialogueLibrary(DIALOGUES, {"accept_quest": self._accept_npc_quest})
+            self.world = World(self.rng, dialogues=self.dialogues)
+            self.player = self._create_player(payload)
+            self.crafting = CraftingSystem()
+            self.quests = QuestSystem()
+        with self.startup.phase("renderers"):
+            self.entity_renderer = EntityRenderer(self.world.tile_size)
+            self.minimap = Minimap(self.world.map_data, TILE_COLOURS)
+        self.show_minimap = True
+        self.history = RewindBuffer()
+        # Enemy turns that need a search run on this worker instead of the frame.
+        self.planner = Planner()
+        self.ticks = 0
+        self.diagnostics = Diagnostics(self)
+        self.show_debug = False
 
         self.combat: Optional[CombatSystem] = None
         self.dialogue_npc = None
+        self.dialogue_cursor: Optional[DialogueCursor] = None
         self.dialogue_selection = 0
-        self.inventory_selection = 0
-        self.crafting_selection = 0
-
-        self.load_saved_game()
+        visible_rows = 10 if self.headless else (screen.get_height() - 280) // 24
+        self.inventory_view = ListView(self._inventory_rows, self._inventory_version, visible_rows)
+        self.crafting_view = ListView(self._crafting_rows, self._crafting_version, visible_rows)
+        self._slots_version = 0
+        self.slot_view = ListView(self._slot_rows, lambda: self._slots_version, visible_rows)
+        self.dirty = True
+
+        self._register_subscribers()
+        with self.startup.phase("content"):
+            self.content = ContentRegistry()
+            register_default_sources(self.content, self)
+            self.content.poll()
+            self.content.commit()
+        with self.startup.phase("restore"):
+            self._restore(payload)
         self.message_log.append("Welcome to the frontier.")
 
+    @property
+    def font(self) -> Optional[pygame.font.Font]:
+        return self.fonts.load("consolas", 18) if self.fonts else None
+
+    @property
+    def big_font(self) -> Optional[pygame.font.Font]:
+        return self.fonts.load("consolas", 24) if self.fonts else None
+
     # ------------------------------------------------------------------
     # High-level control
     # ------------------------------------------------------------------
     def handle_event(self, event: pygame.event.Event) -> None:
-        if event.type != pygame.KEYDOWN:
-            return
-        if self.mode == "explore":
-            self._handle_explore_input(event.key)
+        if event.type == pygame.KEYDOWN:
+            self.handle_key(event.key)
+
+    def handle_key(self, key: int) -> None:
+        self.dirty = True
+        if key == pygame.K_F3:
+            self.show_debug = not self.show_debug
+            if self.show_debug:
+                self.diagnostics.report()
+        elif key == pygame.K_F4:
+            path = self.diagnostics.dump()
+            self.message_log.append(f"Memory report written to {path}.")
+        elif self.mode == "explore":
+            self._handle_explore_input(key)
         elif self.mode == "combat":
-            self._handle_combat_input(event.key)
+            self._handle_combat_input(key)
         elif self.mode == "dialogue":
-            self._handle_dialogue_input(event.key)
+            self._handle_dialogue_input(key)
         elif self.mode == "inventory":
-            self._handle_inventory_input(event.key)
+            self._handle_inventory_input(key)
         elif self.mode == "crafting":
-            self._handle_crafting_input(event.key)
+            self._handle_crafting_input(key)
+        elif self.mode == "load":
+            self._handle_load_input(key)
 
     def update(self, delta_time: float) -> None:
-        if self.mode == "explore":
-            self.player.update(delta_time)
-            encounter = self.world.enemy_at_player(self.player.rect)
-            if encounter and not self.combat:
-                self.start_combat(encounter)
-
-        if self.mode == "combat" and self.combat:
-            if self.combat.outcome == "victory":
-                self.finish_combat(victory=True)
-            elif self.combat.outcome == "defeat":
-                self.finish_combat(victory=False)
+        self.playtime += delta_time
+        self.ticks += 1
+        self.history.record(self, self.ticks)
+        if self.combat:
+            self.combat.update()
+        if self.mode == "explore" and self.player.update(delta_time):
+            self.dirty = True
+
+    def close(self) -> None:
+        """Release background workers; call once the game is done with."""
+        self.planner.shutdown()
 
     def draw(self) -> None:
-        self.world.draw(self.screen)
-        self.player.draw(self.screen)
+        self.world.draw_terrain(self.screen)
+        self.entity_renderer.draw(self.screen, self.world, self.player)
         self._draw_ui()
+        if self.show_minimap:
+            self._draw_minimap()
+        if self.show_debug:
+            self._draw_debug_overlay()
 
         if self.mode == "combat" and self.combat:
             self._draw_combat_overlay()
@@ -79,31 +172,41 @@ class GameState:
             self._draw_inventory_overlay()
         elif self.mode == "crafting":
             self._draw_crafting_overlay()
+        elif self.mode == "load":
+            self._draw_load_overlay()
 
     # ------------------------------------------------------------------
     # Input handling per mode
     # ------------------------------------------------------------------
     def _handle_explore_input(self, key: int) -> None:
         if key == pygame.K_UP:
-            self.player.move("up", self.world)
+            self._move_player("up")
         elif key == pygame.K_DOWN:
-            self.player.move("down", self.world)
+            self._move_player("down")
         elif key == pygame.K_LEFT:
-            self.player.move("left", self.world)
+            self._move_player("left")
         elif key == pygame.K_RIGHT:
-            self.player.move("right", self.world)
+            self._move_player("right")
         elif key == pygame.K_e:
             self._interact()
         elif key == pygame.K_i:
             self.mode = "inventory"
-            self.inventory_selection = 0
+            self.inventory_view.reset()
         elif key == pygame.K_c:
             self.mode = "crafting"
-            self.crafting_selection = 0
+            self.crafting_view.reset()
+        elif key == pygame.K_m:
+            self.show_minimap = not self.show_minimap
         elif key == pygame.K_s:
             self.save_current_game()
+        elif key == pygame.K_r:
+            self.rewind()
+        elif key == pygame.K_n:
+            self.save_current_game(self._next_free_slot())
         elif key == pygame.K_l:
-            self.load_saved_game()
+            self.mode = "load"
+            self._slots_version += 1
+            self.slot_view.reset()
 
     def _handle_combat_input(self, key: int) -> None:
         if not self.combat:
@@ -116,6 +219,12 @@ class GameState:
             self.combat.player_use_skill(1)
         elif key == pygame.K_6:
             self.combat.player_use_skill(2)
+        elif key == pygame.K_7:
+            self.combat.player_use_skill(3)
+        elif key in (pygame.K_TAB, pygame.K_RIGHT):
+            self.combat.cycle_target(1)
+        elif key == pygame.K_LEFT:
+            self.combat.cycle_target(-1)
         elif key == pygame.K_4:
             self.combat.player_use_consumable("health_potion")
         elif key == pygame.K_5:
@@ -128,117 +237,277 @@ class GameState:
 
     def _handle_dialogue_input(self, key: int) -> None:
         npc = self.dialogue_npc
-        if not npc:
+        cursor = self.dialogue_cursor
+        if not npc or not cursor:
             return
-        options = npc.dialogue_tree.current().options
+        options = cursor.current().options
         if key in (pygame.K_UP, pygame.K_w):
             self.dialogue_selection = (self.dialogue_selection - 1) % len(options)
         elif key in (pygame.K_DOWN, pygame.K_s):
             self.dialogue_selection = (self.dialogue_selection + 1) % len(options)
         elif key in (pygame.K_RETURN, pygame.K_SPACE):
-            action, has_next = npc.dialogue_tree.choose(self.dialogue_selection)
-            if action == "accept_quest" and npc.quest_id:
-                self._accept_quest(npc.quest_id)
-                npc.has_given_quest = True
+            option, has_next = cursor.choose(self.dialogue_selection)
+            if option and option.handler:
+                option.handler(npc)
             if not has_next:
                 self.mode = "explore"
                 self.dialogue_npc = None
+                self.dialogue_cursor = None
                 self.dialogue_selection = 0
 
-    def _handle_inventory_input(self, key: int) -> None:
-        items = self.player.inventory
-        if not items:
-            if key in (pygame.K_ESCAPE, pygame.K_i):
-                self.mode = "explore"
-            return
+    def _handle_list_input(self, view: ListView, key: int) -> bool:
+        """Shared navigation for list menus; returns True when ``key`` was consumed."""
         if key in (pygame.K_UP, pygame.K_w):
-            self.inventory_selection = (self.inventory_selection - 1) % len(items)
+            view.move(-1)
         elif key in (pygame.K_DOWN, pygame.K_s):
-            self.inventory_selection = (self.inventory_selection + 1) % len(items)
-        elif key in (pygame.K_RETURN, pygame.K_SPACE):
-            item_id = self.player.list_inventory_ids()[self.inventory_selection]
-            message = self.player.consume_item(item_id)
+            view.move(1)
+        elif key == pygame.K_PAGEUP:
+            view.page(-1)
+        elif key == pygame.K_PAGEDOWN:
+            view.page(1)
+        elif key == pygame.K_TAB:
+            view.cycle_filter()
+        elif key == pygame.K_o:
+            view.cycle_sort()
+        else:
+            return False
+        return True
+
+    def _handle_inventory_input(self, key: int) -> None:
+        if key in (pygame.K_ESCAPE, pygame.K_i):
+            self.mode = "explore"
+            return
+        if self._handle_list_input(self.inventory_view, key):
+            return
+        row = self.inventory_view.selected()
+        if row and key in (pygame.K_RETURN, pygame.K_SPACE):
+            message = self.player.consume_item(row.key)
             self.message_log.append(message)
             if "No " not in message:
                 self.mode = "explore"
-        elif key in (pygame.K_ESCAPE, pygame.K_i):
-            self.mode = "explore"
 
     def _handle_crafting_input(self, key: int) -> None:
-        recipes = list(self.crafting.recipes.keys())
         if key in (pygame.K_ESCAPE, pygame.K_c):
             self.mode = "explore"
             return
-        if not recipes:
+        if self._handle_list_input(self.crafting_view, key):
             return
-        if key in (pygame.K_UP, pygame.K_w):
-            self.crafting_selection = (self.crafting_selection - 1) % len(recipes)
-        elif key in (pygame.K_DOWN, pygame.K_s):
-            self.crafting_selection = (self.crafting_selection + 1) % len(recipes)
-        elif key in (pygame.K_RETURN, pygame.K_SPACE):
-            recipe = recipes[self.crafting_selection]
-            result = self.crafting.craft(self.player, recipe)
-            self.message_log.append(result)
+        row = self.crafting_view.selected()
+        if not row:
+            return
+        if key in (pygame.K_RETURN, pygame.K_SPACE):
+            self.message_log.append(self.crafting.craft(self.player, row.key))
+        elif key == pygame.K_m:
+            self.message_log.append(self.crafting.craft_max(self.player, row.key))
+
+    def _handle_load_input(self, key: int) -> None:
+        if key in (pygame.K_ESCAPE, pygame.K_l):
+            self.mode = "explore"
+            return
+        if self._handle_list_input(self.slot_view, key):
+            return
+        row = self.slot_view.selected()
+        if row and key in (pygame.K_RETURN, pygame.K_SPACE):
+            self.load_saved_game(row.key)
+            self.mode = "explore"
+
+    def _slot_rows(self) -> List[ListRow]:
+        rows: List[ListRow] = []
+        for info in self.save_system.list_slots():
+            header = info.header
+            minutes, seconds = divmod(int(header.playtime), 60)
+            saved = time.strftime("%Y-%m-%d %H:%M", time.localtime(header.timestamp))
+            text = (
+                f"{info.slot}  LV {header.level}  {minutes // 60}:{minutes % 60:02d}:{seconds:02d}  "
+                f"at {header.location[0]},{header.location[1]}  {saved}"
+            )
+            rows.append(ListRow(info.slot, text, info.slot))
+        return rows
+
+    def _next_free_slot(self) -> str:
+        taken = {info.slot for info in self.save_system.list_slots()}
+        number = 1
+        while f"slot{number}" in taken:
+            number += 1
+        return f"slot{number}"
+
+    def _inventory_version(self) -> Tuple[int, int]:
+        inventory = self.player.inventory
+        return id(inventory), inventory.version
+
+    def _inventory_rows(self) -> List[ListRow]:
+        return [
+            ListRow(
+                item_id,
+                f"{item.name} x{count} - {item.description}",
+                item.name,
+                item.item_type,
+                getattr(item, "rarity", ""),
+            )
+            for item_id, item, count in self.player.inventory.entries()
+        ]
+
+    def _crafting_version(self) -> Tuple[int, int, int]:
+        return self._inventory_version() + (self.crafting.version,)
+
+    def _crafting_rows(self) -> List[ListRow]:
+        craftable = self.crafting.craftable_counts(self.player.inventory)
+        rows: List[ListRow] = []
+        for item_id, components in self.crafting.recipes.items():
+            output = create_item(item_id)
+            name = item_id.replace("_", " ")
+            component_summary = ", ".join(f"{key}x{value}" for key, value in components.items())
+            rows.append(
+                ListRow(
+                    item_id,
+                    f"{name} <- {component_summary} (can make {craftable.get(item_id, 0)})",
+                    name,
+                    output.item_type if output else "",
+                    getattr(output, "rarity", ""),
+                )
+            )
+        return rows
+
+    # ------------------------------------------------------------------
+    # Event subscribers
+    # ------------------------------------------------------------------
+    def _register_subscribers(self) -> None:
+        self.events.subscribe(PlayerMoved, self._on_player_moved)
+        self.events.subscribe(CombatEnded, self._on_combat_ended)
+        self.quests.attach(self.events)
+        self.events.subscribe(QuestAccepted, self._on_quest_accepted)
+        self.events.subscribe(QuestCompleted, self._on_quest_completed)
+        self.events.subscribe(ItemGained, self._on_item_gained)
+
+    def _on_player_moved(self, event: PlayerMoved) -> None:
+        self.minimap.reveal(self.world.reveal_around(self.player.rect))
+        encounter = self.world.enemy_at_player(self.player.rect)
+        if encounter and not self.combat:
+            self.start_combat(encounter)
+
+    def _on_combat_ended(self, event: CombatEnded) -> None:
+        self.finish_combat(victory=event.victory)
+
+    def _on_quest_accepted(self, event: QuestAccepted) -> None:
+        self.message_log.append(f"Quest accepted: {event.quest.name}.")
+
+    def _on_quest_completed(self, event: QuestCompleted) -> None:
+        self._reward_quest(event.quest)
+
+    def _accept_npc_quest(self, npc) -> None:  # noqa: ANN001 - NPC runtime type
+        if npc.quest_id:
+            self._accept_quest(npc.quest_id)
+            npc.has_given_quest = True
+
+    def _on_item_gained(self, event: ItemGained) -> None:
+        if event.source == "loot":
+            amount = "" if event.count == 1 else f"{event.count}x "
+            self.message_log.append(f"Found {amount}{event.name}.")
+        elif event.source == "harvest":
+            self.message_log.append(f"Gathered {event.name}.")
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
+    def _move_player(self, direction: str) -> None:
+        if self.player.move(direction, self.world):
+            self.events.publish(PlayerMoved(self.player.rect.topleft))
+
+    def _refresh_exploration(self) -> None:
+        self.world.reveal_around(self.player.rect)
+        self.minimap.rebuild(self.world.fog)
+
+    def _gain_item(self, item: Item, source: str) -> None:
+        self.player.add_item(item)
+        self.events.publish(ItemGained(resolve_item_id(item), item.name, 1, source))
+
+    def _gain_loot(self, counts: Dict[str, int]) -> None:
+        telemetry = get_telemetry()
+        for item_id, count in counts.items():
+            item = create_item(item_id)
+            if not item:
+                continue
+            self.player.add_items({item_id: count})
+            telemetry.emit("loot", item=item_id, count=count)
+            self.events.publish(ItemGained(item_id, item.name, count, "loot"))
+
     def _interact(self) -> None:
         npc = self.world.npc_near_player(self.player.rect)
         if npc:
             self.mode = "dialogue"
             self.dialogue_npc = npc
-            npc.start_dialogue()
+            self.dialogue_cursor = npc.start_dialogue()
             self.dialogue_selection = 0
             return
         resource = self.world.harvest_resource(self.player.rect)
         if resource:
-            self.player.add_item(resource)
-            self.message_log.append(f"Gathered {resource.name}.")
+            self._gain_item(resource, source="harvest")
 
     def start_combat(self, enemy) -> None:  # noqa: ANN001 - enemy runtime type
-        self.combat = CombatSystem(self.player, enemy)
+        # Always keep the moment before a fight so a defeat can be undone.
+        self.history.record(self, self.ticks, force=True)
+        nearby = self.world.enemies_near(self.player.rect, ENCOUNTER_RADIUS, limit=MAX_ENCOUNTER)
+        enemies = [enemy] + [other for other in nearby if other != enemy][: MAX_ENCOUNTER - 1]
+        self.combat = CombatSystem(self.player, enemies, self.events, planner=self.planner)
         self.mode = "combat"
+        if self.combat.outcome:
+            # Faster enemies act before the player and may end the fight at once.
+            self.finish_combat(victory=self.combat.outcome == "victory")
 
     def finish_combat(self, victory: bool) -> None:
         if not self.combat:
             return
-        enemy = self.combat.enemy
+        telemetry = get_telemetry()
         if victory:
-            self.message_log.append(f"Defeated {enemy.name}!")
-            self.player.gain_experience(enemy.experience)
-            loot = enemy.drop_loot()
-            for item in loot:
-                self.player.add_item(item)
-                self.message_log.append(f"Found {item.name}.")
-            completions = self.quests.record_event("slay", enemy.enemy_id)
-            if completions:
-                finished = self.quests.remove_completed()
-                for quest in finished:
-                    self._reward_quest(quest)
-            self.world.remove_enemy(enemy)
+            kills: Dict[str, int] = {}
+            for enemy in self.combat.enemies:
+                telemetry.emit(
+                    "kill", enemy=enemy.enemy_id, level=self.player.stats["level"], group=len(self.combat.enemies)
+                )
+                self.message_log.append(f"Defeated {enemy.name}!")
+                self.player.gain_experience(enemy.experience)
+                self.events.publish(EnemyDefeated(enemy))
+                self.world.remove_enemy(enemy)
+                kills[enemy.enemy_id] = kills.get(enemy.enemy_id, 0) + 1
+            # One batched roll for the whole encounter, straight into item counts.
+            self._gain_loot(resolve_loot_batch(kills, self.rng.loot))
         else:
-            self.message_log.append("You were defeated. Returning to camp...")
+            telemetry.emit(
+                "death",
+                enemies=[enemy.enemy_id for enemy in self.combat.enemies],
+                level=self.player.stats["level"],
+                position=list(self.player.rect.topleft),
+            )
+            self.message_log.append("You were defeated. Returning to camp... (R to rewind)")
             self.player.stats["health"] = self.player.stats["max_health"]
             self.player.stats["mana"] = self.player.stats["max_mana"]
             self.player.rect.topleft = self.world.spawn_point
-            enemy.stats["health"] = enemy.max_health
+            for enemy in self.combat.enemies:
+                enemy.health = enemy.max_health
         self.mode = "explore"
         self.combat = None
 
+    def rewind(self, steps: int = 1) -> bool:
+        snapshot = self.history.rewind(self, steps)
+        if not snapshot:
+            self.message_log.append("Nothing to rewind.")
+            return False
+        self._refresh_exploration()
+        self.message_log.append("Rewound to an earlier moment.")
+        return True
+
     def _reward_quest(self, quest: Quest) -> None:
         self.player.gain_experience(quest.reward_experience)
         for item_id in quest.reward_items:
             item = create_item(item_id)
             if item:
-                self.player.add_item(item)
+                self._gain_item(item, source="quest")
         self.message_log.append(f"Quest complete: {quest.name}!")
 
     def _accept_quest(self, quest_id: str) -> None:
-        if quest_id == "slime_cull":
-            quest = self.world.get_default_quest()
-            message = self.quests.add_quest(quest)
-            self.message_log.append(message)
+        problem = self.quests.accept(quest_id)
+        if problem:
+            self.message_log.append(problem)
 
     # ------------------------------------------------------------------
     # Rendering helpers
@@ -261,11 +530,31 @@ class GameState:
             self.screen.blit(header, (8, quest_y))
             quest_y += 20
             for quest in self.quests.list_active():
-                text = f"{quest.name}: {quest.progress}/{quest.required}"
+                text = f"{quest.name}: {quest.summary()}"
                 entry_surface = self.font.render(text, True, (220, 220, 180))
                 self.screen.blit(entry_surface, (10, quest_y))
                 quest_y += 20
 
+    def _draw_minimap(self) -> None:
+        width = self.minimap.width * self.minimap.scale
+        tile = self.world.tile_size
+        marker = (self.player.rect.centerx // tile, self.player.rect.centery // tile)
+        self.minimap.draw(self.screen, (self.screen.get_width() - width - 8, 8), marker)
+
+    def _draw_debug_overlay(self) -> None:
+        report = self.diagnostics.last_report
+        if not report:
+            return
+        lines = report.lines()
+        panel = pygame.Surface((520, 20 * len(lines) + 10))
+        panel.set_alpha(200)
+        panel.fill((10, 10, 30))
+        x, y = 8, self.screen.get_height() // 3
+        self.screen.blit(panel, (x, y))
+        for index, line in enumerate(lines):
+            text = self.font.render(line, True, (180, 255, 180))
+            self.screen.blit(text, (x + 8, y + 5 + index * 20))
+
     def _draw_combat_overlay(self) -> None:
         width, height = self.screen.get_size()
         panel = pygame.Surface((width, 180))
@@ -273,15 +562,23 @@ class GameState:
         panel.fill((20, 20, 20))
         self.screen.blit(panel, (0, height - 180))
 
-        enemy = self.combat.enemy
+        combat = self.combat
+        target = combat.enemy
+        x = 20
+        for enemy in combat.enemies:
+            effects = "".join(f" [{effect.name}]" for effect in combat.effects_on(enemy))
+            marker = "> " if enemy is target else "  "
+            colour = (255, 255, 255) if enemy.is_alive() else (120, 120, 120)
+            text = self.font.render(f"{marker}{enemy.name} {enemy.health}/{enemy.max_health}{effects}", True, colour)
+            self.screen.blit(text, (x, height - 170))
+            x += text.get_width() + 16
         lines = [
-            f"Facing {enemy.name}",
-            f"Enemy HP: {enemy.stats['health']}/{enemy.max_health}",
-            "Actions: 1-Attack 2-Fireball 3-Heal 4-Use HP Potion 5-Use MP Potion",
+            f"Target: {target.name}  (Tab/Left/Right to switch)",
+            "Actions: 1-Attack 2-Fireball 3-Heal 6-Shield 7-Flame Wave 4-HP Potion 5-MP Potion",
         ]
         for index, line in enumerate(lines):
             text = self.big_font.render(line, True, (255, 255, 255))
-            self.screen.blit(text, (20, height - 170 + index * 30))
+            self.screen.blit(text, (20, height - 145 + index * 30))
 
         y = height - 80
         for entry in self.combat.round_log:
@@ -290,8 +587,8 @@ class GameState:
             y += 20
 
     def _draw_dialogue_overlay(self) -> None:
-        npc = self.dialogue_npc
-        if not npc:
+        cursor = self.dialogue_cursor
+        if not cursor:
             return
         width, height = self.screen.get_size()
         panel = pygame.Surface((width - 40, 200))
@@ -299,7 +596,7 @@ class GameState:
         panel.fill((30, 30, 50))
         self.screen.blit(panel, (20, height - 220))
 
-        node = npc.dialogue_tree.current()
+        node = cursor.current()
         text_surface = self.big_font.render(node.text, True, (255, 255, 255))
         self.screen.blit(text_surface, (40, height - 210))
 
@@ -323,11 +620,7 @@ class GameState:
             self.screen.blit(empty, (120, 140))
             return
 
-        for index, item in enumerate(self.player.inventory):
-            colour = (255, 240, 120) if index == self.inventory_selection else (220, 220, 220)
-            text = f"{item.name} - {item.description}"
-            entry = self.font.render(text, True, colour)
-            self.screen.blit(entry, (120, 140 + index * 24))
+        self._draw_list(self.inventory_view)
 
     def _draw_crafting_overlay(self) -> None:
         width, height = self.screen.get_size()
@@ -339,32 +632,78 @@ class GameState:
         title = self.big_font.render("Crafting", True, (255, 255, 255))
         self.screen.blit(title, (120, 100))
 
-        recipes = list(self.crafting.recipes.items())
-        if not recipes:
+        if not self.crafting.recipes:
             empty = self.font.render("No recipes available.", True, (200, 200, 200))
             self.screen.blit(empty, (120, 140))
             return
 
-        for index, (item_name, components) in enumerate(recipes):
-            colour = (255, 240, 120) if index == self.crafting_selection else (220, 220, 220)
-            component_summary = ", ".join(f"{key}x{value}" for key, value in components.items())
-            text = f"{item_name.replace('_', ' ')} <- {component_summary}"
-            entry = self.font.render(text, True, colour)
-            self.screen.blit(entry, (120, 140 + index * 24))
+        self._draw_list(self.crafting_view)
+
+    def _draw_load_overlay(self) -> None:
+        width, height = self.screen.get_size()
+        panel = pygame.Surface((width - 160, height - 160))
+        panel.set_alpha(220)
+        panel.fill((30, 40, 50))
+        self.screen.blit(panel, (80, 80))
+
+        title = self.big_font.render("Load Game", True, (255, 255, 255))
+        self.screen.blit(title, (120, 100))
+        if not len(self.slot_view):
+            empty = self.font.render("No saved games.", True, (200, 200, 200))
+            self.screen.blit(empty, (120, 140))
+            return
+        self._draw_list(self.slot_view)
+
+    def _draw_list(self, view: ListView) -> None:
+        status = self.font.render(view.status() + "  (PgUp/PgDn, Tab filter, O sort)", True, (170, 170, 170))
+        self.screen.blit(status, (120, 136))
+        view.draw(self.screen, self.font, (120, 164))
 
     # ------------------------------------------------------------------
     # Persistence helpers
     # ------------------------------------------------------------------
-    def save_current_game(self) -> None:
-        self.save_system.save_game(self.player, self.world, self.quests)
-        self.message_log.append("Game saved.")
+    def save_current_game(self, slot: Optional[str] = None) -> None:
+        if slot:
+            self.save_system.slot = slot
+        self.save_system.save_game(self.player, self.world, self.quests, self.playtime)
+        self._slots_version += 1
+        self.message_log.append(f"Game saved to {self.save_system.slot}.")
+
+    def load_saved_game(self, slot: Optional[str] = None) -> bool:
+        """Switch to ``slot`` and load it; an empty or damaged save is reported and the current game kept."""
+        try:
+            payload = self.save_system.load_game(slot)
+        except (OSError, SaveError) as error:
+            self.message_log.append(f"Could not load save: {error}")
+            return False
+        if payload is None:
+            self.message_log.append(f"Save slot '{slot or self.save_system.slot}' is empty.")
+            return False
+        if slot:
+            self.save_system.slot = slot
+        self.player = self._create_player(payload)
+        self._restore(payload)
+        self.history.clear()
+        return True
+
+    def _read_save(self) -> Optional[dict]:
+        try:
+            return self.save_system.load_game()
+        except (OSError, SaveError) as error:
+            self.message_log.append(f"Could not load save: {error}")
+            return None
+
+    def _create_player(self, payload: Optional[dict]) -> Player:
+        if not payload:
+            return Player(self.world.spawn_point, self.world.tile_size)
+        return Player.from_dict(payload.get("player", {}), self.world.tile_size)
 
-    def load_saved_game(self) -> None:
-        payload = self.save_system.load_game()
+    def _restore(self, payload: Optional[dict]) -> None:
         if not payload:
-            self.player = Player(self.world.spawn_point, self.world.tile_size)
+            self._refresh_exploration()
             return
-        self.player = Player.from_dict(payload.get("player", {}), self.world.tile_size)
         self.world.load_state(payload.get("world", {}))
         self.quests.from_dict(payload.get("quests", {}))
+        self.playtime = payload.get("playtime", 0.0)
+        self._refresh_exploration()
         self.message_log.append("Loaded saved game.")
@@ -0,0 +1,198 @@
+"""Bounded rewind history built from structurally shared snapshots.
+
+A snapshot is a tree of immutable tuples. Each capture compares new state with
+the previous snapshot chunk by chunk and reuses every chunk that did not
+change, so retained memory grows with what changed between snapshots rather
+than with the size of the world. Enemies and resources are chunked by map
+region rather than list position, so removing one does not shift the rest into
+new chunks. Shared chunks also make diffing cheap: equal sections are usually
+the very same object.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from player import Player
+
+FOG_CHUNK = 64
+# Side of the square map region, in tiles, whose entities share a chunk.
+REGION = 8
+
+Chunks = Tuple[tuple, ...]
+# (region, records) pairs ordered by region.
+Regions = Tuple[Tuple[Tuple[int, int], tuple], ...]
+
+
+@dataclass(frozen=True, slots=True)
+class Snapshot:
+    tick: int
+    position: Tuple[int, int]
+    stats: Tuple[Tuple[str, int], ...]
+    inventory: Tuple[Tuple[str, int], ...]
+    # (enemy_id, x, y, health) records and (x, y, item_id) resources by region.
+    enemies: Regions
+    resources: Regions
+    fog: Tuple[bytes, ...]
+    # (quest_id, progress) for active quests, and completed quest ids.
+    quests: Tuple[Tuple[str, Tuple[int, ...]], ...]
+    completed_quests: Tuple[str, ...]
+
+
+def _share(previous: Any, current: Any) -> Any:
+    return previous if previous == current else current
+
+
+def _share_chunks(previous: Sequence, items: Sequence, size: int) -> tuple:
+    chunks = []
+    for index, start in enumerate(range(0, len(items), size)):
+        chunk = items[start : start + size]
+        if index < len(previous) and previous[index] == chunk:
+            chunk = previous[index]
+        chunks.append(chunk)
+    return tuple(chunks)
+
+
+def _share_regions(
+    previous: Regions, records: Iterable[tuple], region_of: Callable[[tuple], Tuple[int, int]]
+) -> Regions:
+    grouped: Dict[Tuple[int, int], List[tuple]] = {}
+    for record in records:
+        grouped.setdefault(region_of(record), []).append(record)
+    old = dict(previous)
+    regions = []
+    for region in sorted(grouped):
+        chunk = tuple(grouped[region])
+        if old.get(region) == chunk:
+            chunk = old[region]
+        regions.append((region, chunk))
+    return tuple(regions)
+
+
+def _flatten_regions(regions: Regions) -> List:
+    return [entry for _, chunk in regions for entry in chunk]
+
+
+def capture(game_state, tick: int, previous: Optional[Snapshot] = None) -> Snapshot:  # noqa: ANN001 - GameState
+    player, world = game_state.player, game_state.world
+    span = world.tile_size * REGION
+    resources = ((x, y, item_id) for (x, y), item_id in world.resource_nodes.items())
+    quest_state = game_state.quests.to_dict()
+    quests = tuple((entry["quest_id"], tuple(entry["progress"])) for entry in quest_state["quests"])
+    snapshot = Snapshot(
+        tick=tick,
+        position=(player.rect.x, player.rect.y),
+        stats=tuple(player.stats.to_dict().items()),
+        inventory=tuple(player.inventory.counts().items()),
+        enemies=_share_regions(
+            previous.enemies if previous else (),
+            world.enemy_records(),
+            lambda record: (record[1] // span, record[2] // span),
+        ),
+        # Resource positions are already in tiles.
+        resources=_share_regions(
+            previous.resources if previous else (),
+            resources,
+            lambda record: (record[0] // REGION, record[1] // REGION),
+        ),
+        fog=_share_chunks(previous.fog if previous else (), bytes(world.fog.bits), FOG_CHUNK),
+        quests=quests,
+        completed_quests=tuple(quest_state["completed"]),
+    )
+    if previous is None:
+        return snapshot
+    # Reuse whole sections from the previous snapshot wherever nothing changed.
+    shared = {
+        section.name: _share(getattr(previous, section.name), getattr(snapshot, section.name))
+        for section in fields(Snapshot)
+        if section.name not in ("tick", "position")
+    }
+    return Snapshot(tick=tick, position=snapshot.position, **shared)
+
+
+def restore(game_state, snapshot: Snapshot) -> None:  # noqa: ANN001 - GameState
+    world = game_state.world
+    game_state.player = Player.from_dict(
+        {
+            "position": list(snapshot.position),
+            "stats": dict(snapshot.stats),
+            "inventory": [{"id": item_id, "count": count} for item_id, count in snapshot.inventory],
+        },
+        world.tile_size,
+    )
+    world.restore_state(
+        [(enemy_id, (x, y), health) for enemy_id, x, y, health in _flatten_regions(snapshot.enemies)],
+        {(x, y): item_id for x, y, item_id in _flatten_regions(snapshot.resources)},
+        b"".join(snapshot.fog),
+    )
+    quests = [{"quest_id": quest_id, "progress": list(progress)} for quest_id, progress in snapshot.quests]
+    game_state.quests.from_dict({"quests": quests, "completed": list(snapshot.completed_quests)})
+
+
+def diff(before: Snapshot, after: Snapshot) -> Dict[str, List]:
+    """Sections that differ; chunked sections also list the differing regions or fog chunk indices."""
+    changes: Dict[str, List] = {}
+    for section in fields(Snapshot):
+        name = section.name
+        if name == "tick":
+            continue
+        old, new = getattr(before, name), getattr(after, name)
+        if old is new or old == new:
+            continue
+        if name in ("enemies", "resources"):
+            old_regions, new_regions = dict(old), dict(new)
+            changes[name] = sorted(
+                region
+                for region in old_regions.keys() | new_regions.keys()
+                if old_regions.get(region) is not new_regions.get(region)
+                and old_regions.get(region) != new_regions.get(region)
+            )
+        elif name == "fog":
+            width = max(len(old), len(new))
+            changes[name] = [
+                index
+                for index in range(width)
+                if index >= len(old) or index >= len(new) or (old[index] is not new[index] and old[index] != new[index])
+            ]
+        else:
+            changes[name] = []
+    return changes
+
+
+class RewindBuffer:
+    def __init__(self, capacity: int = 300, interval: int = 60) -> None:
+        # Defaults keep one snapshot per second of 60 Hz ticks for five minutes.
+        self.interval = interval
+        self.snapshots: Deque[Snapshot] = deque(maxlen=capacity)
+
+    def __len__(self) -> int:
+        return len(self.snapshots)
+
+    @property
+    def latest(self) -> Optional[Snapshot]:
+        return self.snapshots[-1] if self.snapshots else None
+
+    def record(self, game_state, tick: int, force: bool = False) -> Optional[Snapshot]:  # noqa: ANN001 - GameState
+        if not force and tick % self.interval:
+            return None
+        snapshot = capture(game_state, tick, self.latest)
+        if self.latest is not None and not force and not diff(self.latest, snapshot):
+            # Nothing changed; keep the older snapshot so history reaches further back.
+            return None
+        self.snapshots.append(snapshot)
+        return snapshot
+
+    def rewind(self, game_state, steps: int = 1) -> Optional[Snapshot]:  # noqa: ANN001 - GameState
+        """Restore the snapshot ``steps`` back, discarding everything newer."""
+        if steps <= 0 or len(self.snapshots) < steps:
+            return None
+        for _ in range(steps - 1):
+            self.snapshots.pop()
+        snapshot = self.snapshots.pop()
+        restore(game_state, snapshot)
+        return snapshot
+
+    def clear(self) -> None:
+        self.snapshots.clear()
@@ -0,0 +1,101 @@
+"""Counted inventory that stores one stack per item id instead of one object per unit."""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from items import Item, create_item, resolve_item_id
+
+
+class Inventory:
+    def __init__(self) -> None:
+        self._counts: Dict[str, int] = {}
+        self._items: Dict[str, Item] = {}
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __bool__(self) -> bool:
+        return bool(self._counts)
+
+    def __iter__(self) -> Iterator[Tuple[Item, int]]:
+        return iter(self.stacks())
+
+    def add(self, item: Item, count: int = 1) -> None:
+        self._add(resolve_item_id(item), item, count)
+
+    def add_by_id(self, item_id: str, count: int = 1) -> bool:
+        item = self._items.get(item_id) or create_item(item_id)
+        if not item:
+            return False
+        self._add(item_id, item, count)
+        return True
+
+    def add_counts(self, counts: Mapping[str, int]) -> None:
+        for item_id, count in counts.items():
+            if count > 0:
+                self.add_by_id(item_id, count)
+
+    def remove(self, item_id: str, count: int = 1) -> Optional[Item]:
+        held = self._counts.get(item_id, 0)
+        if held < count:
+            return None
+        item = self._items[item_id]
+        if held == count:
+            del self._counts[item_id]
+            del self._items[item_id]
+        else:
+            self._counts[item_id] = held - count
+        self.version += 1
+        return item
+
+    def count(self, item_id: str) -> int:
+        return self._counts.get(item_id, 0)
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self._counts)
+
+    def ids(self) -> List[str]:
+        return list(self._counts)
+
+    def entries(self) -> List[Tuple[str, Item, int]]:
+        return [(item_id, self._items[item_id], count) for item_id, count in self._counts.items()]
+
+    def stacks(self) -> List[Tuple[Item, int]]:
+        return [(self._items[item_id], count) for item_id, count in self._counts.items()]
+
+    def total_units(self) -> int:
+        return sum(self._counts.values())
+
+    def refresh(self, item_ids: Iterable[str]) -> None:
+        """Swap held stacks over to the current prototype after a definition reload."""
+        for item_id in item_ids:
+            if item_id in self._items:
+                item = create_item(item_id)
+                if item:
+                    self._items[item_id] = item
+        self.version += 1
+
+    def clear(self) -> None:
+        self._counts.clear()
+        self._items.clear()
+        self.version += 1
+
+    def _add(self, item_id: str, item: Item, count: int) -> None:
+        if count <= 0:
+            return
+        self._items.setdefault(item_id, item)
+        self._counts[item_id] = self._counts.get(item_id, 0) + count
+        self.version += 1
+
+    def to_list(self) -> List[Dict]:
+        return [
+            {"id": item_id, "name": self._items[item_id].name, "count": count}
+            for item_id, count in self._counts.items()
+        ]
+
+    def load_list(self, payload: List[Dict]) -> None:
+        self.clear()
+        for entry in payload:
+            self.add_by_id(entry.get("id", ""), entry.get("count", 1))
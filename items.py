@@ -3,10 +3,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, Iterable, Optional
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class Item:
     name: str
     item_type: str
@@ -19,7 +19,7 @@ class Item:
         raise NotImplementedError("Base items are not directly usable.")
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class Consumable(Item):
     heal_amount: int = 0
     mana_amount: int = 0
@@ -42,12 +42,12 @@ class Consumable(Item):
         return f"Used {self.name} and " + " and ".join(segments) if segments else f"Used {self.name}."
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class Equipment(Item):
     stats: Dict[str, int] = field(default_factory=dict)
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class Resource(Item):
     rarity: str = "common"
 
@@ -96,9 +96,31 @@ ITEM_LIBRARY: Dict[str, Callable[[], Item]] = {
 }
 
 
+# Items are immutable, so every holder shares one prototype per id.
+_PROTOTYPES: Dict[str, Item] = {}
+_IDS_BY_NAME: Dict[str, str] = {}
+
+
 def create_item(item_id: str) -> Optional[Item]:
-    factory = ITEM_LIBRARY.get(item_id)
-    return factory() if factory else None
+    item = _PROTOTYPES.get(item_id)
+    if item is None:
+        factory = ITEM_LIBRARY.get(item_id)
+        if not factory:
+            return None
+        item = _PROTOTYPES[item_id] = factory()
+        _IDS_BY_NAME[item.name] = item_id
+    return item
+
+
+def clear_prototypes(item_ids: Optional[Iterable[str]] = None) -> None:
+    if item_ids is None:
+        _PROTOTYPES.clear()
+        _IDS_BY_NAME.clear()
+        return
+    for item_id in item_ids:
+        item = _PROTOTYPES.pop(item_id, None)
+        if item is not None:
+            _IDS_BY_NAME.pop(item.name, None)
 
 
 def serialise_item(item: Item) -> Dict[str, str]:
@@ -106,11 +128,14 @@ def serialise_item(item: Item) -> Dict[str, str]:
 
 
 def resolve_item_id(item: Item) -> str:
-    for key, factory in ITEM_LIBRARY.items():
-        if factory().name == item.name:
+    item_id = _IDS_BY_NAME.get(item.name)
+    if item_id:
+        return item_id
+    for key in ITEM_LIBRARY:
+        if create_item(key).name == item.name:
             return key
     return item.name.lower().replace(" ", "_")
 
 
 def deserialise_item(payload: Dict[str, str]) -> Optional[Item]:
-    return create_item(payload.get("id", ""))
\ No newline at end of file
+    return create_item(payload.get("id", ""))
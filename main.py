@@ -1,34 +1,49 @@
 """Entry point for the RPG."""
 
+import sys
+
 import pygame
 
-from game_state import GameState
+from diagnostics import StartupTimer
+from telemetry import configure_telemetry, get_telemetry
+
+
+def show_loading(screen: pygame.Surface) -> None:
+    # pygame's bundled default font needs no system font lookup.
+    text = pygame.font.Font(None, 32).render("Loading...", True, (230, 230, 230))
+    screen.fill((0, 0, 0))
+    screen.blit(text, text.get_rect(center=screen.get_rect().center))
+    pygame.display.flip()
 
 
 def main() -> None:
-    pygame.init()
-    screen = pygame.display.set_mode((1280, 720))
-    pygame.display.set_caption("Python RPG")
-    clock = pygame.time.Clock()
-
-    game_state = GameState(screen)
-
-    running = True
-    while running:
-        delta_time = clock.tick(60) / 1000.0
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            else:
-                game_state.handle_event(event)
-
-        game_state.update(delta_time)
-        screen.fill((0, 0, 0))
+    startup = StartupTimer()
+    if "--no-telemetry" not in sys.argv:
+        configure_telemetry()
+    with startup.phase("display"):
+        pygame.display.init()
+        pygame.font.init()
+        screen = pygame.display.set_mode((1280, 720))
+        pygame.display.set_caption("Python RPG")
+        show_loading(screen)
+    with startup.phase("imports"):
+        from game_loop import GameLoop
+        from game_state import GameState
+
+    game_state = GameState(screen, startup=startup)
+    with startup.phase("first_frame"):
         game_state.draw()
         pygame.display.flip()
-
-    pygame.quit()
+    startup.finish()
+    if "--startup-report" in sys.argv:
+        print("\n".join(startup.lines()))
+    try:
+        GameLoop(game_state, tick_rate=60, render_mode="capped", max_fps=60, autosave_seconds=120.0).run()
+    finally:
+        game_state.close()
+        get_telemetry().close()
+        pygame.quit()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,158 @@
+"""Versioned save schema: step-by-step migrations and structural validation.
+
+``MIGRATIONS[n]`` upgrades a payload from schema ``n`` to ``n + 1``. Payloads
+without a ``schema_version`` are the original single-file ``save.json`` format.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List
+
+from stats import STAT_NAMES
+
+SCHEMA_VERSION = 2
+
+Payload = Dict[str, Any]
+MIGRATIONS: Dict[int, Callable[[Payload], Payload]] = {}
+
+
+def migration(from_version: int) -> Callable[[Callable[[Payload], Payload]], Callable[[Payload], Payload]]:
+    def register(function: Callable[[Payload], Payload]) -> Callable[[Payload], Payload]:
+        MIGRATIONS[from_version] = function
+        return function
+
+    return register
+
+
+def schema_version(payload: Payload) -> int:
+    return int(payload.get("schema_version", 0))
+
+
+def _section(container: Payload, key: str, kind: type, default: Any) -> Any:
+    """``container[key]``, created from ``default`` if missing; ValueError if it has the wrong type."""
+    value = container.setdefault(key, default)
+    if not isinstance(value, kind):
+        raise ValueError(f"{key}: expected {'an object' if kind is dict else 'a list'}")
+    return value
+
+
+def upgrade(payload: Payload) -> Payload:
+    """Apply every migration between the payload's version and SCHEMA_VERSION."""
+    if not isinstance(payload, dict):
+        raise ValueError("save payload is not an object")
+    version = schema_version(payload)
+    if version > SCHEMA_VERSION:
+        raise ValueError(f"Save schema {version} is newer than supported schema {SCHEMA_VERSION}.")
+    while version < SCHEMA_VERSION:
+        payload = MIGRATIONS[version](payload)
+        version += 1
+        payload["schema_version"] = version
+    return payload
+
+
+@migration(0)
+def _stack_inventory(payload: Payload) -> Payload:
+    # v0 stored one inventory entry per unit and had no exploration or playtime.
+    player = _section(payload, "player", dict, {})
+    stacks: Dict[str, Dict[str, Any]] = {}
+    for entry in _section(player, "inventory", list, []):
+        if not isinstance(entry, dict):
+            raise ValueError("inventory: expected a list of objects")
+        item_id = entry.get("id", "")
+        stack = stacks.setdefault(item_id, {"id": item_id, "name": entry.get("name", item_id), "count": 0})
+        stack["count"] += entry.get("count", 1)
+    player["inventory"] = list(stacks.values())
+    _section(payload, "world", dict, {}).setdefault("explored", "")
+    _section(_section(payload, "quests", dict, {}), "quests", list, [])
+    payload.setdefault("playtime", 0.0)
+    return payload
+
+
+@migration(1)
+def _quest_objectives(payload: Payload) -> Payload:
+    # v1 stored full single-goal quest definitions; v2 keeps ids and per-objective
+    # progress against the quest catalogue, plus the ids of completed quests.
+    quests = _section(payload, "quests", dict, {})
+    entries = _section(quests, "quests", list, [])
+    if not all(isinstance(entry, dict) for entry in entries):
+        raise ValueError("quests: expected a list of objects")
+    quests["quests"] = [
+        {"quest_id": entry["quest_id"], "progress": [entry.get("progress", 0)]}
+        for entry in entries
+        if not entry.get("completed", False)
+    ]
+    quests.setdefault("completed", [])
+    return payload
+
+
+# ----------------------------------------------------------------------
+# Validation
+# ----------------------------------------------------------------------
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_point(value: Any) -> bool:
+    return isinstance(value, list) and len(value) == 2 and all(_is_int(part) for part in value)
+
+
+def _entries(container: Payload, key: str, path: str, errors: List[str]) -> List[Any]:
+    value = container.get(key, [])
+    if isinstance(value, list):
+        return value
+    errors.append(f"{path}: expected a list")
+    return []
+
+
+def validate(payload: Payload) -> List[str]:
+    """Structural problems in a current-schema payload; empty when it is loadable."""
+    errors: List[str] = []
+    if schema_version(payload) != SCHEMA_VERSION:
+        errors.append(f"schema_version is {schema_version(payload)}, expected {SCHEMA_VERSION}")
+    for section in ("player", "world", "quests"):
+        if not isinstance(payload.get(section), dict):
+            errors.append(f"{section}: missing or not an object")
+    if errors:
+        return errors
+
+    player = payload["player"]
+    if not _is_point(player.get("position")):
+        errors.append("player.position: expected [x, y] integers")
+    stats = player.get("stats")
+    if not isinstance(stats, dict):
+        errors.append("player.stats: expected an object")
+    else:
+        for name, value in stats.items():
+            if name not in STAT_NAMES:
+                errors.append(f"player.stats.{name}: unknown stat")
+            elif not _is_int(value):
+                errors.append(f"player.stats.{name}: expected an integer")
+    for index, entry in enumerate(_entries(player, "inventory", "player.inventory", errors)):
+        if not isinstance(entry, dict) or not isinstance(entry.get("id"), str):
+            errors.append(f"player.inventory[{index}]: expected an object with an id")
+        elif not _is_int(entry.get("count")) or entry["count"] <= 0:
+            errors.append(f"player.inventory[{index}].count: expected a positive integer")
+
+    world = payload["world"]
+    for index, entry in enumerate(_entries(world, "enemies", "world.enemies", errors)):
+        if not isinstance(entry, dict) or not isinstance(entry.get("id"), str) or not _is_point(entry.get("position")):
+            errors.append(f"world.enemies[{index}]: expected id and position")
+        elif "health" in entry and not _is_int(entry["health"]):
+            errors.append(f"world.enemies[{index}].health: expected an integer")
+    for index, entry in enumerate(_entries(world, "resources", "world.resources", errors)):
+        if not isinstance(entry, dict) or not isinstance(entry.get("item"), str) or not _is_point(entry.get("position")):
+            errors.append(f"world.resources[{index}]: expected item and position")
+    if not isinstance(world.get("explored", ""), str):
+        errors.append("world.explored: expected a string")
+
+    for index, entry in enumerate(_entries(payload["quests"], "quests", "quests", errors)):
+        if not isinstance(entry, dict) or not isinstance(entry.get("quest_id"), str):
+            errors.append(f"quests[{index}]: expected an object with a quest_id")
+            continue
+        progress = entry.get("progress")
+        if not isinstance(progress, list) or not all(_is_int(value) and value >= 0 for value in progress):
+            errors.append(f"quests[{index}].progress: expected a list of non-negative integers")
+    completed = payload["quests"].get("completed", [])
+    if not isinstance(completed, list) or not all(isinstance(quest_id, str) for quest_id in completed):
+        errors.append("quests.completed: expected a list of quest ids")
+    return errors
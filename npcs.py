@@ -5,7 +5,7 @@ from typing import Optional, Tuple
 
 import pygame
 
-from dialogue import DialogueTree
+from dialogue import DialogueCursor, DialogueGraph
 
 
 @dataclass
@@ -13,7 +13,7 @@ class NPC:
     name: str
     position: Tuple[int, int]
     tile_size: int
-    dialogue_tree: DialogueTree
+    dialogue: DialogueGraph
     quest_id: Optional[str] = None
 
     def __post_init__(self) -> None:
@@ -24,6 +24,5 @@ class NPC:
     def draw(self, surface) -> None:  # noqa: ANN001 - pygame surface
         pygame.draw.rect(surface, self.color, self.rect)
 
-    def start_dialogue(self) -> DialogueTree:
-        self.dialogue_tree.reset()
-        return self.dialogue_tree
\ No newline at end of file
+    def start_dialogue(self) -> DialogueCursor:
+        return DialogueCursor(self.dialogue)
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""Precomputed experience curve with cumulative thresholds and stat gains."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+import numpy as np
+
+LEVEL_GAINS: Dict[str, int] = {
+    "max_health": 12,
+    "max_mana": 6,
+    "attack": 3,
+    "defense": 2,
+    "magic": 3,
+    "resistance": 1,
+}
+
+
+class LevelCurve:
+    """Cumulative XP needed for each level and the stats gained on the way there.
+
+    ``thresholds[n]`` is the total XP needed to reach level ``n + 1`` and
+    ``gains[name][n]`` the total bonus to ``name`` at that level, so any grant
+    resolves with one binary search instead of one ``level_up`` per level.
+    The table grows on demand when a grant runs past its end.
+    """
+
+    def __init__(
+        self,
+        first_step: int = 100,
+        growth: float = 1.3,
+        level_gains: Mapping[str, int] = LEVEL_GAINS,
+        levels: int = 50,
+    ) -> None:
+        self.growth = growth
+        self.level_gains = dict(level_gains)
+        self.thresholds: List[int] = [0]
+        self._steps: List[int] = [first_step]
+        self.gains: Dict[str, List[int]] = {name: [0] for name in self.level_gains}
+        self._extend(levels)
+
+    def __len__(self) -> int:
+        return len(self.thresholds)
+
+    def threshold(self, level: int) -> int:
+        self._extend(level)
+        return self.thresholds[level - 1]
+
+    def step(self, level: int) -> int:
+        """XP needed to go from ``level`` to ``level + 1``."""
+        self._extend(level)
+        return self._steps[level - 1]
+
+    def level_for(self, total_experience: int) -> int:
+        while total_experience >= self.thresholds[-1]:
+            self._extend(len(self.thresholds) * 2)
+        return bisect_right(self.thresholds, total_experience)
+
+    def levels_for(self, totals: Iterable[int]) -> np.ndarray:
+        """Vectorised ``level_for`` for batch simulations."""
+        totals = np.fromiter(totals, dtype=np.int64)
+        if totals.size:
+            self.level_for(int(totals.max()))
+        return np.searchsorted(np.asarray(self.thresholds, dtype=np.int64), totals, side="right")
+
+    def gains_between(self, from_level: int, to_level: int) -> Dict[str, int]:
+        self._extend(to_level)
+        return {name: column[to_level - 1] - column[from_level - 1] for name, column in self.gains.items()}
+
+    def resolve(self, level: int, experience: int, amount: int) -> Tuple[int, int, Dict[str, int]]:
+        """Apply ``amount`` XP at ``level`` with ``experience`` banked.
+
+        Returns the new level, the XP carried into it and the stat gains.
+        """
+        total = self.threshold(level) + experience + amount
+        new_level = max(self.level_for(total), level)
+        return new_level, total - self.thresholds[new_level - 1], self.gains_between(level, new_level)
+
+    def _extend(self, levels: int) -> None:
+        # One extra entry keeps ``step`` valid for the last tabulated level.
+        while len(self.thresholds) <= levels:
+            step = self._steps[-1]
+            self.thresholds.append(self.thresholds[-1] + step)
+            self._steps.append(int(step * self.growth))
+            for name, column in self.gains.items():
+                column.append(column[-1] + self.level_gains[name])
+
+
+DEFAULT_CURVE = LevelCurve()
@@ -1,89 +1,300 @@
+"""Quest catalogue with prerequisite chains and compact per-player progress.
+
+Definitions form a DAG through ``requires``. A ``QuestSystem`` keeps one status
+byte and one unmet-prerequisite counter per catalogued quest; only active quests
+carry objective progress. Completing a quest decrements the counters of its
+direct dependents, so availability updates touch just the affected nodes.
+"""
+
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 
-@dataclass
-class Quest:
+from events import EnemyDefeated, EventBus, ItemGained, QuestAccepted, QuestCompleted
+from telemetry import get_telemetry
+
+LOCKED, AVAILABLE, ACTIVE, DONE = range(4)
+
+
+@dataclass(frozen=True, slots=True)
+class Objective:
+   goal_type: str  # "slay" an enemy id or "gather" an item id
+   target: str
+   required: int
+
+
+@dataclass(frozen=True, slots=True)
+class QuestDefinition:
    quest_id: str
    name: str
    description: str
-   goal_type: str
-   target: str
-   required: int
-   reward_experience: int
+   objectives: Tuple[Objective, ...]
+   reward_experience: int = 0
+   reward_items: Tuple[str, ...] = ()
+   requires: Tuple[str, ...] = ()
+   # NPC dialogue that hands the quest out; quests without one start once available.
+   giver: Optional[str] = None
+
+
+QUEST_DEFINITIONS: List[QuestDefinition] = [
+   QuestDefinition(
+      quest_id="slime_cull",
+      name="Forest Cleaning",
+      description="Defeat three forest slimes to keep the path clear.",
+      objectives=(Objective("slay", "slime", 3),),
+      reward_experience=120,
+      reward_items=("health_potion",),
+      giver="elder_rowan",
+   ),
+   QuestDefinition(
+      quest_id="goblin_menace",
+      name="Goblin Menace",
+      description="Drive off two goblin scouts and gather herbs for the wounded.",
+      objectives=(Objective("slay", "goblin", 2), Objective("gather", "herb", 2)),
+      reward_experience=150,
+      reward_items=("mana_potion",),
+      requires=("slime_cull",),
+   ),
+   QuestDefinition(
+      quest_id="wolf_hunt",
+      name="The Dire Wolf",
+      description="Hunt down the dire wolf leading the forest's beasts.",
+      objectives=(Objective("slay", "wolf", 1),),
+      reward_experience=200,
+      reward_items=("health_potion", "health_potion"),
+      requires=("goblin_menace",),
+   ),
+]
+
+
+class QuestCatalogue:
+   """Immutable quest graph, validated as a DAG when built."""
+
+   def __init__(self, definitions: Iterable[QuestDefinition]) -> None:
+      self.definitions: List[QuestDefinition] = list(definitions)
+      self.index: Dict[str, int] = {}
+      for position, definition in enumerate(self.definitions):
+         if definition.quest_id in self.index:
+            raise ValueError(f"Duplicate quest id '{definition.quest_id}'.")
+         self.index[definition.quest_id] = position
+
+      dependents: List[List[int]] = [[] for _ in self.definitions]
+      sources: List[int] = []
+      targets: List[int] = []
+      for position, definition in enumerate(self.definitions):
+         for required in definition.requires:
+            if required not in self.index:
+               raise ValueError(f"Quest '{definition.quest_id}' requires unknown quest '{required}'.")
+            dependents[self.index[required]].append(position)
+            sources.append(self.index[required])
+            targets.append(position)
+      self.dependents: Tuple[Tuple[int, ...], ...] = tuple(map(tuple, dependents))
+      self.edge_sources = np.array(sources, dtype=np.int32)
+      self.edge_targets = np.array(targets, dtype=np.int32)
+      self.requirement_counts = np.bincount(self.edge_targets, minlength=len(self.definitions)).astype(np.int16)
+      self._check_acyclic()
+
+   def __len__(self) -> int:
+      return len(self.definitions)
+
+   def __contains__(self, quest_id: object) -> bool:
+      return quest_id in self.index
+
+   def get(self, quest_id: str) -> QuestDefinition:
+      return self.definitions[self.index[quest_id]]
+
+   def _check_acyclic(self) -> None:
+      remaining = self.requirement_counts.astype(np.int32)
+      ready = list(np.flatnonzero(remaining == 0))
+      visited = 0
+      while ready:
+         position = ready.pop()
+         visited += 1
+         for dependent in self.dependents[position]:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+               ready.append(dependent)
+      if visited != len(self.definitions):
+         stuck = [self.definitions[position].quest_id for position in np.flatnonzero(remaining > 0)]
+         raise ValueError(f"Quest prerequisites form a cycle through: {', '.join(stuck)}.")
+
+
+DEFAULT_CATALOGUE = QuestCatalogue(QUEST_DEFINITIONS)
+
+
+@dataclass(slots=True)
+class Quest:
+   definition: QuestDefinition
+   progress: List[int] = field(default_factory=list)
    completed: bool = False
-   progress: int = 0
-   reward_items: List[str] = field(default_factory=list)
 
-   def record_progress(self, goal_type: str, target: str) -> bool:
-      if self.completed or goal_type != self.goal_type or target != self.target:
+   def __post_init__(self) -> None:
+      if len(self.progress) != len(self.definition.objectives):
+         self.progress = [0] * len(self.definition.objectives)
+
+   @property
+   def quest_id(self) -> str:
+      return self.definition.quest_id
+
+   @property
+   def name(self) -> str:
+      return self.definition.name
+
+   @property
+   def description(self) -> str:
+      return self.definition.description
+
+   @property
+   def reward_experience(self) -> int:
+      return self.definition.reward_experience
+
+   @property
+   def reward_items(self) -> Tuple[str, ...]:
+      return self.definition.reward_items
+
+   def record_progress(self, goal_type: str, target: str, amount: int = 1) -> bool:
+      if self.completed:
          return False
-      self.progress = min(self.progress + 1, self.required)
-      if self.progress >= self.required:
-         self.completed = True
+      for index, objective in enumerate(self.definition.objectives):
+         if objective.goal_type == goal_type and objective.target == target:
+            self.progress[index] = min(self.progress[index] + amount, objective.required)
+      self.completed = all(
+         done >= objective.required for done, objective in zip(self.progress, self.definition.objectives)
+      )
       return self.completed
 
+   def summary(self) -> str:
+      return ", ".join(
+         f"{done}/{objective.required} {objective.target}"
+         for done, objective in zip(self.progress, self.definition.objectives)
+      )
+
 
 class QuestSystem:
-   def __init__(self) -> None:
+   def __init__(self, catalogue: QuestCatalogue = DEFAULT_CATALOGUE) -> None:
+      self.catalogue = catalogue
+      self.status = np.zeros(len(catalogue), dtype=np.uint8)
+      self.unmet = catalogue.requirement_counts.copy()
+      self.status[self.unmet == 0] = AVAILABLE
       self.active: Dict[str, Quest] = {}
+      # Active quests by the (goal_type, target) pairs their objectives listen for.
+      self._watchers: Dict[Tuple[str, str], List[Quest]] = {}
+      self.events: Optional[EventBus] = None
+
+   def attach(self, events: EventBus) -> None:
+      self.events = events
+      events.subscribe(EnemyDefeated, self._on_enemy_defeated)
+      events.subscribe(ItemGained, self._on_item_gained)
+      self._start_automatic(np.flatnonzero(self.status == AVAILABLE))
+
+   def _on_enemy_defeated(self, event: EnemyDefeated) -> None:
+      self.record_event("slay", event.enemy.enemy_id)
 
-   def add_quest(self, quest: Quest) -> str:
-      if quest.quest_id in self.active:
+   def _on_item_gained(self, event: ItemGained) -> None:
+      if event.source != "quest":
+         self.record_event("gather", event.item_id, event.count)
+
+   # Queries -------------------------------------------------------------
+   def status_of(self, quest_id: str) -> int:
+      return int(self.status[self.catalogue.index[quest_id]])
+
+   def is_completed(self, quest_id: str) -> bool:
+      return quest_id in self.catalogue and self.status_of(quest_id) == DONE
+
+   def list_active(self) -> List[Quest]:
+      return list(self.active.values())
+
+   def list_available(self, giver: Optional[str] = None) -> List[QuestDefinition]:
+      definitions = (self.catalogue.definitions[position] for position in np.flatnonzero(self.status == AVAILABLE))
+      return [definition for definition in definitions if giver is None or definition.giver == giver]
+
+   # Changes -------------------------------------------------------------
+   def accept(self, quest_id: str) -> Optional[str]:
+      """Start an available quest; returns why it could not start, or None."""
+      if quest_id not in self.catalogue:
+         return f"Unknown quest '{quest_id}'."
+      status = self.status_of(quest_id)
+      if status == ACTIVE:
          return "Quest already active."
-      self.active[quest.quest_id] = quest
-      return f"Quest accepted: {quest.name}."
+      if status == DONE:
+         return "Quest already completed."
+      if status == LOCKED:
+         return "Quest not available yet."
+      self._activate(Quest(self.catalogue.get(quest_id)))
+      return None
 
-   def record_event(self, goal_type: str, target: str) -> List[Quest]:
-      completed: List[Quest] = []
-      for quest in self.active.values():
-         if quest.record_progress(goal_type, target) and quest not in completed:
-            completed.append(quest)
+   def record_event(self, goal_type: str, target: str, amount: int = 1) -> List[Quest]:
+      completed = [
+         quest
+         for quest in list(self._watchers.get((goal_type, target), ()))
+         if quest.record_progress(goal_type, target, amount)
+      ]
+      for quest in completed:
+         get_telemetry().emit("quest_completed", quest=quest.quest_id)
+         self._complete(quest)
       return completed
 
-   def remove_completed(self) -> List[Quest]:
-      finished = [quest for quest in self.active.values() if quest.completed]
-      for quest in finished:
-         self.active.pop(quest.quest_id, None)
-      return finished
+   def _activate(self, quest: Quest, announce: bool = True) -> None:
+      self.status[self.catalogue.index[quest.quest_id]] = ACTIVE
+      self.active[quest.quest_id] = quest
+      for objective in quest.definition.objectives:
+         watchers = self._watchers.setdefault((objective.goal_type, objective.target), [])
+         if quest not in watchers:
+            watchers.append(quest)
+      if announce and self.events:
+         self.events.publish(QuestAccepted(quest))
+
+   def _complete(self, quest: Quest) -> None:
+      self.active.pop(quest.quest_id, None)
+      for objective in quest.definition.objectives:
+         watchers = self._watchers.get((objective.goal_type, objective.target))
+         if watchers and quest in watchers:
+            watchers.remove(quest)
+      position = self.catalogue.index[quest.quest_id]
+      self.status[position] = DONE
+      unlocked: List[int] = []
+      for dependent in self.catalogue.dependents[position]:
+         self.unmet[dependent] -= 1
+         if self.unmet[dependent] == 0 and self.status[dependent] == LOCKED:
+            self.status[dependent] = AVAILABLE
+            unlocked.append(dependent)
+      if self.events:
+         self.events.publish(QuestCompleted(quest))
+      self._start_automatic(unlocked)
 
+   def _start_automatic(self, positions: Iterable[int], announce: bool = True) -> None:
+      for position in positions:
+         definition = self.catalogue.definitions[position]
+         if definition.giver is None and self.status[position] == AVAILABLE:
+            self._activate(Quest(definition), announce)
+
+   # Persistence ---------------------------------------------------------
    def to_dict(self) -> Dict:
+      definitions = self.catalogue.definitions
       return {
-         "quests": [
-            {
-               "quest_id": quest.quest_id,
-               "name": quest.name,
-               "description": quest.description,
-               "goal_type": quest.goal_type,
-               "target": quest.target,
-               "required": quest.required,
-               "progress": quest.progress,
-               "completed": quest.completed,
-               "reward_experience": quest.reward_experience,
-               "reward_items": quest.reward_items,
-            }
-            for quest in self.active.values()
-         ]
+         "quests": [{"quest_id": quest.quest_id, "progress": list(quest.progress)} for quest in self.active.values()],
+         "completed": [definitions[position].quest_id for position in np.flatnonzero(self.status == DONE)],
       }
 
    def from_dict(self, payload: Dict) -> None:
+      index = self.catalogue.index
       self.active.clear()
+      self._watchers.clear()
+      done = np.zeros(len(self.catalogue), dtype=bool)
+      done[[index[quest_id] for quest_id in payload.get("completed", []) if quest_id in index]] = True
+      # A full rebuild only happens on load; play updates availability incrementally.
+      finished = np.bincount(
+         self.catalogue.edge_targets[done[self.catalogue.edge_sources]], minlength=len(self.catalogue)
+      )
+      self.unmet = (self.catalogue.requirement_counts - finished).astype(np.int16)
+      self.status = np.where(done, DONE, np.where(self.unmet == 0, AVAILABLE, LOCKED)).astype(np.uint8)
       for entry in payload.get("quests", []):
-         quest = Quest(
-            quest_id=entry["quest_id"],
-            name=entry["name"],
-            description=entry["description"],
-            goal_type=entry["goal_type"],
-            target=entry["target"],
-            required=entry["required"],
-            reward_experience=entry.get("reward_experience", 0),
-            reward_items=entry.get("reward_items", []),
-         )
-         quest.progress = entry.get("progress", 0)
-         quest.completed = entry.get("completed", False)
-         self.active[quest.quest_id] = quest
-
-   def list_active(self) -> List[Quest]:
-      return list(self.active.values())
\ No newline at end of file
+         quest_id = entry["quest_id"]
+         # A saved quest whose prerequisites are not all done stays locked; its progress is dropped.
+         if quest_id in index and self.status[index[quest_id]] == AVAILABLE:
+            self._activate(Quest(self.catalogue.get(quest_id), list(entry.get("progress", []))), announce=False)
+      if self.events:
+         self._start_automatic(np.flatnonzero(self.status == AVAILABLE), announce=False)
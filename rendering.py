@@ -0,0 +1,108 @@
+"""Atlas-backed batched rendering for world entities."""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+ENTITY_COLOURS: Dict[str, Tuple[int, int, int]] = {
+    "resource": (20, 180, 90),
+    "npc": (230, 220, 120),
+    "enemy": (200, 80, 80),
+    "player": (80, 170, 255),
+}
+
+LAYERS: Dict[str, int] = {"resource": 0, "npc": 1, "enemy": 2, "player": 3}
+
+
+def prepare_surface(surface: pygame.Surface) -> pygame.Surface:
+    """Match the display pixel format once a display exists so blits skip conversion."""
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha()
+
+
+class TextureAtlas:
+    """Packs named surfaces into one sheet using simple shelf packing."""
+
+    def __init__(self, sprites: Dict[str, pygame.Surface], max_width: int = 1024) -> None:
+        self.regions: Dict[str, pygame.Rect] = {}
+        x = y = shelf_height = width = 0
+        for key, sprite in sprites.items():
+            sprite_width, sprite_height = sprite.get_size()
+            if x and x + sprite_width > max_width:
+                x, y = 0, y + shelf_height
+                shelf_height = 0
+            self.regions[key] = pygame.Rect(x, y, sprite_width, sprite_height)
+            x += sprite_width
+            width = max(width, x)
+            shelf_height = max(shelf_height, sprite_height)
+        sheet = pygame.Surface((max(width, 1), max(y + shelf_height, 1)), pygame.SRCALPHA)
+        for key, sprite in sprites.items():
+            sheet.blit(sprite, self.regions[key])
+        self.surface = prepare_surface(sheet)
+
+    def region(self, key: str) -> pygame.Rect:
+        return self.regions[key]
+
+
+class SpriteBatch:
+    """Collects draw requests for one frame and submits them with a single ``blits`` call."""
+
+    def __init__(self, atlas: TextureAtlas) -> None:
+        self.atlas = atlas
+        self._queue: List[Tuple[int, Tuple[int, int], pygame.Rect]] = []
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def add(self, key: str, position: Tuple[int, int], layer: int = 0) -> None:
+        self._queue.append((layer, position, self.atlas.regions[key]))
+
+    def flush(self, surface: pygame.Surface) -> int:
+        self._queue.sort(key=lambda entry: entry[0])
+        sheet = self.atlas.surface
+        surface.blits([(sheet, position, area) for _, position, area in self._queue], doreturn=False)
+        drawn = len(self._queue)
+        self._queue.clear()
+        return drawn
+
+
+class EntityRenderer:
+    def __init__(self, tile_size: int) -> None:
+        self.tile_size = tile_size
+        sprites = {}
+        for key, colour in ENTITY_COLOURS.items():
+            sprite = pygame.Surface((tile_size, tile_size), pygame.SRCALPHA)
+            sprite.fill(colour)
+            sprites[key] = sprite
+        self.atlas = TextureAtlas(sprites)
+        self.batch = SpriteBatch(self.atlas)
+
+    def draw(self, surface: pygame.Surface, world, player=None, viewport: Optional[pygame.Rect] = None) -> int:  # noqa: ANN001
+        view = viewport or surface.get_rect()
+        tile = self.tile_size
+        batch = self.batch
+
+        for x, y in world.resource_nodes:
+            if view.colliderect((x * tile, y * tile, tile, tile)):
+                batch.add("resource", (x * tile, y * tile), LAYERS["resource"])
+
+        for npc in world.npcs:
+            if view.colliderect(npc.rect):
+                batch.add("npc", npc.rect.topleft, LAYERS["npc"])
+
+        store = world.enemy_store
+        if store is not None:
+            visible = store.colliding(view)
+            for position in zip(store.x[visible].tolist(), store.y[visible].tolist()):
+                batch.add("enemy", position, LAYERS["enemy"])
+        else:
+            for enemy in world.enemies:
+                if view.colliderect(enemy.rect):
+                    batch.add("enemy", enemy.rect.topleft, LAYERS["enemy"])
+
+        if player is not None and view.colliderect(player.rect):
+            batch.add("player", player.rect.topleft, LAYERS["player"])
+        return batch.flush(surface)
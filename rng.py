@@ -0,0 +1,101 @@
+"""Seeded random number streams shared by the gameplay subsystems."""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+STREAM_NAMES = ("world", "loot", "combat", "ai")
+
+
+class RandomStream:
+    """Independent generator that serves scalar rolls from a pre-drawn block."""
+
+    def __init__(self, seed_sequence: np.random.SeedSequence, block_size: int = 256) -> None:
+        self.seed_sequence = seed_sequence
+        self.generator = np.random.Generator(np.random.PCG64(seed_sequence))
+        self.block_size = block_size
+        self._block = np.empty(0)
+        self._cursor = 0
+
+    def random(self) -> float:
+        if self._cursor >= len(self._block):
+            self._block = self.generator.random(self.block_size)
+            self._cursor = 0
+        value = float(self._block[self._cursor])
+        self._cursor += 1
+        return value
+
+    def randint(self, low: int, high: int) -> int:
+        """Return an integer in the inclusive range ``[low, high]``."""
+        return low + int(self.random() * (high - low + 1))
+
+    def choice(self, options: Sequence[T]) -> T:
+        return options[int(self.random() * len(options))]
+
+    def batch(self, count: int) -> np.ndarray:
+        """Draw ``count`` uniform floats in one call for hot loops."""
+        return self.generator.random(count)
+
+    def batch_integers(self, low: int, high: int, count: int) -> np.ndarray:
+        return self.generator.integers(low, high, size=count, endpoint=True)
+
+    def binomial(self, trials: int, probabilities: np.ndarray) -> np.ndarray:
+        return self.generator.binomial(trials, probabilities)
+
+    def spawn(self, count: int) -> List["RandomStream"]:
+        return [RandomStream(child, self.block_size) for child in self.seed_sequence.spawn(count)]
+
+
+class RNGService:
+    """Owns one seeded stream per subsystem so they never perturb each other."""
+
+    def __init__(self, seed: Optional[int] = None, seed_sequence: Optional[np.random.SeedSequence] = None) -> None:
+        self.seed_sequence = seed_sequence or np.random.SeedSequence(seed)
+        children = self.seed_sequence.spawn(len(STREAM_NAMES))
+        self.streams: Dict[str, RandomStream] = {
+            name: RandomStream(child) for name, child in zip(STREAM_NAMES, children)
+        }
+
+    @property
+    def seed(self) -> int:
+        return self.seed_sequence.entropy
+
+    @property
+    def world(self) -> RandomStream:
+        return self.streams["world"]
+
+    @property
+    def loot(self) -> RandomStream:
+        return self.streams["loot"]
+
+    @property
+    def combat(self) -> RandomStream:
+        return self.streams["combat"]
+
+    @property
+    def ai(self) -> RandomStream:
+        return self.streams["ai"]
+
+    def stream(self, name: str) -> RandomStream:
+        return self.streams[name]
+
+    def spawn(self, count: int) -> List["RNGService"]:
+        """Split into ``count`` services, e.g. one per parallel simulation worker."""
+        return [RNGService(seed_sequence=child) for child in self.seed_sequence.spawn(count)]
+
+
+_default_service = RNGService()
+
+
+def get_rng() -> RNGService:
+    return _default_service
+
+
+def seed_all(seed: Optional[int]) -> RNGService:
+    global _default_service
+    _default_service = RNGService(seed)
+    return _default_service
@@ -1,20 +1,287 @@
+"""Slotted save files with fixed-layout headers and a binary slot index.
+
+Each slot is ``<slot>.sav``: a packed ``SaveHeader`` followed by the JSON
+payload. The header carries enough to list a save and a CRC32 of the payload,
+so menus never decode payloads and loads verify bytes before parsing them.
+``slots.idx`` caches every slot's header so listing reads a single file; each
+record also keeps the stamp (inode, mtime, size) of the slot file it came from,
+so a slot rewritten by another process is noticed and its header re-read.
+"""
+
+from __future__ import annotations
+
 import json
+import os
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from migrations import SCHEMA_VERSION, upgrade, validate
+from telemetry import get_telemetry
+
+SAVE_SUFFIX = ".sav"
+INDEX_NAME = "slots.idx"
+# Pre-slot single-file saves, migrated on load.
+LEGACY_SAVE_NAME = "save.json"
+SLOT_NAME_SIZE = 64
+
+
+class SaveError(ValueError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class SaveHeader:
+    schema_version: int
+    level: int
+    playtime: float
+    timestamp: float
+    location: Tuple[int, int]
+    payload_size: int
+    checksum: int
+
+    MAGIC = b"RPGS"
+    # magic, schema, level, playtime, timestamp, tile x, tile y, payload size, crc32
+    LAYOUT = struct.Struct("<4sHHddiiII")
+
+    def pack(self) -> bytes:
+        return self.LAYOUT.pack(
+            self.MAGIC,
+            self.schema_version,
+            self.level,
+            self.playtime,
+            self.timestamp,
+            self.location[0],
+            self.location[1],
+            self.payload_size,
+            self.checksum,
+        )
+
+    @classmethod
+    def unpack(cls, data: bytes) -> "SaveHeader":
+        if len(data) < cls.LAYOUT.size:
+            raise SaveError("Save header is truncated.")
+        magic, schema, level, playtime, timestamp, x, y, size, checksum = cls.LAYOUT.unpack_from(data)
+        if magic != cls.MAGIC:
+            raise SaveError("Not a save file.")
+        return cls(schema, level, playtime, timestamp, (x, y), size, checksum)
+
+
+@dataclass(frozen=True, slots=True)
+class SlotInfo:
+    slot: str
+    header: SaveHeader
+
+
+INDEX_MAGIC = b"RPGI\x02\x00\x00\x00"
+# slot name, slot file inode, mtime (ns), size, packed header
+_INDEX_RECORD = struct.Struct(f"<{SLOT_NAME_SIZE}sQqQ{SaveHeader.LAYOUT.size}s")
+
+Stamp = Tuple[int, int, int]
+
+
+def _stamp(stat: os.stat_result) -> Stamp:
+    # Saves are replaced rather than rewritten, so every save gets a new inode.
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def read_header(path: Path) -> SaveHeader:
+    with path.open("rb") as handle:
+        return SaveHeader.unpack(handle.read(SaveHeader.LAYOUT.size))
+
+
+def read_save(path: Path) -> Tuple[SaveHeader, Dict]:
+    """Read a slot file, checking its size and checksum before decoding JSON."""
+    data = path.read_bytes()
+    header = SaveHeader.unpack(data)
+    body = memoryview(data)[SaveHeader.LAYOUT.size :]
+    if len(body) != header.payload_size:
+        raise SaveError(f"{path.name}: expected {header.payload_size} payload bytes, found {len(body)}.")
+    if zlib.crc32(body) != header.checksum:
+        raise SaveError(f"{path.name}: checksum mismatch.")
+    return header, json.loads(bytes(body))
+
+
+def write_save(
+    path: Path,
+    payload: Dict,
+    level: int,
+    playtime: float,
+    location: Tuple[int, int],
+    timestamp: Optional[float] = None,
+) -> SaveHeader:
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    header = SaveHeader(
+        payload.get("schema_version", SCHEMA_VERSION),
+        level,
+        playtime,
+        time.time() if timestamp is None else timestamp,
+        location,
+        len(body),
+        zlib.crc32(body),
+    )
+    temporary = path.with_suffix(".tmp")
+    temporary.write_bytes(header.pack() + body)
+    temporary.replace(path)
+    return header
 
 
 class SaveSystem:
-    def __init__(self, save_path: str = "save.json") -> None:
-        self.path = Path(save_path)
+    def __init__(self, directory: str = "saves", slot: str = "slot1", legacy_path: Optional[str] = LEGACY_SAVE_NAME) -> None:
+        self.directory = Path(directory)
+        self.slot = slot
+        # Single-file saves from before slots existed; loaded if the slot is empty.
+        self.legacy_path = Path(legacy_path) if legacy_path else None
+        self._index: Optional[Dict[str, Tuple[Stamp, SaveHeader]]] = None
+
+    @property
+    def path(self) -> Path:
+        return self.slot_path(self.slot)
+
+    def slot_path(self, slot: str) -> Path:
+        if not slot or len(slot.encode("utf-8")) > SLOT_NAME_SIZE or any(sep in slot for sep in "/\\"):
+            raise SaveError(f"Invalid slot name '{slot}'.")
+        return self.directory / f"{slot}{SAVE_SUFFIX}"
 
-    def save_game(self, player, world, quest_system) -> None:  # noqa: ANN001 - runtime types
-        payload = {
+    def build_payload(self, player, world, quest_system) -> dict:  # noqa: ANN001 - runtime types
+        return {
+            "schema_version": SCHEMA_VERSION,
             "player": player.to_dict(),
             "world": world.to_dict(),
             "quests": quest_system.to_dict(),
         }
-        self.path.write_text(json.dumps(payload, indent=2))
 
-    def load_game(self):
-        if not self.path.exists():
+    def save_game(self, player, world, quest_system, playtime: float = 0.0, slot: Optional[str] = None) -> SaveHeader:  # noqa: ANN001
+        started = time.perf_counter()
+        slot = slot or self.slot
+        payload = self.build_payload(player, world, quest_system)
+        payload["playtime"] = playtime
+        location = (player.rect.x // player.tile_size, player.rect.y // player.tile_size)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        header = write_save(self.slot_path(slot), payload, player.stats.level, playtime, location)
+        self._load_index()
+        self._remember(slot, header)
+        elapsed = (time.perf_counter() - started) * 1000
+        get_telemetry().emit("save", slot=slot, bytes=header.payload_size, ms=round(elapsed, 2))
+        return header
+
+    def load_game(self, slot: Optional[str] = None) -> Optional[Dict]:
+        """Current-schema payload for ``slot``, or None if it is empty.
+
+        Older saves are migrated in memory. Raises SaveError if the file is
+        damaged or does not match the schema.
+        """
+        started = time.perf_counter()
+        path = self.slot_path(slot or self.slot)
+        if path.exists():
+            payload = read_save(path)[1]
+        elif slot in (None, self.slot) and self.legacy_path and self.legacy_path.exists():
+            path = self.legacy_path
+            try:
+                payload = json.loads(path.read_text())
+            except ValueError as error:
+                raise SaveError(f"{path.name}: not valid JSON: {error}") from error
+        else:
             return None
-        return json.loads(self.path.read_text())
\ No newline at end of file
+        try:
+            payload = upgrade(payload)
+        except (AttributeError, KeyError, TypeError, ValueError) as error:
+            raise SaveError(f"{path.name}: cannot migrate: {error}") from error
+        errors = validate(payload)
+        if errors:
+            raise SaveError(f"{path.name}: {errors[0]}" + (f" (+{len(errors) - 1} more)" if len(errors) > 1 else ""))
+        elapsed = (time.perf_counter() - started) * 1000
+        get_telemetry().emit("load", slot=slot or self.slot, ms=round(elapsed, 2))
+        return payload
+
+    def delete_slot(self, slot: str) -> None:
+        self.slot_path(slot).unlink(missing_ok=True)
+        self._load_index()
+        if self._index.pop(slot, None) is not None:
+            self._write_index()
+
+    def list_slots(self) -> List[SlotInfo]:
+        """Every slot's header, newest first, without reading any payload."""
+        index = self._load_index()
+        return sorted(
+            (SlotInfo(slot, header) for slot, header in index.items()),
+            key=lambda info: info.header.timestamp,
+            reverse=True,
+        )
+
+    def _load_index(self) -> Dict[str, SaveHeader]:
+        if self._index is None:
+            self._index = self._read_index()
+        index = self._index
+        stamps = self._scan()
+        changed = False
+        for slot in index.keys() - stamps.keys():
+            del index[slot]
+            changed = True
+        for slot, stamp in stamps.items():
+            entry = index.get(slot)
+            if entry is not None and entry[0] == stamp:
+                continue
+            # Added, removed or rewritten behind our back: re-read just that header.
+            changed = True
+            try:
+                index[slot] = (stamp, read_header(self.slot_path(slot)))
+            except (OSError, SaveError):
+                index.pop(slot, None)
+        if changed:
+            self._write_index()
+        return {slot: header for slot, (_, header) in index.items()}
+
+    def _scan(self) -> Dict[str, Stamp]:
+        stamps: Dict[str, Stamp] = {}
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return stamps
+        for entry in entries:
+            if entry.name.endswith(SAVE_SUFFIX):
+                try:
+                    stamps[entry.name[: -len(SAVE_SUFFIX)]] = _stamp(entry.stat())
+                except OSError:
+                    continue
+        return stamps
+
+    def _remember(self, slot: str, header: SaveHeader) -> None:
+        try:
+            stamp = _stamp(self.slot_path(slot).stat())
+        except OSError:
+            return
+        self._index[slot] = (stamp, header)
+        self._write_index()
+
+    def _read_index(self) -> Dict[str, Tuple[Stamp, SaveHeader]]:
+        try:
+            data = (self.directory / INDEX_NAME).read_bytes()
+        except OSError:
+            return {}
+        if not data.startswith(INDEX_MAGIC):
+            return {}
+        index: Dict[str, Tuple[Stamp, SaveHeader]] = {}
+        try:
+            for name, inode, mtime, size, header in _INDEX_RECORD.iter_unpack(data[len(INDEX_MAGIC) :]):
+                index[name.rstrip(b"\0").decode("utf-8")] = ((inode, mtime, size), SaveHeader.unpack(header))
+        except (struct.error, SaveError, UnicodeDecodeError):
+            return {}
+        return index
+
+    def _write_index(self) -> None:
+        if not self.directory.exists() or self._index is None:
+            return
+        records = b"".join(
+            _INDEX_RECORD.pack(slot.encode("utf-8"), *stamp, header.pack())
+            for slot, (stamp, header) in self._index.items()
+        )
+        # Write beside the index and swap it in, like write_save; the name is unique per
+        # writer so processes sharing the directory never interleave partial indexes.
+        temporary = self.directory / f"{INDEX_NAME}.{os.getpid()}-{threading.get_ident()}.tmp"
+        temporary.write_bytes(INDEX_MAGIC + records)
+        temporary.replace(self.directory / INDEX_NAME)
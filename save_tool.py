@@ -0,0 +1,138 @@
+"""Validate or migrate whole directories of saves across worker processes.
+
+    python save_tool.py validate saves/ archive/
+    python save_tool.py migrate archive/ --workers 8
+
+Both ``.sav`` slots and legacy ``save.json`` files are accepted; migrating a
+legacy file writes a ``.sav`` next to it. Other JSON files are only checked when
+named directly. Results stream in file order as chunks finish.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from migrations import SCHEMA_VERSION, schema_version, upgrade, validate
+from save_system import INDEX_NAME, LEGACY_SAVE_NAME, SAVE_SUFFIX, SaveError, read_save, write_save
+
+# World.tile_size; legacy saves only record pixel positions.
+TILE_SIZE = 48
+
+
+@dataclass(slots=True)
+class FileResult:
+    path: str
+    status: str  # "ok", "migrated", "outdated", "superseded", "invalid" or "error"
+    from_version: int = 0
+    size: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+def find_saves(roots: Iterable[str]) -> Iterator[Path]:
+    for root in map(Path, roots):
+        if root.is_file():
+            yield root
+            continue
+        for path in sorted(root.rglob("*")):
+            if (path.suffix == SAVE_SUFFIX or path.name == LEGACY_SAVE_NAME) and path.is_file():
+                yield path
+
+
+def process_save(path_name: str, write: bool) -> FileResult:
+    """Worker entry point: check one save and, if ``write``, upgrade it in place."""
+    path = Path(path_name)
+    result = FileResult(path_name, "ok")
+    try:
+        result.size = path.stat().st_size
+        if path.suffix == SAVE_SUFFIX:
+            header, payload = read_save(path)
+        elif path.with_suffix(SAVE_SUFFIX).exists():
+            # Already migrated; never overwrite the slot from its stale legacy source.
+            result.status = "superseded"
+            return result
+        else:
+            header, payload = None, json.loads(path.read_text())
+        result.from_version = schema_version(payload)
+        payload = upgrade(payload)
+    except (OSError, SaveError, AttributeError, KeyError, TypeError, ValueError) as error:
+        result.status, result.errors = "error", [str(error)]
+        return result
+
+    result.errors = validate(payload)
+    if result.errors:
+        result.status = "invalid"
+    elif result.from_version != SCHEMA_VERSION or header is None:
+        result.status = "migrated" if write else "outdated"
+        if write:
+            _write_upgraded(path, payload, header)
+    return result
+
+
+def _write_upgraded(path: Path, payload: Dict, header) -> None:  # noqa: ANN001 - Optional[SaveHeader]
+    if header is not None:
+        write_save(path, payload, header.level, header.playtime, header.location, header.timestamp)
+    else:
+        player = payload["player"]
+        x, y = player["position"]
+        level = player.get("stats", {}).get("level", 1)
+        location = (x // TILE_SIZE, y // TILE_SIZE)
+        target = path.with_suffix(SAVE_SUFFIX)
+        write_save(target, payload, level, payload.get("playtime", 0.0), location, path.stat().st_mtime)
+    # Headers changed, so let the directory's slot index rebuild itself.
+    (path.parent / INDEX_NAME).unlink(missing_ok=True)
+
+
+def run(roots: List[str], write: bool, workers: Optional[int] = None, chunksize: int = 32, quiet: bool = False) -> Dict:
+    paths = [str(path) for path in find_saves(roots)]
+    counts: Dict[str, int] = {}
+    total_bytes = 0
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        for index, result in enumerate(pool.map(process_save, paths, [write] * len(paths), chunksize=chunksize), 1):
+            counts[result.status] = counts.get(result.status, 0) + 1
+            total_bytes += result.size
+            if result.errors:
+                for error in result.errors:
+                    print(f"{result.path}: {result.status}: {error}", file=sys.stderr)
+            elif result.status not in ("ok", "superseded") and not quiet:
+                print(f"{result.path}: {result.status} from schema {result.from_version}")
+            if not quiet and index % 1000 == 0:
+                elapsed = time.perf_counter() - started
+                print(f"... {index}/{len(paths)} files, {index / elapsed:.0f} files/s", file=sys.stderr)
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    return {
+        "files": len(paths),
+        "counts": counts,
+        "seconds": round(elapsed, 3),
+        "files_per_second": round(len(paths) / elapsed, 1),
+        "megabytes_per_second": round(total_bytes / elapsed / 1_000_000, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Validate or migrate RPG save files.")
+    parser.add_argument("command", choices=("validate", "migrate"))
+    parser.add_argument("paths", nargs="+", help="Save files or directories to scan recursively.")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunksize", type=int, default=32)
+    parser.add_argument("--quiet", action="store_true", help="Only report errors and the summary.")
+    args = parser.parse_args()
+
+    summary = run(args.paths, args.command == "migrate", args.workers, args.chunksize, args.quiet)
+    print(json.dumps(summary, indent=2))
+    failed = summary["counts"].get("invalid", 0) + summary["counts"].get("error", 0)
+    if args.command == "validate":
+        failed += summary["counts"].get("outdated", 0)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,385 @@
+"""Headless multi-session game server over local asyncio sockets.
+
+Clients speak newline-delimited JSON. The first line names the session
+(``{"session": "alice"}``) and the server answers with the full state. After
+that the client sends ``{"actions": ["up", "attack"]}`` lines and receives
+``{"type": "diff", ...}`` lines that hold only the fields that changed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import random
+import re
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+# Action names map to the keys handled by GameState's input handlers.
+ACTION_KEYS: Dict[str, str] = {
+    "up": "K_UP",
+    "down": "K_DOWN",
+    "left": "K_LEFT",
+    "right": "K_RIGHT",
+    "interact": "K_e",
+    "inventory": "K_i",
+    "crafting": "K_c",
+    "craft_max": "K_m",
+    "save": "K_s",
+    "load": "K_l",
+    "rewind": "K_r",
+    "confirm": "K_RETURN",
+    "escape": "K_ESCAPE",
+    "attack": "K_1",
+    "fireball": "K_2",
+    "heal": "K_3",
+    "health_potion": "K_4",
+    "mana_potion": "K_5",
+    "shield": "K_6",
+    "flame_wave": "K_7",
+    "next_target": "K_TAB",
+}
+
+_SESSION_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+logger = logging.getLogger(__name__)
+
+
+# ----------------------------------------------------------------------
+# Shard worker (runs inside a single-process pool)
+# ----------------------------------------------------------------------
+_sessions: Dict[str, object] = {}
+_snapshots: Dict[str, Dict] = {}
+_keys: Dict[str, int] = {}
+_save_dir = Path("sessions")
+
+
+def _init_shard(save_dir: str) -> None:
+    global _save_dir
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+
+    _keys.update({action: getattr(pygame, name) for action, name in ACTION_KEYS.items()})
+    _save_dir = Path(save_dir)
+    _save_dir.mkdir(parents=True, exist_ok=True)
+
+
+def session_snapshot(game) -> Dict:  # noqa: ANN001 - GameState
+    combat = game.combat
+    return {
+        "mode": game.mode,
+        "position": list(game.player.rect.topleft),
+        "stats": game.player.stats.to_dict(effective=True),
+        "inventory": game.player.inventory.counts(),
+        "quests": {quest.quest_id: quest.progress for quest in game.quests.list_active()},
+        "enemies": len(game.world.enemies),
+        "combat": _combat_snapshot(combat) if combat else None,
+        "log": list(game.message_log),
+    }
+
+
+def _combat_snapshot(combat) -> Dict:  # noqa: ANN001 - CombatSystem
+    return {
+        "enemy": combat.enemy.name,
+        "health": combat.enemy.health,
+        "enemies": [
+            {
+                "name": enemy.name,
+                "health": enemy.health,
+                "effects": [effect.name for effect in combat.effects_on(enemy)],
+            }
+            for enemy in combat.enemies
+        ],
+    }
+
+
+def _open_session(session_id: str) -> Dict:
+    from game_state import GameState
+    from save_system import SaveSystem
+
+    game = GameState(None, save_system=SaveSystem(str(_save_dir), slot=session_id, legacy_path=None))
+    try:
+        snapshot = session_snapshot(game)
+    except Exception:
+        game.close()
+        raise
+    _sessions[session_id] = game
+    _snapshots[session_id] = snapshot
+    return snapshot
+
+
+def _close_session(session_id: str) -> None:
+    game = _sessions.pop(session_id, None)
+    _snapshots.pop(session_id, None)
+    if game is not None:
+        try:
+            game.save_current_game()
+        finally:
+            game.close()
+
+
+def _tick_shard(
+    inputs: Dict[str, List[str]], tick: float, budget: float
+) -> Dict[str, Tuple[Optional[Dict], List[str]]]:
+    """Advance the listed sessions one tick; returns per-session diffs and inputs deferred by the budget.
+
+    A session whose game raises is logged and dropped without saving; its diff is None.
+    """
+    results: Dict[str, Tuple[Optional[Dict], List[str]]] = {}
+    for session_id, actions in inputs.items():
+        game = _sessions.get(session_id)
+        if game is None:
+            continue
+        deadline = time.perf_counter() + budget
+        handled = 0
+        try:
+            for action in actions:
+                if handled and time.perf_counter() >= deadline:
+                    break
+                key = _keys.get(action)
+                if key is not None:
+                    game.handle_key(key)
+                handled += 1
+            game.update(tick)
+        except Exception:
+            logger.exception("Session %s failed during tick; dropping it.", session_id)
+            _sessions.pop(session_id, None)
+            _snapshots.pop(session_id, None)
+            game.close()
+            results[session_id] = (None, [])
+            continue
+
+        snapshot = session_snapshot(game)
+        previous = _snapshots[session_id]
+        diff = {field: value for field, value in snapshot.items() if previous.get(field) != value}
+        _snapshots[session_id] = snapshot
+        deferred = actions[handled:]
+        if diff or deferred:
+            results[session_id] = (diff, deferred)
+    return results
+
+
+# ----------------------------------------------------------------------
+# Network front end
+# ----------------------------------------------------------------------
+class GameServer:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 7777,
+        shards: Optional[int] = None,
+        tick_rate: int = 20,
+        tick_budget: float = 0.002,
+        save_dir: str = "sessions",
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.tick_interval = 1.0 / tick_rate
+        self.tick_budget = tick_budget
+        # One single-process pool per shard keeps each session pinned to the process that owns it.
+        # Spawned (not forked) workers so they never inherit open client sockets.
+        context = multiprocessing.get_context("spawn")
+        self.shards = [
+            ProcessPoolExecutor(max_workers=1, mp_context=context, initializer=_init_shard, initargs=(save_dir,))
+            for _ in range(shards or os.cpu_count() or 1)
+        ]
+        self.clients: Dict[str, asyncio.StreamWriter] = {}
+        self.pending: Dict[str, List[str]] = {}
+        # Ids whose session is still opening, so a second hello cannot claim them meanwhile.
+        self.opening: Set[str] = set()
+        self.tick = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._tick_task: Optional[asyncio.Task] = None
+
+    def shard_for(self, session_id: str) -> int:
+        return zlib.crc32(session_id.encode()) % len(self.shards)
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(shard, os.getpid) for shard in self.shards))
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._tick_task = asyncio.create_task(self._tick_loop())
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self) -> None:
+        if self._tick_task:
+            self._tick_task.cancel()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        for session_id in list(self.clients):
+            await self._call(session_id, _close_session, session_id)
+        self.clients.clear()
+        for shard in self.shards:
+            shard.shutdown()
+
+    async def _call(self, session_id: str, function, *args):  # noqa: ANN001 - worker callable
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.shards[self.shard_for(session_id)], function, *args)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        session_id = ""
+        try:
+            hello = json.loads(await reader.readline() or b"{}")
+            requested = str(hello.get("session", "")) if isinstance(hello, dict) else ""
+            if not _SESSION_ID.match(requested) or requested in self.clients or requested in self.opening:
+                _send(writer, {"type": "error", "message": "Invalid or duplicate session id."})
+                return
+            self.opening.add(requested)
+            try:
+                state = await self._call(requested, _open_session, requested)
+            except Exception:
+                logger.exception("Opening session %s failed.", requested)
+                _send(writer, {"type": "error", "message": "Could not open the session."})
+                return
+            finally:
+                self.opening.discard(requested)
+            session_id = requested
+            _send(writer, {"type": "state", "tick": self.tick, "state": state})
+            self.pending[session_id] = []
+            self.clients[session_id] = writer
+
+            while line := await reader.readline():
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    message = None
+                if not isinstance(message, dict) or not isinstance(message.get("actions", []), list):
+                    _send(writer, {"type": "error", "message": "Expected a JSON object with an actions list."})
+                    continue
+                if message.get("quit"):
+                    break
+                self.pending[session_id].extend(str(action) for action in message.get("actions", []))
+        except (ConnectionError, json.JSONDecodeError):
+            pass
+        finally:
+            if session_id and self.clients.pop(session_id, None) is not None:
+                self.pending.pop(session_id, None)
+                await self._call(session_id, _close_session, session_id)
+            writer.close()
+
+    async def _tick_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            try:
+                await self._tick(loop)
+            except Exception:
+                # Keep ticking every other session; the failed tick's inputs are lost.
+                logger.exception("Server tick %d failed.", self.tick)
+            next_tick += self.tick_interval
+            delay = next_tick - loop.time()
+            if delay < 0:
+                next_tick = loop.time()
+            await asyncio.sleep(max(delay, 0))
+
+    async def _tick(self, loop: asyncio.AbstractEventLoop) -> None:
+        batches: List[Dict[str, List[str]]] = [{} for _ in self.shards]
+        for session_id in self.clients:
+            batches[self.shard_for(session_id)][session_id] = self.pending[session_id]
+            self.pending[session_id] = []
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(shard, _tick_shard, batch, self.tick_interval, self.tick_budget)
+                for shard, batch in zip(self.shards, batches)
+                if batch
+            )
+        )
+        self.tick += 1
+        for result in results:
+            for session_id, (diff, deferred) in result.items():
+                writer = self.clients.get(session_id)
+                if writer is None:
+                    continue
+                if diff is None:
+                    # The shard dropped this session; closing ends its client handler.
+                    _send(writer, {"type": "error", "message": "Session ended by a server error."})
+                    writer.close()
+                    continue
+                if deferred:
+                    self.pending[session_id][:0] = deferred
+                if diff:
+                    _send(writer, {"type": "diff", "tick": self.tick, "changes": diff})
+
+
+def _send(writer: asyncio.StreamWriter, message: Dict) -> None:
+    if not writer.is_closing():
+        writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+
+
+# ----------------------------------------------------------------------
+# Load generator
+# ----------------------------------------------------------------------
+async def run_load_client(host: str, port: int, session_id: str, duration: float, actions_per_second: float) -> Dict[str, int]:
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(json.dumps({"session": session_id}).encode() + b"\n")
+    counts = {"sent": 0, "received": 0}
+
+    async def receive() -> None:
+        while await reader.readline():
+            counts["received"] += 1
+
+    receiver = asyncio.create_task(receive())
+    moves = ["up", "down", "left", "right", "attack", "interact"]
+    deadline = asyncio.get_running_loop().time() + duration
+    while asyncio.get_running_loop().time() < deadline:
+        writer.write(json.dumps({"actions": [random.choice(moves)]}).encode() + b"\n")
+        counts["sent"] += 1
+        await asyncio.sleep(1.0 / actions_per_second)
+    writer.write(b'{"quit": true}\n')
+    await writer.drain()
+    await receiver
+    writer.close()
+    return counts
+
+
+async def run_load(host: str, port: int, clients: int, duration: float, actions_per_second: float) -> Dict[str, float]:
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(run_load_client(host, port, f"load-{index}", duration, actions_per_second) for index in range(clients))
+    )
+    elapsed = time.perf_counter() - started
+    sent = sum(result["sent"] for result in results)
+    received = sum(result["received"] for result in results)
+    return {"clients": clients, "seconds": elapsed, "inputs_per_second": sent / elapsed, "updates_per_second": received / elapsed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Headless RPG session server.")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    serve = subcommands.add_parser("serve")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=7777)
+    serve.add_argument("--shards", type=int, default=None)
+    serve.add_argument("--tick-rate", type=int, default=20)
+    serve.add_argument("--save-dir", default="sessions")
+    load = subcommands.add_parser("load")
+    load.add_argument("--host", default="127.0.0.1")
+    load.add_argument("--port", type=int, default=7777)
+    load.add_argument("--clients", type=int, default=100)
+    load.add_argument("--duration", type=float, default=10.0)
+    load.add_argument("--rate", type=float, default=5.0, help="Actions per second per client.")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        server = GameServer(args.host, args.port, args.shards, args.tick_rate, save_dir=args.save_dir)
+        asyncio.run(server.serve_forever())
+    else:
+        summary = asyncio.run(run_load(args.host, args.port, args.clients, args.duration, args.rate))
+        print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
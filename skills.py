@@ -1,16 +1,260 @@
+"""Skills defined as data and compiled once into specialised callables.
+
+A definition lists effects; ``damage`` and ``heal`` effects carry a formula
+``max(caster[stat] * scale + bonus - target[resist], minimum)`` whose parts are
+all optional. ``compile_skill`` turns each formula into one closure shared by
+live combat, simulations and planners, so every consumer uses the same numbers.
+"""
+
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from stats import STAT_NAMES
+
+Formula = Callable[[Mapping[str, int], Mapping[str, int]], int]
 
 
 @dataclass(slots=True)
-class Skill:
+class StatusEffect:
+    """Per-combatant condition ticked at the start of its holder's turn."""
+
+    name: str
+    remaining: int
+    damage: int = 0
+    stun: bool = False
+    # Halves weapon damage taken while active.
+    guard: bool = False
+
+    def copy(self) -> "StatusEffect":
+        return StatusEffect(self.name, self.remaining, self.damage, self.stun, self.guard)
+
+
+SKILL_DEFINITIONS: Dict[str, Dict[str, Any]] = {
+    "fireball": {
+        "name": "Fireball",
+        "cost": 15,
+        "cooldown": 2,
+        "description": "Deal heavy fire damage to a single target.",
+        "effects": [{"type": "damage", "stat": "magic", "scale": 2, "resist": "resistance", "minimum": 4}],
+        "message": "Cast Fireball for {damage} damage!",
+    },
+    "healing_light": {
+        "name": "Healing Light",
+        "cost": 12,
+        "cooldown": 3,
+        "description": "Restore a moderate amount of health.",
+        "effects": [{"type": "heal", "stat": "magic", "bonus": 12, "minimum": 10}],
+        "message": "Healing Light restored {healed} HP.",
+    },
+    "arcane_shield": {
+        "name": "Arcane Shield",
+        "cost": 10,
+        "cooldown": 4,
+        "description": "Raise defense temporarily.",
+        "effects": [{"type": "buff", "stat": "defense", "amount": 5, "duration": 3}],
+        "message": "Arcane Shield raises defense!",
+    },
+    "flame_wave": {
+        "name": "Flame Wave",
+        "cost": 20,
+        "cooldown": 3,
+        "description": "Scorch every enemy and set them burning.",
+        "area": True,
+        "effects": [
+            {"type": "damage", "stat": "magic", "resist": "resistance", "minimum": 2},
+            {"type": "status", "name": "Burning", "remaining": 2, "damage": 4},
+        ],
+        "message": "Flame Wave engulfs {targets} foe{s}!",
+    },
+}
+
+STARTING_SKILLS: Tuple[str, ...] = ("fireball", "healing_light", "arcane_shield", "flame_wave")
+
+
+# ----------------------------------------------------------------------
+# Formula compilation
+# ----------------------------------------------------------------------
+def _check_stats(spec: Mapping[str, Any]) -> None:
+    for key in ("stat", "resist"):
+        name = spec.get(key)
+        if name is not None and name not in STAT_NAMES:
+            raise ValueError(f"Unknown {key} '{name}' in formula.")
+
+
+def compile_formula(spec: Mapping[str, Any]) -> Formula:
+    _check_stats(spec)
+    stat, resist = spec.get("stat"), spec.get("resist")
+    scale, bonus, minimum = spec.get("scale", 1), spec.get("bonus", 0), spec.get("minimum", 0)
+    if stat is None:
+        constant = max(bonus, minimum)
+        return lambda caster, target: constant
+    if resist is None:
+        if scale == 1:
+            return lambda caster, target: max(caster[stat] + bonus, minimum)
+        return lambda caster, target: max(int(caster[stat] * scale) + bonus, minimum)
+    if scale == 1:
+        return lambda caster, target: max(caster[stat] + bonus - target.get(resist, 0), minimum)
+    return lambda caster, target: max(int(caster[stat] * scale) + bonus - target.get(resist, 0), minimum)
+
+
+# ----------------------------------------------------------------------
+# Effects
+# ----------------------------------------------------------------------
+Effect = Callable[[Any, Sequence[Any], Dict[str, int]], None]
+
+
+def _damage_effect(formula: Formula) -> Effect:
+    def apply(caster, targets, outcome) -> None:  # noqa: ANN001 - runtime entities
+        stats = caster.stats
+        for target in targets:
+            amount = formula(stats, target.stats)
+            target.take_damage(amount)
+            outcome["damage"] += amount
+
+    return apply
+
+
+def _heal_effect(formula: Formula) -> Effect:
+    def apply(caster, targets, outcome) -> None:  # noqa: ANN001 - runtime entities
+        outcome["healed"] += caster.heal(formula(caster.stats, caster.stats))
+
+    return apply
+
+
+def _buff_effect(stat: str, amount: int, duration: int) -> Effect:
+    def apply(caster, targets, outcome) -> None:  # noqa: ANN001 - runtime entities
+        caster.add_temporary_buff(stat, amount, duration)
+
+    return apply
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class CompiledSkill:
+    skill_id: str
     name: str
     cost: int
     cooldown_turns: int
     description: str
+    # Area skills receive every living opponent instead of a single target.
+    area: bool
+    # Applied by the combat system to each target the skill hits.
+    status: Optional[StatusEffect]
+    message: str
+    effects: Tuple[Effect, ...]
+    damage_formulas: Tuple[Formula, ...]
+    heal_formulas: Tuple[Formula, ...]
+    # (stat, amount, duration) for every buff the skill grants its caster.
+    buffs: Tuple[Tuple[str, int, int], ...]
+
+    def run(self, caster, targets: Sequence) -> str:  # noqa: ANN001 - runtime entity
+        outcome = {"damage": 0, "healed": 0}
+        for effect in self.effects:
+            effect(caster, targets, outcome)
+        count = len(targets)
+        return self.message.format(targets=count, s="" if count == 1 else "s", **outcome)
+
+    # Pure evaluation for planners and simulations ----------------------
+    def damage(self, caster: Mapping[str, int], target: Mapping[str, int]) -> int:
+        return sum(formula(caster, target) for formula in self.damage_formulas)
+
+    def healing(self, caster: Mapping[str, int]) -> int:
+        return sum(formula(caster, caster) for formula in self.heal_formulas)
+
+
+def compile_skill(skill_id: str, definition: Mapping[str, Any]) -> CompiledSkill:
+    effects: List[Effect] = []
+    damage: List[Formula] = []
+    heals: List[Formula] = []
+    buffs: List[Tuple[str, int, int]] = []
+    status: Optional[StatusEffect] = None
+    for spec in definition.get("effects", []):
+        kind = spec["type"]
+        try:
+            if kind == "damage":
+                damage.append(compile_formula(spec))
+                effects.append(_damage_effect(damage[-1]))
+            elif kind == "heal":
+                heals.append(compile_formula(spec))
+                effects.append(_heal_effect(heals[-1]))
+            elif kind == "buff":
+                if spec["stat"] not in STAT_NAMES:
+                    raise ValueError(f"Unknown buff stat '{spec['stat']}'.")
+                buffs.append((spec["stat"], spec["amount"], spec["duration"]))
+                effects.append(_buff_effect(*buffs[-1]))
+            elif kind == "status":
+                if status is not None:
+                    raise ValueError("Only one status effect is supported.")
+                status = StatusEffect(
+                    spec["name"], spec["remaining"], spec.get("damage", 0), spec.get("stun", False), spec.get("guard", False)
+                )
+            else:
+                raise ValueError(f"Unknown effect type '{kind}'.")
+        except ValueError as error:
+            raise ValueError(f"Skill '{skill_id}': {error}") from None
+    message = definition.get("message", f"Used {definition['name']}.")
+    try:
+        # Fail now rather than mid-combat, after the effects have already landed.
+        message.format(targets=1, s="", damage=0, healed=0)
+    except (KeyError, IndexError, ValueError) as error:
+        raise ValueError(f"Skill '{skill_id}' message cannot be formatted: {error!r}") from None
+    return CompiledSkill(
+        skill_id=skill_id,
+        name=definition["name"],
+        cost=definition.get("cost", 0),
+        cooldown_turns=definition.get("cooldown", 0),
+        description=definition.get("description", ""),
+        area=definition.get("area", False),
+        status=status,
+        message=message,
+        effects=tuple(effects),
+        damage_formulas=tuple(damage),
+        heal_formulas=tuple(heals),
+        buffs=tuple(buffs),
+    )
+
+
+SKILLS: Dict[str, CompiledSkill] = {
+    skill_id: compile_skill(skill_id, definition) for skill_id, definition in SKILL_DEFINITIONS.items()
+}
+
+
+@dataclass(slots=True)
+class Skill:
+    """A caster's copy of a compiled skill; only the cooldown is per caster."""
+
+    compiled: CompiledSkill
     current_cooldown: int = 0
 
+    @property
+    def skill_id(self) -> str:
+        return self.compiled.skill_id
+
+    @property
+    def name(self) -> str:
+        return self.compiled.name
+
+    @property
+    def cost(self) -> int:
+        return self.compiled.cost
+
+    @property
+    def cooldown_turns(self) -> int:
+        return self.compiled.cooldown_turns
+
+    @property
+    def description(self) -> str:
+        return self.compiled.description
+
+    @property
+    def area(self) -> bool:
+        return self.compiled.area
+
+    @property
+    def status(self) -> Optional[StatusEffect]:
+        return self.compiled.status
+
     def can_use(self, caster) -> bool:  # noqa: ANN001 - dynamic entity
         return caster.stats["mana"] >= self.cost and self.current_cooldown == 0
 
@@ -22,54 +266,13 @@ class Skill:
             self.current_cooldown -= 1
 
     def execute(self, caster, target) -> str:  # noqa: ANN001 - dynamic target
-        raise NotImplementedError
-
-
-class Fireball(Skill):
-    def __init__(self):
-        super().__init__(
-            name="Fireball",
-            cost=15,
-            cooldown_turns=2,
-            description="Deal heavy fire damage to a single target.",
-        )
-
-    def execute(self, caster, target) -> str:  # noqa: ANN001
-        damage = max((caster.stats["magic"] * 2) - target.stats.get("resistance", 0), 4)
-        target.take_damage(damage)
-        caster.stats["mana"] -= self.cost
-        self.trigger_cooldown()
-        return f"Cast Fireball for {damage} damage!"
-
-
-class HealingLight(Skill):
-    def __init__(self):
-        super().__init__(
-            name="Healing Light",
-            cost=12,
-            cooldown_turns=3,
-            description="Restore a moderate amount of health.",
-        )
-
-    def execute(self, caster, target=None) -> str:  # noqa: ANN001
-        amount = max(caster.stats["magic"] + 12, 10)
-        restored = caster.heal(amount)
+        """Run the skill on one target, or a list of targets for area skills."""
+        targets = target if self.area else ([target] if target is not None else [])
+        message = self.compiled.run(caster, targets)
         caster.stats["mana"] -= self.cost
         self.trigger_cooldown()
-        return f"Healing Light restored {restored} HP."
+        return message
 
 
-class ArcaneShield(Skill):
-    def __init__(self):
-        super().__init__(
-            name="Arcane Shield",
-            cost=10,
-            cooldown_turns=4,
-            description="Raise defense temporarily.",
-        )
-
-    def execute(self, caster, target=None) -> str:  # noqa: ANN001
-        caster.add_temporary_buff("defense", 5, duration=3)
-        caster.stats["mana"] -= self.cost
-        self.trigger_cooldown()
-        return "Arcane Shield raises defense!"
\ No newline at end of file
+def create_skill(skill_id: str) -> Skill:
+    return Skill(SKILLS[skill_id])
@@ -0,0 +1,151 @@
+"""Slotted stat blocks with cached modifier totals."""
+
+from __future__ import annotations
+
+import collections.abc
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+STAT_NAMES: Tuple[str, ...] = (
+    "health",
+    "max_health",
+    "mana",
+    "max_mana",
+    "attack",
+    "defense",
+    "magic",
+    "resistance",
+    "speed",
+    "level",
+    "experience",
+)
+_STAT_SET = frozenset(STAT_NAMES)
+
+
+@dataclass(slots=True)
+class StatModifier:
+    stat: str
+    amount: int
+    remaining: int
+
+
+class StatBlock(collections.abc.Mapping):
+    """Stats as slots holding effective values (base plus active modifiers).
+
+    Hot code reads attributes (``stats.attack``), a plain slot load that is
+    cheaper than a dict lookup. Item access stays for code that picks a stat by
+    name, so ``stats["mana"] -= cost`` behaves as it did with dicts; unknown names
+    raise KeyError. Modifiers adjust the stored values when they are added or
+    expire, and their per-stat totals are cached so ``base`` never walks the
+    modifier list.
+    """
+
+    __slots__ = STAT_NAMES + ("_modifiers", "_bonus")
+
+    def __init__(self, **values: int) -> None:
+        unknown = values.keys() - _STAT_SET
+        if unknown:
+            raise KeyError(f"Unknown stats: {', '.join(sorted(unknown))}")
+        for name in STAT_NAMES:
+            setattr(self, name, values.get(name, 0))
+        self._modifiers: Optional[List[StatModifier]] = None
+        self._bonus: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def from_mapping(cls, values: Mapping[str, int]) -> "StatBlock":
+        return cls(**{name: value for name, value in values.items() if name in _STAT_SET})
+
+    # Mapping-style access ---------------------------------------------
+    def __getitem__(self, key: str) -> int:
+        if key in _STAT_SET:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: int) -> None:
+        if key not in _STAT_SET:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: object) -> bool:
+        return key in _STAT_SET
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(STAT_NAMES)
+
+    def __len__(self) -> int:
+        return len(STAT_NAMES)
+
+    def __repr__(self) -> str:
+        return f"StatBlock({', '.join(f'{name}={getattr(self, name)}' for name in STAT_NAMES)})"
+
+    def get(self, key: str, default: Optional[int] = None) -> Optional[int]:
+        return getattr(self, key) if key in _STAT_SET else default
+
+    def update(self, values: Mapping[str, int]) -> None:
+        for name, value in values.items():
+            if name in _STAT_SET:
+                setattr(self, name, value)
+
+    def base(self, key: str) -> int:
+        bonus = self._bonus
+        return self[key] - bonus.get(key, 0) if bonus else self[key]
+
+    def to_dict(self, effective: bool = False) -> Dict[str, int]:
+        if effective or not self._bonus:
+            return {name: getattr(self, name) for name in STAT_NAMES}
+        return {name: self.base(name) for name in STAT_NAMES}
+
+    def copy(self) -> "StatBlock":
+        clone = StatBlock(**self.to_dict(effective=True))
+        if self._modifiers:
+            clone._modifiers = [StatModifier(mod.stat, mod.amount, mod.remaining) for mod in self._modifiers]
+            clone._bonus = dict(self._bonus or {})
+        return clone
+
+    # Modifiers --------------------------------------------------------
+    @property
+    def modifiers(self) -> List[StatModifier]:
+        return self._modifiers or []
+
+    def add_modifier(self, stat: str, amount: int, duration: int) -> StatModifier:
+        if stat not in _STAT_SET:
+            raise KeyError(stat)
+        modifier = StatModifier(stat, amount, duration)
+        if self._modifiers is None:
+            self._modifiers = []
+        self._modifiers.append(modifier)
+        setattr(self, stat, getattr(self, stat) + amount)
+        self._recompute_bonus()
+        return modifier
+
+    def tick_modifiers(self) -> List[StatModifier]:
+        """Advance durations by one turn and return the modifiers that expired."""
+        if not self._modifiers:
+            return []
+        expired: List[StatModifier] = []
+        remaining: List[StatModifier] = []
+        for modifier in self._modifiers:
+            modifier.remaining -= 1
+            (expired if modifier.remaining <= 0 else remaining).append(modifier)
+        if expired:
+            for modifier in expired:
+                setattr(self, modifier.stat, getattr(self, modifier.stat) - modifier.amount)
+            self._modifiers = remaining or None
+            self._recompute_bonus()
+        return expired
+
+    def clear_modifiers(self) -> None:
+        for stat, amount in (self._bonus or {}).items():
+            setattr(self, stat, getattr(self, stat) - amount)
+        self._modifiers = None
+        self._bonus = None
+
+    def _recompute_bonus(self) -> None:
+        if not self._modifiers:
+            self._bonus = None
+            return
+        bonus: Dict[str, int] = {}
+        for modifier in self._modifiers:
+            bonus[modifier.stat] = bonus.get(modifier.stat, 0) + modifier.amount
+        self._bonus = bonus
+
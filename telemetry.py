@@ -0,0 +1,200 @@
+"""Buffered gameplay telemetry written as rotating gzip-compressed NDJSON.
+
+``emit`` only appends to a fixed-size ring buffer under a lock, so call sites
+on the game thread never touch the disk. A background writer drains the buffer
+in batches, serialises one JSON object per line and appends it to the current
+``.ndjson.gz`` file, starting a new file once it grows past ``max_file_bytes``
+and deleting the oldest beyond ``max_files``. When the buffer is full, new
+events are dropped and counted rather than making the game wait.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+Event = Tuple[float, str, Dict[str, Any]]
+
+
+class Telemetry:
+    def __init__(
+        self,
+        directory: str = "telemetry",
+        capacity: int = 4096,
+        batch_size: int = 256,
+        flush_interval: float = 2.0,
+        max_file_bytes: int = 1_000_000,
+        max_files: int = 20,
+        enabled: bool = True,
+    ) -> None:
+        self.directory = Path(directory)
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_file_bytes = max_file_bytes
+        self.max_files = max_files
+        self.session = uuid.uuid4().hex[:12]
+        self.dropped = 0
+        self.written = 0
+        self._ring: List[Optional[Event]] = [None] * capacity
+        self._start = 0
+        self._count = 0
+        self._lock = threading.Lock()
+        # Serialises file writes between the writer thread and explicit flushes.
+        self._io_lock = threading.Lock()
+        self._reported_drops = 0
+        self._wake = threading.Event()
+        self._closing = False
+        self._thread: Optional[threading.Thread] = None
+        self._file: Optional[gzip.GzipFile] = None
+        self._file_path: Optional[Path] = None
+        self._file_index = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def emit(self, kind: str, **fields: Any) -> bool:
+        """Queue one event; returns False if telemetry is off or the buffer is full."""
+        if not self.enabled:
+            return False
+        capacity = len(self._ring)
+        with self._lock:
+            if self._count == capacity:
+                self.dropped += 1
+                return False
+            self._ring[(self._start + self._count) % capacity] = (time.time(), kind, fields)
+            self._count += 1
+            full_batch = self._count >= self.batch_size
+        if full_batch:
+            self._wake.set()
+        return True
+
+    def start(self) -> "Telemetry":
+        if self.enabled and self._thread is None:
+            self._closing = False
+            self._thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the writer after it flushes everything still buffered."""
+        if self._thread is not None:
+            self._closing = True
+            self._wake.set()
+            self._thread.join(timeout)
+            self._thread = None
+        else:
+            self.flush()
+        with self._io_lock:
+            self._close_file()
+
+    def flush(self) -> int:
+        """Write everything buffered on the calling thread; returns the number of events written."""
+        with self._io_lock:
+            batch = self._drain()
+            if not batch:
+                return 0
+            count, reported = len(batch), self._reported_drops
+            try:
+                self._write(batch)
+            except Exception:
+                # Telemetry must never take the game down: an unwritable batch (a full
+                # disk, a field json cannot encode) is counted as dropped and the next
+                # batch starts a fresh file.
+                self._reported_drops = reported
+                with self._lock:
+                    self.dropped += count
+                self._abandon_file()
+                return 0
+            return count
+
+    # Writer thread -------------------------------------------------------
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            closing = self._closing
+            self.flush()
+            if closing:
+                return
+
+    def _drain(self) -> List[Event]:
+        capacity = len(self._ring)
+        with self._lock:
+            start, count = self._start, self._count
+            if not count:
+                return []
+            end = start + count
+            if end <= capacity:
+                batch = self._ring[start:end]
+            else:
+                batch = self._ring[start:] + self._ring[: end - capacity]
+            self._start, self._count = end % capacity, 0
+        return batch
+
+    def _write(self, batch: List[Event]) -> None:
+        dropped = self.dropped
+        if dropped != self._reported_drops:
+            batch.append((time.time(), "telemetry_dropped", {"count": dropped - self._reported_drops}))
+            self._reported_drops = dropped
+        lines = "".join(
+            json.dumps({"t": round(timestamp, 3), "type": kind, **fields}, separators=(",", ":")) + "\n"
+            for timestamp, kind, fields in batch
+        )
+        handle = self._open_file()
+        handle.write(lines.encode("utf-8"))
+        # Sync-flush so every batch is readable even if the game exits uncleanly.
+        handle.flush()
+        self.written += len(batch)
+        if self._file_path is not None and self._file_path.stat().st_size >= self.max_file_bytes:
+            self._close_file()
+
+    def _open_file(self) -> gzip.GzipFile:
+        if self._file is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._file_index += 1
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            self._file_path = self.directory / f"{stamp}-{self.session}-{self._file_index:04d}.ndjson.gz"
+            self._file = gzip.open(self._file_path, "ab")
+            self._prune()
+        return self._file
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _abandon_file(self) -> None:
+        handle, self._file = self._file, None
+        if handle is not None:
+            try:
+                handle.close()
+            except Exception:
+                pass
+
+    def _prune(self) -> None:
+        # Names start with a timestamp, so name order is age order.
+        files = sorted(self.directory.glob("*.ndjson.gz"))
+        for path in files[: max(len(files) - self.max_files, 0)]:
+            if path != self._file_path:
+                path.unlink(missing_ok=True)
+
+
+_default = Telemetry(enabled=False)
+
+
+def get_telemetry() -> Telemetry:
+    return _default
+
+
+def configure_telemetry(directory: str = "telemetry", **options: Any) -> Telemetry:
+    """Replace the process-wide sink, closing the previous one, and start its writer."""
+    global _default
+    _default.close()
+    _default = Telemetry(directory, **options).start()
+    return _default
@@ -0,0 +1,182 @@
+"""Virtualised list widget for menus that can grow without bound."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import pygame
+
+RARITY_ORDER: Dict[str, int] = {"common": 0, "uncommon": 1, "rare": 2, "epic": 3, "legendary": 4}
+SORT_MODES = ("default", "name", "type", "rarity")
+
+Colour = Tuple[int, int, int]
+
+
+@dataclass(frozen=True, slots=True)
+class ListRow:
+    key: str
+    text: str
+    name: str
+    category: str = ""
+    rarity: str = ""
+
+
+def _sort_key(mode: str) -> Callable[[ListRow], Tuple]:
+    if mode == "name":
+        return lambda row: (row.name,)
+    if mode == "type":
+        return lambda row: (row.category, row.name)
+    return lambda row: (-RARITY_ORDER.get(row.rarity, -1), row.name)
+
+
+class ListView:
+    """Renders only the visible window of rows and keeps rendered rows cached.
+
+    Rows are rebuilt from ``build_rows`` only when ``version()`` changes; sort
+    and filter orders are index lists derived from them once per version, so
+    moving the selection never touches the full row list.
+    """
+
+    def __init__(
+        self,
+        build_rows: Callable[[], Sequence[ListRow]],
+        version: Callable[[], Hashable],
+        visible_rows: int = 10,
+        row_height: int = 24,
+    ) -> None:
+        self.build_rows = build_rows
+        self.version = version
+        self.visible_rows = visible_rows
+        self.row_height = row_height
+        self.sort_mode = "default"
+        self.filter = ""
+        self.selection = 0
+        self.offset = 0
+        self._version: Optional[Hashable] = None
+        self._rows: List[ListRow] = []
+        self._categories: List[str] = []
+        self._orders: Dict[Tuple[str, str], List[int]] = {}
+        self._order: List[int] = []
+        self._surfaces: Dict[Tuple[str, bool], pygame.Surface] = {}
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._order)
+
+    @property
+    def categories(self) -> List[str]:
+        self.refresh()
+        return self._categories
+
+    def refresh(self) -> None:
+        version = self.version()
+        if version == self._version:
+            return
+        keep = self._selected_key()
+        self._version = version
+        self._rows = list(self.build_rows())
+        self._categories = sorted({row.category for row in self._rows if row.category})
+        if self.filter not in self._categories:
+            self.filter = ""
+        self._orders.clear()
+        if len(self._surfaces) > 4 * max(self.visible_rows, len(self._rows)):
+            self._surfaces.clear()
+        self._apply_order(keep=keep)
+
+    def selected(self) -> Optional[ListRow]:
+        self.refresh()
+        return self._current()
+
+    def _current(self) -> Optional[ListRow]:
+        if not self._order:
+            return None
+        return self._rows[self._order[self.selection]]
+
+    def _selected_key(self) -> Optional[str]:
+        row = self._current()
+        return row.key if row else None
+
+    def move(self, delta: int) -> None:
+        self.refresh()
+        if self._order:
+            self.selection = (self.selection + delta) % len(self._order)
+            self._scroll_to_selection()
+
+    def page(self, delta: int) -> None:
+        self.refresh()
+        if self._order:
+            self.selection = min(max(self.selection + delta * self.visible_rows, 0), len(self._order) - 1)
+            self._scroll_to_selection()
+
+    def cycle_sort(self) -> str:
+        self.refresh()
+        self.sort_mode = SORT_MODES[(SORT_MODES.index(self.sort_mode) + 1) % len(SORT_MODES)]
+        self._apply_order(keep=self._selected_key())
+        return self.sort_mode
+
+    def cycle_filter(self) -> str:
+        self.refresh()
+        choices = [""] + self._categories
+        self.filter = choices[(choices.index(self.filter) + 1) % len(choices)]
+        self._apply_order(keep=self._selected_key())
+        return self.filter
+
+    def reset(self) -> None:
+        self.refresh()
+        self.selection = self.offset = 0
+
+    def status(self) -> str:
+        self.refresh()
+        total = len(self._order)
+        first = self.offset + 1 if total else 0
+        last = min(self.offset + self.visible_rows, total)
+        return f"{first}-{last} of {total}  sort: {self.sort_mode}  filter: {self.filter or 'all'}"
+
+    def draw(
+        self,
+        surface: pygame.Surface,
+        font: pygame.font.Font,
+        position: Tuple[int, int],
+        colour: Colour = (220, 220, 220),
+        highlight: Colour = (255, 240, 120),
+    ) -> int:
+        """Blit the visible rows; returns how many were drawn."""
+        self.refresh()
+        x, y = position
+        window = self._order[self.offset : self.offset + self.visible_rows]
+        blits = []
+        for index, row_index in enumerate(window, start=self.offset):
+            text = self._rows[row_index].text
+            selected = index == self.selection
+            key = (text, selected)
+            rendered = self._surfaces.get(key)
+            if rendered is None:
+                rendered = self._surfaces[key] = font.render(text, True, highlight if selected else colour)
+            blits.append((rendered, (x, y + (index - self.offset) * self.row_height)))
+        surface.blits(blits, doreturn=False)
+        return len(blits)
+
+    def _apply_order(self, keep: Optional[str] = None) -> None:
+        order_key = (self.sort_mode, self.filter)
+        order = self._orders.get(order_key)
+        if order is None:
+            indices = range(len(self._rows))
+            if self.sort_mode != "default":
+                indices = sorted(indices, key=lambda index, key=_sort_key(self.sort_mode): key(self._rows[index]))
+            if self.filter:
+                indices = [index for index in indices if self._rows[index].category == self.filter]
+            order = self._orders[order_key] = list(indices)
+        self._order = order
+        position = None
+        if keep is not None:
+            position = next((pos for pos, index in enumerate(order) if self._rows[index].key == keep), None)
+        self.selection = position if position is not None else min(self.selection, max(len(order) - 1, 0))
+        self._scroll_to_selection()
+
+    def _scroll_to_selection(self) -> None:
+        if self.selection < self.offset:
+            self.offset = self.selection
+        elif self.selection >= self.offset + self.visible_rows:
+            self.offset = self.selection - self.visible_rows + 1
+        self.offset = min(self.offset, max(len(self._order) - self.visible_rows, 0))
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
-import random
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
+import numpy as np
 import pygame
 
-from dialogue import DialogueNode, DialogueOption, DialogueTree
+from dialogue import DialogueLibrary, DialogueNode, DialogueOption
 from enemies import Enemy, create_enemy
+from entity_store import EnemyStore
+from exploration import FogOfWar, compute_fov
 from items import create_item
 from npcs import NPC
-from quests import Quest
+from rng import RNGService, get_rng
 
 
 TILE_COLOURS = {
@@ -34,20 +36,57 @@ MAP_TEMPLATE: List[str] = [
 ]
 
 
+DIALOGUES: Dict[str, List[DialogueNode]] = {
+    "elder_rowan": [
+        DialogueNode(
+            text="Greetings, traveler! Monsters have been troubling our forest.",
+            options=[
+                DialogueOption("I will help.", next_node=1, action="accept_quest"),
+                DialogueOption("I cannot right now.", next_node=2),
+            ],
+        ),
+        DialogueNode(
+            text="Thank you! Defeat three forest slimes to keep us safe.",
+            options=[DialogueOption("I will return soon.", next_node=None)],
+        ),
+        DialogueNode(
+            text="Stay safe on the road.",
+            options=[DialogueOption("Farewell.", next_node=None)],
+        ),
+    ],
+}
+
+
 class World:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        rng: Optional[RNGService] = None,
+        use_entity_store: bool = False,
+        dialogues: Optional[DialogueLibrary] = None,
+    ) -> None:
+        self.rng = rng or get_rng()
+        self.dialogues = dialogues or DialogueLibrary(DIALOGUES)
         self.tile_size = 48
         self.map_data = MAP_TEMPLATE
         self.width = len(self.map_data[0])
         self.height = len(self.map_data)
         self.spawn_point = (self.tile_size * 3, self.tile_size * 4)
-        self.enemies: List[Enemy] = []
+        self.enemy_store: Optional[EnemyStore] = EnemyStore(self.tile_size) if use_entity_store else None
+        self._enemies: List[Enemy] = []
         self.npcs: List[NPC] = []
         self.resource_nodes: Dict[Tuple[int, int], str] = {}
+        self.fog = FogOfWar(self.width, self.height)
+        self.sight_radius = 6
         self._build_world()
 
+    @property
+    def enemies(self) -> List[Enemy]:
+        if self.enemy_store is not None:
+            return list(self.enemy_store.views())
+        return self._enemies
+
     def _build_world(self) -> None:
-        self.enemies.clear()
+        self._clear_enemies()
         self.npcs.clear()
         self.resource_nodes.clear()
         for y, row in enumerate(self.map_data):
@@ -56,36 +95,36 @@ class World:
                 if tile == "P":
                     self.spawn_point = world_pos
                 elif tile == "E":
-                    enemy_id = random.choice(["slime", "goblin", "wolf"])
-                    enemy = create_enemy(enemy_id, world_pos, self.tile_size)
-                    if enemy:
-                        self.enemies.append(enemy)
+                    enemy_id = self.rng.world.choice(["slime", "goblin", "wolf"])
+                    self._spawn_enemy(enemy_id, world_pos)
                 elif tile == "N":
                     self.npcs.append(self._create_npc(world_pos))
                 elif tile == "T":
                     self.resource_nodes[(x, y)] = "herb"
 
+    def _spawn_enemy(self, enemy_id: str, position: Tuple[int, int], health: Optional[int] = None) -> None:
+        if self.enemy_store is not None:
+            self.enemy_store.add(enemy_id, position, health)
+            return
+        enemy = create_enemy(enemy_id, position, self.tile_size)
+        if enemy:
+            if health is not None:
+                enemy.health = health
+            self._enemies.append(enemy)
+
+    def _clear_enemies(self) -> None:
+        if self.enemy_store is not None:
+            self.enemy_store.clear()
+        self._enemies.clear()
+
     def _create_npc(self, position: Tuple[int, int]) -> NPC:
-        quest_dialogue = DialogueTree(
-            [
-                DialogueNode(
-                    text="Greetings, traveler! Monsters have been troubling our forest.",
-                    options=[
-                        DialogueOption("I will help.", next_node=1, action="accept_quest"),
-                        DialogueOption("I cannot right now.", next_node=2),
-                    ],
-                ),
-                DialogueNode(
-                    text="Thank you! Defeat three forest slimes to keep us safe.",
-                    options=[DialogueOption("I will return soon.", next_node=None)],
-                ),
-                DialogueNode(
-                    text="Stay safe on the road.",
-                    options=[DialogueOption("Farewell.", next_node=None)],
-                ),
-            ]
+        return NPC(
+            name="Elder Rowan",
+            position=position,
+            tile_size=self.tile_size,
+            dialogue=self.dialogues.get("elder_rowan"),
+            quest_id="slime_cull",
         )
-        return NPC(name="Elder Rowan", position=position, tile_size=self.tile_size, dialogue_tree=quest_dialogue, quest_id="slime_cull")
 
     def is_walkable(self, tile_x: int, tile_y: int) -> bool:
         if tile_x < 0 or tile_y < 0 or tile_x >= self.width or tile_y >= self.height:
@@ -93,6 +132,18 @@ class World:
         tile = self.map_data[tile_y][tile_x]
         return tile in {".", "P", "E", "N", "T"}
 
+    def blocks_sight(self, tile_x: int, tile_y: int) -> bool:
+        if tile_x < 0 or tile_y < 0 or tile_y >= self.height or tile_x >= len(self.map_data[tile_y]):
+            return True
+        return self.map_data[tile_y][tile_x] == "#"
+
+    def visible_tiles(self, rect: pygame.Rect) -> Set[Tuple[int, int]]:
+        origin = (rect.centerx // self.tile_size, rect.centery // self.tile_size)
+        return compute_fov(origin, self.sight_radius, self.blocks_sight)
+
+    def reveal_around(self, rect: pygame.Rect) -> List[Tuple[int, int]]:
+        return self.fog.reveal(self.visible_tiles(rect))
+
     def is_walkable_rect(self, rect: pygame.Rect) -> bool:
         corners = {
             (rect.left // self.tile_size, rect.top // self.tile_size),
@@ -103,11 +154,7 @@ class World:
         return all(self.is_walkable(x, y) for x, y in corners)
 
     def draw(self, surface) -> None:  # noqa: ANN001 - pygame surface
-        for y, row in enumerate(self.map_data):
-            for x, tile in enumerate(row):
-                colour = TILE_COLOURS.get(tile, TILE_COLOURS.get(".", (60, 110, 60)))
-                rect = pygame.Rect(x * self.tile_size, y * self.tile_size, self.tile_size, self.tile_size)
-                pygame.draw.rect(surface, colour, rect)
+        self.draw_terrain(surface)
 
         for position in self.resource_nodes:
             x, y = position
@@ -120,12 +167,41 @@ class World:
         for enemy in self.enemies:
             enemy.draw(surface)
 
+    def draw_terrain(self, surface) -> None:  # noqa: ANN001 - pygame surface
+        for y, row in enumerate(self.map_data):
+            for x, tile in enumerate(row):
+                colour = TILE_COLOURS.get(tile, TILE_COLOURS.get(".", (60, 110, 60)))
+                rect = pygame.Rect(x * self.tile_size, y * self.tile_size, self.tile_size, self.tile_size)
+                pygame.draw.rect(surface, colour, rect)
+
     def enemy_at_player(self, player_rect: pygame.Rect) -> Optional[Enemy]:
-        for enemy in self.enemies:
+        if self.enemy_store is not None:
+            hits = self.enemy_store.colliding(player_rect)
+            if len(hits):
+                return self.enemy_store.view(int(self.enemy_store.handle[hits[0]]))
+            return None
+        for enemy in self._enemies:
             if enemy.rect.colliderect(player_rect):
                 return enemy
         return None
 
+    def enemies_near(self, rect: pygame.Rect, radius: int, limit: Optional[int] = None) -> List[Enemy]:
+        """Living enemies within ``radius`` tiles of ``rect``, nearest first."""
+        reach = radius * self.tile_size
+        cx, cy = rect.centerx - self.tile_size // 2, rect.centery - self.tile_size // 2
+        if self.enemy_store is not None:
+            store = self.enemy_store
+            distance = np.maximum(np.abs(store.x - cx), np.abs(store.y - cy))
+            slots = np.flatnonzero((distance <= reach) & (store.health > 0))
+            slots = slots[np.argsort(distance[slots], kind="stable")][:limit]
+            return [store.view(int(handle)) for handle in store.handle[slots].tolist()]
+        nearby = [
+            (max(abs(enemy.rect.x - cx), abs(enemy.rect.y - cy)), index, enemy)
+            for index, enemy in enumerate(self._enemies)
+            if enemy.is_alive()
+        ]
+        return [enemy for distance, _, enemy in sorted(nearby) if distance <= reach][:limit]
+
     def npc_near_player(self, player_rect: pygame.Rect) -> Optional[NPC]:
         for npc in self.npcs:
             if npc.rect.colliderect(player_rect):
@@ -140,45 +216,56 @@ class World:
         return None
 
     def remove_enemy(self, enemy: Enemy) -> None:
-        if enemy in self.enemies:
-            self.enemies.remove(enemy)
+        if self.enemy_store is not None:
+            self.enemy_store.remove(enemy.handle)
+        elif enemy in self._enemies:
+            self._enemies.remove(enemy)
+
+    def enemy_records(self) -> List[Tuple[str, int, int, int]]:
+        """``(enemy_id, x, y, health)`` for every live enemy."""
+        if self.enemy_store is not None:
+            store = self.enemy_store
+            names = store.type_names
+            return [
+                (names[type_id], x, y, health)
+                for type_id, x, y, health in zip(
+                    store.type_id.tolist(), store.x.tolist(), store.y.tolist(), store.health.tolist()
+                )
+            ]
+        return [(enemy.enemy_id, enemy.rect.x, enemy.rect.y, enemy.health) for enemy in self._enemies]
 
     def to_dict(self) -> Dict:
         return {
             "enemies": [
-                {
-                    "id": enemy.enemy_id,
-                    "position": [enemy.rect.x, enemy.rect.y],
-                    "health": enemy.stats["health"],
-                }
-                for enemy in self.enemies
+                {"id": enemy_id, "position": [x, y], "health": health}
+                for enemy_id, x, y, health in self.enemy_records()
             ],
             "resources": [
                 {"position": [x, y], "item": item_id} for (x, y), item_id in self.resource_nodes.items()
             ],
+            "explored": self.fog.to_string(),
         }
 
     def load_state(self, payload: Dict) -> None:
         self._build_world()
-        self.enemies.clear()
+        self._clear_enemies()
         for entry in payload.get("enemies", []):
-            enemy = create_enemy(entry["id"], tuple(entry["position"]), self.tile_size)
-            if enemy:
-                enemy.stats["health"] = entry.get("health", enemy.stats["health"])
-                self.enemies.append(enemy)
+            self._spawn_enemy(entry["id"], tuple(entry["position"]), entry.get("health"))
         self.resource_nodes.clear()
         for entry in payload.get("resources", []):
             position = tuple(entry["position"])
             self.resource_nodes[position] = entry["item"]
+        self.fog.load_string(payload.get("explored", ""))
 
-    def get_default_quest(self) -> Quest:
-        return Quest(
-            quest_id="slime_cull",
-            name="Forest Cleaning",
-            description="Defeat three forest slimes to keep the path clear.",
-            goal_type="slay",
-            target="slime",
-            required=3,
-            reward_experience=120,
-            reward_items=["health_potion"],
-        )
\ No newline at end of file
+    def restore_state(
+        self,
+        enemies: List[Tuple[str, Tuple[int, int], int]],
+        resources: Dict[Tuple[int, int], str],
+        explored: bytes,
+    ) -> None:
+        """Put entities and exploration back without rebuilding the map or touching the RNG."""
+        self._clear_enemies()
+        for enemy_id, position, health in enemies:
+            self._spawn_enemy(enemy_id, position, health)
+        self.resource_nodes = dict(resources)
+        self.fog.bits = bytearray(explored)